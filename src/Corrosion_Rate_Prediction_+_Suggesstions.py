@@ -4,16 +4,24 @@ import joblib
 import os
 import numpy as np
 from utils.predictor import CorrosionClassifier
-from utils.processors import build_final_input, remove_think_tags
+from utils.corrosion_map import lookup_corrosion_map
+from utils.processors import build_final_input, strip_think_tags, warm_up_scibert
 from utils.vars import environment, uns_nums
-from config.config import SIDEBAR_IMAGE, PAGE_ICON
-from chat.chat import invoke_llm, get_main_prompt
+from config.config import SIDEBAR_IMAGE, PAGE_ICON, SCIBERT_WARMUP
+from chat.chat import (
+    get_main_prompt,
+    get_main_prompt_key,
+    stream_llm_background,
+    warm_up_llm,
+)
 
 st.set_page_config(
     page_title="Corrosion Rate Predictor", layout="wide", page_icon=PAGE_ICON
 )
 
 clf = CorrosionClassifier()
+if SCIBERT_WARMUP:
+    warm_up_scibert()
 
 # ------------------------ Sidebar ------------------------
 with st.sidebar:
@@ -77,7 +85,48 @@ with st.form("corrosion_form"):
 
     submitted = st.form_submit_button("🚀 Predict corrosion rate")
 
-if "prediction_data" in st.session_state:
+# ------------------------ Prediction & Output ------------------------
+if submitted:
+    # The chat client loads in the background while the prediction runs.
+    warm_up_llm()
+    # Routine screening queries are answered from the precomputed map; the
+    # snapshot keeps the map check and any fallback on one model version.
+    with clf.snapshot():
+        prediction = lookup_corrosion_map(clf, env, temp, conc, uns_input, comment)
+        if prediction is None:
+            prediction, _ = clf.predict(env, temp, conc, uns_input, comment)
+    raw_input = pd.DataFrame(
+        [
+            {
+                "Environment": env,
+                "Temperature (°C)": temp,
+                "Concentration (%)": conc,
+                "Alloy UNS": uns_input,
+                "Condition Description": comment,
+                "Predicted Corrosion Rate": prediction,
+            }
+        ]
+    )
+    # Send the LLM request first; it runs on a background thread while the
+    # prediction is rendered. Repeated inputs are answered from the
+    # persistent response cache.
+    recommendations = stream_llm_background(
+        get_main_prompt(raw_input), get_main_prompt_key(raw_input)
+    )
+    st.markdown("## 🗞 Prediction Result")
+    st.success(f"✅ Predicted Corrosion Rate: **{prediction}**")
+
+    st.markdown("### 🧠 AI Recommendations for Corrosion Control")
+    # Render the recommendations as they arrive; the assembled text is kept
+    # for the downloads.
+    llm_output = st.write_stream(strip_think_tags(recommendations))
+    raw_input["AI Recommendations"] = llm_output
+
+    # Store in session state
+    st.session_state.prediction_data = raw_input
+    st.session_state.llm_output = llm_output
+
+elif "prediction_data" in st.session_state:
     st.markdown("## 🗞 Prediction Result")
     st.success(
         f"✅ Predicted Corrosion Rate: **{st.session_state.prediction_data['Predicted Corrosion Rate'][0]}**"
@@ -86,6 +135,7 @@ if "prediction_data" in st.session_state:
     st.markdown("### 🧠 AI Recommendations for Corrosion Control")
     st.markdown(st.session_state.llm_output)
 
+if "prediction_data" in st.session_state:
     # CSV Download
     csv_bytes = st.session_state.prediction_data.to_csv(index=False).encode("utf-8")
     st.download_button(
@@ -113,30 +163,6 @@ if "prediction_data" in st.session_state:
         mime="text/plain",
     )
 
-# ------------------------ Prediction & Output ------------------------
-if submitted:
-    prediction, _ = clf.predict(env, temp, conc, uns_input, comment)
-    raw_input = pd.DataFrame(
-        [
-            {
-                "Environment": env,
-                "Temperature (°C)": temp,
-                "Concentration (%)": conc,
-                "Alloy UNS": uns_input,
-                "Condition Description": comment,
-                "Predicted Corrosion Rate": prediction,
-            }
-        ]
-    )
-    main_page_prompt = get_main_prompt(raw_input)
-    llm_output = invoke_llm(main_page_prompt)
-    llm_output = remove_think_tags(llm_output)
-    raw_input["AI Recommendations"] = llm_output
-
-    # Store in session state
-    st.session_state.prediction_data = raw_input
-    st.session_state.llm_output = llm_output
-
 # ------------------------ Footer ------------------------
 st.markdown("<hr>", unsafe_allow_html=True)
 st.caption("💪 Built with Streamlit | 🧠 Machine Learning | 👨‍🔬 SciBERT + PCA Model")
@@ -1,7 +1,27 @@
 from dotenv import load_dotenv
-from config.config import GROQ_MODELS
+from config.config import (
+    GROQ_MODELS,
+    LLM_BACKGROUND_WORKERS,
+    LLM_DEADLINE_S,
+    LLM_HEDGE_DELAY_S,
+    LLM_MAX_ATTEMPTS,
+    LLM_STREAM_HEDGE_DELAY_S,
+)
+from chat.hedging import HedgeMetrics, race
+from chat.response_cache import get_response_cache, prompt_key
+from chat.scheduler import (
+    LLMScheduler,
+    LLMUnavailableError,
+    error_status,
+    failure_scope,
+)
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import importlib
+import logging
 import os
-from langchain_groq import ChatGroq
+import queue
+import threading
 
 
 # Load environment variables
@@ -13,40 +33,60 @@ groq_api_key2 = os.getenv("GROQ_API_KEY_2")
 groq_api_keys = [groq_api_key1, groq_api_key2]
 
 
-api_index = 0
-model_index = 0
+logger = logging.getLogger(__name__)
 
+_scheduler = None
+_scheduler_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+_client_warmup = None
+_client_imported = False
+hedge_metrics = HedgeMetrics()
+_STREAM_END = object()
 
-def get_next_api_and_model():
+
+def get_llm_scheduler():
     """
-    Retrieves the next available API key and model name in a round-robin fashion.
-    This function cycles through the list of Groq API keys and model names,
-    ensuring a balanced usage of available resources.
+    Returns the process-wide scheduler over every API key and model.
+    It is shared by all Streamlit sessions, so request budgets, latencies
+    and failures are tracked once per process.
     """
-    global api_index, model_index
-    api_key = groq_api_keys[api_index]
-    model_name = GROQ_MODELS[model_index]
-    api_index = (api_index + 1) % len(groq_api_keys)
-    model_index = (model_index + 1) % len(GROQ_MODELS)
-    return api_key, model_name
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler(groq_api_keys, GROQ_MODELS)
+    return _scheduler
 
 
-def get_groq_llm():
+def get_groq_llm(exclude=(), max_wait_s=None):
     """
-    Initializes and returns a ChatGroq LLM instance using the next available API key and model.
-    The function fetches an API key and model name from the round-robin selection
-    and creates a ChatGroq instance with predefined parameters.
-
+    Initializes and returns a ChatGroq LLM instance on the healthiest API key and model.
+    The scheduler picks the pair with budget left, a closed circuit breaker and
+    the lowest latency, skipping the pairs leased in ``exclude`` and waiting at
+    most ``max_wait_s`` (the scheduler's limit by default). Returns the
+    LLM and its lease; the outcome of the call must be reported on the lease.
     """
-    api_key, model = get_next_api_and_model()
-    return (
-        ChatGroq(model_name=model, api_key=api_key, temperature=0.3, max_tokens=1024),
-        model,
+    lease = get_llm_scheduler().acquire(exclude, max_wait_s)
+    return _groq_client(lease), lease
+
+
+def _groq_client(lease):
+    # langchain_groq pulls in transformers/torch, so import it on first use.
+    from langchain_groq import ChatGroq
+
+    # The client's own retries would hide rate limits from the scheduler,
+    # which fails over to another pair instead.
+    return ChatGroq(
+        model_name=lease.model,
+        api_key=lease.api_key,
+        temperature=0.3,
+        max_tokens=1024,
+        max_retries=0,
     )
 
 
-def get_main_prompt(df):
-    prompt = f"""
+MAIN_PROMPT_TEMPLATE = """
 You are a corrosion control expert assisting engineers in preventing material degradation in industrial environments.
 
 Given the following dataframe:
@@ -68,15 +108,395 @@ Generate a concise technical recommendation with a clear bullet-point structure,
 
 Ensure the tone is practical, professional, and clear. Respond in exactly 5 bullet points.
 """
-    return prompt
+
+MATERIAL_PROMPT_TEMPLATE = """
+You are a corrosion engineering assistant helping select optimal materials for corrosion resistance in industrial settings.
+
+Based on the following operating and environmental conditions, recommend the **top 2–3 materials**:
+
+- 🌍 Environment: {env}
+- 🧪 pH Level: {pH}
+- 🧂 Chloride Presence: {chloride}
+- 🌡️ Temperature: {temperature}°C
+- ⚙️ Pressure: {pressure} bar
+- 💨 Flow Condition: {flow}
+- 🔗 Galvanic Contact: {contact}
+- 📆 Required Design Life: {design_life} years
+- 🛠️ Maintenance Requirements: {maintenance}
+- 💰 Budget Constraints: {budget}
+- 📝 Additional Notes: {custom_notes}
+
+Please provide your output in the following format:
+
+1. **Material Name (UNS Code)**  
+   - ✅ *Why it is suitable* (highlight corrosion resistance, mechanical properties, compatibility, etc.)  
+   - ⚠️ *Limitations* or special handling considerations  
+   - Suggestions: Suggested surface treatments or enhancements (if needed)  
+
+Conclude with:
+- 🎯 A final recommendation if one material clearly stands out for the given case.
+- 🧠 Reminders or caveats (e.g., importance of site-specific testing, monitoring methods, etc.)
+
+Use a **professional and concise tone**. Structure your response clearly with bullet points or short paragraphs to enhance readability for engineers in the field.
+"""
+
+
+# Everything around the input table is fixed, so the template is split once
+# and each request only renders the table.
+_MAIN_PROMPT_HEAD, _MAIN_PROMPT_TAIL = MAIN_PROMPT_TEMPLATE.split("{df}")
+
+
+def get_main_prompt(df):
+    return f"{_MAIN_PROMPT_HEAD}{df}{_MAIN_PROMPT_TAIL}"
+
+
+def get_main_prompt_key(df):
+    """Response cache key of ``get_main_prompt(df)`` for a one-row input frame."""
+    return prompt_key(MAIN_PROMPT_TEMPLATE, df.iloc[0].to_dict())
+
+
+def get_material_prompt(fields):
+    return MATERIAL_PROMPT_TEMPLATE.format(**fields)
+
+
+def get_material_prompt_key(fields):
+    """Response cache key of ``get_material_prompt(fields)``."""
+    return prompt_key(MATERIAL_PROMPT_TEMPLATE, fields)
+
+
+def llm_stats():
+    """Hedging, scheduler and response cache statistics of this process.
+
+    ``cache`` is None when the cache is disabled or cannot be read.
+    """
+    cache = get_response_cache()
+    return {
+        "hedging": hedge_metrics.stats(),
+        "scheduler": get_llm_scheduler().stats(),
+        "cache": cache.stats() if cache is not None else None,
+    }
+
+
+def _log_llm_stats():
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("LLM stats: %s", llm_stats())
+
+
+def _fallback_message(error):
+    """What to show instead of an answer when every attempt failed.
+
+    When no pair was left, the failure that took the pairs out of rotation
+    is reported, so a rejected key or model reads as a configuration error.
+    """
+    if isinstance(error, LLMUnavailableError) and error.__cause__ is not None:
+        error = error.__cause__
+    status = error_status(error)
+    scope = failure_scope(error)
+    advice = "Please try again shortly."
+    if isinstance(error, LLMUnavailableError) or status == 429:
+        reason = "all models are busy or rate limited"
+    elif scope == "key":
+        reason = f"the API key was rejected with HTTP {status}"
+        advice = "Please check GROQ_API_KEY_1 and GROQ_API_KEY_2."
+    elif scope == "model":
+        reason = "the configured models are not available"
+        advice = "Please check GROQ_MODELS in config/config.py."
+    elif status is not None:
+        reason = f"the AI service returned HTTP {status}"
+    else:
+        reason = "the AI service could not be reached"
+    return f"⚠️ AI recommendations are unavailable right now ({reason}). {advice}"
+
+
+async def _import_client():
+    """Finish importing the chat client before a call's clock starts.
+
+    The first import takes seconds; inside the deadline and hedge delay it
+    would pass for a slow pair and start a needless hedge.
+    """
+    global _client_imported
+    if not _client_imported:
+        # Waits for warm_up_llm's import if it is still running.
+        await asyncio.to_thread(importlib.import_module, "langchain_groq")
+        _client_imported = True
+
+
+def _launcher(start, leases):
+    """``race`` launcher running ``start(llm, lease)`` on a fresh pair each time.
+
+    Nothing in it blocks the event loop, so the caller's deadline holds while
+    a pair is awaited.
+    """
+    scheduler = get_llm_scheduler()
+
+    def launch(hedge):
+        # A hedge only makes sense if a pair is free right now; checking
+        # that never waits, so it is done before the request is started.
+        lease = scheduler.acquire(exclude=leases, max_wait_s=0) if hedge else None
+        return attempt(lease)
+
+    async def attempt(lease):
+        if lease is None:
+            lease = await scheduler.acquire_async(exclude=leases)
+        leases.append(lease)
+        try:
+            llm = await asyncio.to_thread(_groq_client, lease)
+        except BaseException:
+            lease.release()
+            raise
+        return await start(llm, lease)
+
+    return launch
 
 
-def invoke_llm(prompt):
+async def ainvoke_llm(
+    prompt, cache_key=None, deadline_s=LLM_DEADLINE_S, hedge_delay_s=LLM_HEDGE_DELAY_S
+):
+    """
+    Async ``invoke_llm`` with hedging across key/model pairs.
+    If the first pair has not answered within ``hedge_delay_s`` a second one is
+    asked too; the first answer wins and the other request is cancelled. A
+    failed request is retried on another pair, up to ``LLM_MAX_ATTEMPTS`` in
+    all. Past ``deadline_s``, or when every attempt failed, a fallback
+    message is returned instead.
+    """
+    cache = get_response_cache() if cache_key else None
+    if cache is not None:
+        cached = cache.get(cache_key, GROQ_MODELS)
+        if cached is not None:
+            return cached
+
+    async def answer(llm, lease):
+        with lease:
+            return lease, await llm.ainvoke(prompt)
+
+    launch = _launcher(answer, [])
+    try:
+        await _import_client()
+        lease, response = await asyncio.wait_for(
+            race(launch, hedge_delay_s, LLM_MAX_ATTEMPTS, hedge_metrics), deadline_s
+        )
+    except asyncio.TimeoutError:
+        hedge_metrics.record("deadline_exceeded")
+        return f"⏳ No AI recommendation within {deadline_s:g} s. Please try again shortly."
+    except Exception as e:
+        return _fallback_message(e)
+    finally:
+        _log_llm_stats()
+
+    if cache is not None:
+        cache.put(lease.model, cache_key, response.content)
+    return response.content
+
+
+def invoke_llm(prompt, cache_key=None):
+    """
+    Returns the LLM response to ``prompt``, or a fallback message.
+    With a ``cache_key`` a cached answer is returned without calling the LLM,
+    and a successful fresh answer is cached. Runs ``ainvoke_llm`` to
+    completion, so it must not be called from a running event loop.
+    """
+    # Unlike asyncio.run, closing the loop does not wait for a client import
+    # still running in its executor, so the deadline also bounds this call.
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(ainvoke_llm(prompt, cache_key))
+    finally:
+        loop.close()
+
+
+async def _open_stream(llm, lease, prompt):
+    """Start streaming on ``lease`` and wait for the first non-empty piece.
+
+    Returns the lease, the pieces received so far and the open stream (None
+    once it has ended); the caller then owns the lease and the stream.
+    """
+    stream = llm.astream(prompt)
+    pieces = []
+    try:
+        async for chunk in stream:
+            pieces.append(chunk.content)
+            if chunk.content:
+                return lease, pieces, stream
+    except Exception as e:
+        lease.failed(e)
+        raise
+    except BaseException:  # cancelled: lost the race or past the deadline
+        lease.outpaced()
+        await stream.aclose()
+        raise
+    lease.succeeded()
+    return lease, pieces, None
+
+
+async def _close_stream(opened):
+    """Free a stream opened by ``_open_stream`` that lost the race."""
+    lease, _, stream = opened
+    if stream is not None:
+        lease.outpaced()
+        await stream.aclose()
+
+
+async def astream_llm(
+    prompt,
+    cache_key=None,
+    deadline_s=LLM_DEADLINE_S,
+    hedge_delay_s=LLM_STREAM_HEDGE_DELAY_S,
+):
+    """Async ``stream_llm``, hedged on the time to the first token.
+
+    If the first pair has sent nothing within ``hedge_delay_s`` a second one
+    is started; whichever streams first is kept and the other cancelled.
+    Failures before the first token move to another pair. When
+    ``deadline_s`` passes the answer so far is closed with a note; if
+    nothing was received, or every attempt failed, a fallback message is
+    yielded instead.
+    """
+    cache = get_response_cache() if cache_key else None
+    if cache is not None:
+        cached = cache.get(cache_key, GROQ_MODELS)
+        if cached is not None:
+            yield cached
+            return
+
+    loop = asyncio.get_running_loop()
+    launch = _launcher(lambda llm, lease: _open_stream(llm, lease, prompt), [])
+    lease = stream = None
+    reported = False  # exactly one outcome per lease
     try:
-        groq_llm, llm_name = get_groq_llm()
-        response = groq_llm.invoke(prompt)
-        return response.content
+        await _import_client()
+        deadline = loop.time() + deadline_s
+        lease, pieces, stream = await asyncio.wait_for(
+            race(
+                launch,
+                hedge_delay_s,
+                LLM_MAX_ATTEMPTS,
+                hedge_metrics,
+                discard=_close_stream,
+            ),
+            deadline - loop.time(),
+        )
+        for piece in pieces:
+            yield piece
+        while stream is not None:
+            try:
+                chunk = await asyncio.wait_for(
+                    anext(stream), max(0.0, deadline - loop.time())
+                )
+            except StopAsyncIteration:
+                stream = None
+                lease.succeeded()
+                break
+            pieces.append(chunk.content)
+            yield chunk.content
 
+    except asyncio.TimeoutError:
+        hedge_metrics.record("deadline_exceeded")
+        if lease is None:
+            yield f"⏳ No AI recommendation within {deadline_s:g} s. Please try again shortly."
+        else:
+            # The deadline is this caller's budget, not a fault of the pair:
+            # its time so far counts as latency, the breaker is left alone.
+            lease.outpaced()
+            reported = True
+            yield f"\n\n⏳ *Answer cut short: the AI model did not finish within {deadline_s:g} s.*"
+        return
     except Exception as e:
-        # You can also log the error using `logging` if preferred
-        return f"⚠️ An error occurred while generating LLM output: {e}"
+        if lease is not None:
+            lease.failed(e)
+            reported = True
+        yield _fallback_message(e)
+        return
+    finally:
+        if stream is not None:
+            if not reported:
+                lease.release()  # closed by the caller: no outcome
+            await stream.aclose()
+        _log_llm_stats()
+
+    if cache is not None:
+        cache.put(lease.model, cache_key, "".join(pieces))
+
+
+def stream_llm(prompt, cache_key=None):
+    """Yield the response to ``prompt`` piece by piece as the LLM generates it.
+
+    Drives ``astream_llm`` on a private event loop, so Streamlit can render
+    it with ``st.write_stream``. Failures and timeouts are reported with a
+    fallback message, appended to whatever was already streamed. With a
+    ``cache_key`` a cached answer is yielded in one piece, and a fresh one is
+    cached once fully received.
+    """
+    loop = asyncio.new_event_loop()
+    pieces = astream_llm(prompt, cache_key)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(anext(pieces))
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(pieces.aclose())
+        loop.close()
+
+
+def get_llm_executor():
+    """
+    Returns the process-wide thread pool that runs LLM calls in the background.
+    Each streamed answer occupies one worker until it ends or is abandoned.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    LLM_BACKGROUND_WORKERS, thread_name_prefix="llm"
+                )
+    return _executor
+
+
+def warm_up_llm():
+    """Import the chat client on the background executor ahead of the first call."""
+    global _client_warmup
+    executor = get_llm_executor()
+    with _executor_lock:
+        if _client_warmup is None:
+            _client_warmup = executor.submit(importlib.import_module, "langchain_groq")
+    return _client_warmup
+
+
+def stream_llm_background(prompt, cache_key=None):
+    """Start ``stream_llm`` on the background executor and return its pieces.
+
+    The request goes out immediately, so the caller can keep rendering while
+    the first tokens arrive; pieces are buffered until the returned generator
+    reads them. Closing the generator stops the stream at the next piece.
+    """
+    pieces = queue.Queue()
+    stop = threading.Event()
+
+    def produce():
+        stream = stream_llm(prompt, cache_key)
+        try:
+            for piece in stream:
+                if stop.is_set():
+                    break
+                pieces.put(piece)
+        except BaseException as e:
+            pieces.put(e)
+        finally:
+            stream.close()
+            pieces.put(_STREAM_END)
+
+    get_llm_executor().submit(produce)
+    return _drain(pieces, stop)
+
+
+def _drain(pieces, stop):
+    try:
+        while (piece := pieces.get()) is not _STREAM_END:
+            if isinstance(piece, BaseException):
+                raise piece
+            yield piece
+    finally:
+        stop.set()
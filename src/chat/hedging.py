@@ -0,0 +1,104 @@
+import asyncio
+import collections
+import threading
+from chat.scheduler import LLMUnavailableError, failure_scope
+
+HEDGE_EVENTS = [
+    "calls",
+    "hedged",
+    "primary_wins",
+    "hedge_wins",
+    "retry_wins",
+    "deadline_exceeded",
+    "failed",
+]
+
+
+class HedgeMetrics:
+    """Counts of hedged LLM calls and who answered them, safe across threads.
+
+    ``hedged`` counts calls that fired a second request because the first
+    was slow, ``hedge_wins`` those where the second one answered first, and
+    ``retry_wins`` calls answered by a request started after a failure.
+    """
+
+    def __init__(self):
+        self._counts = collections.Counter()
+        self._lock = threading.Lock()
+
+    def record(self, event):
+        with self._lock:
+            self._counts[event] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = {event: self._counts[event] for event in HEDGE_EVENTS}
+        stats["hedge_rate"] = (
+            stats["hedged"] / stats["calls"] if stats["calls"] else 0.0
+        )
+        return stats
+
+
+async def race(launch, hedge_delay_s, max_attempts, metrics, discard=None):
+    """Result of the first of up to ``max_attempts`` requests to succeed.
+
+    ``launch(hedge)`` returns the coroutine of one request on a fresh API
+    key/model pair. For a hedge (``hedge=True``) it raises
+    ``LLMUnavailableError`` at once when no pair is free; otherwise the
+    coroutine waits for a pair and raises it when none frees up in time.
+    The first request is hedged with a second one if it has not finished
+    within ``hedge_delay_s``, and a request that fails is replaced while
+    nothing else is in flight. The first result wins and every other
+    request is cancelled; when all of them fail, the last error is raised.
+    Other requests that succeeded too (in the same wakeup as the winner, or
+    before their cancellation took effect) are passed to the coroutine
+    ``discard(result)``, so their resources are freed.
+    """
+    metrics.record("calls")
+    pending = {}
+    hedged = False
+    error = None
+    try:
+        pending[asyncio.ensure_future(launch(False))] = "primary"
+        started = 1
+        while pending:
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=None if hedged else hedge_delay_s,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                hedged = True
+                if started < max_attempts:
+                    try:
+                        pending[asyncio.ensure_future(launch(True))] = "hedge"
+                        started += 1
+                        metrics.record("hedged")
+                    except LLMUnavailableError:
+                        pass  # no spare pair; keep waiting for the first one
+                continue
+            for task in done:
+                role = pending.pop(task)
+                if task.exception() is None:
+                    metrics.record(f"{role}_wins")
+                    return task.result()
+                error = task.exception()
+            # Running out of pairs is not fixed by waiting for one again.
+            retryable = failure_scope(error) and not isinstance(
+                error, LLMUnavailableError
+            )
+            if not pending and started < max_attempts and retryable:
+                pending[asyncio.ensure_future(launch(False))] = "retry"
+                started += 1
+        raise error
+    except Exception:
+        metrics.record("failed")
+        raise
+    finally:
+        for task in pending:
+            task.cancel()
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        if discard is not None:
+            for result in results:
+                if not isinstance(result, BaseException):
+                    await discard(result)
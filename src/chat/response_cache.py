@@ -0,0 +1,249 @@
+import functools
+import hashlib
+import json
+import logging
+import numbers
+import os
+import sqlite3
+import threading
+import time
+from config.config import LLM_CACHE_MAX_ENTRIES, LLM_CACHE_PATH, LLM_CACHE_TTL_S
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    model TEXT NOT NULL,
+    key TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (model, key)
+);
+CREATE INDEX IF NOT EXISTS responses_lru ON responses (model, last_used);
+CREATE INDEX IF NOT EXISTS responses_key ON responses (key);
+CREATE TABLE IF NOT EXISTS stats (
+    model TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+logger = logging.getLogger(__name__)
+
+# Stats row of lookups that found no answer, from whichever model.
+ANY_MODEL = "*"
+
+_response_cache = None
+_response_cache_failed = False
+_response_cache_lock = threading.Lock()
+
+
+def normalize_field(value):
+    """Canonical form of one prompt field: trimmed lower-case text, plain numbers."""
+    if hasattr(value, "item"):  # NumPy scalar
+        value = value.item()
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        return format(float(value), "g")
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _template_digest(template):
+    return hashlib.sha256(template.encode()).hexdigest()
+
+
+def prompt_key(template, fields):
+    """Cache key for a prompt rendered from ``template`` with ``fields``.
+
+    Fields are normalized first, so answers are shared by inputs that differ
+    only in case, spacing or number formatting, and any edit to the template
+    starts a fresh set of keys.
+    """
+    payload = json.dumps(
+        {
+            "template": _template_digest(template),
+            "fields": {name: normalize_field(v) for name, v in fields.items()},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed cache of LLM answers, shared by every process on the host.
+
+    The database runs in WAL mode, so readers never wait for a writer and
+    several Streamlit or worker processes can use it at once. Entries are
+    partitioned by model: each model keeps at most ``max_entries`` answers,
+    least recently used first out, and answers older than ``ttl_s`` are
+    never served. Hit and miss counters live in the same file.
+
+    The cache fails open: a locked, read-only or corrupt database is logged
+    and ``get`` then reports a miss and ``put`` skips the write.
+    """
+
+    def __init__(
+        self,
+        path=LLM_CACHE_PATH,
+        ttl_s=LLM_CACHE_TTL_S,
+        max_entries=LLM_CACHE_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self):
+        """This thread's connection; a forked child opens its own."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _count(self, model, column):
+        self._connection().execute(
+            f"INSERT INTO stats (model, {column}) VALUES (?, 1) "
+            f"ON CONFLICT (model) DO UPDATE SET {column} = {column} + 1",
+            (model,),
+        )
+
+    def get(self, key, models):
+        """Freshest unexpired answer for ``key`` from any of ``models``, or None.
+
+        Prompts are model-agnostic, so an answer cached by one configured
+        model serves requests that would have been scheduled on another; the
+        hit is counted against the model that wrote it. Every lookup is
+        counted here, so a miss is recorded whether or not a fresh answer
+        is then obtained.
+        """
+        try:
+            return self._get(key, list(models))
+        except sqlite3.Error as e:
+            logger.warning("LLM response cache lookup failed: %s", e)
+            return None
+
+    def _get(self, key, models):
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            f"SELECT model, response FROM responses WHERE key = ? AND created > ? "
+            f"AND model IN ({', '.join('?' * len(models))}) "
+            f"ORDER BY created DESC LIMIT 1",
+            (key, now - self.ttl_s, *models),
+        ).fetchone()
+        if row is None:
+            # The model that would answer is not known yet.
+            self._count(ANY_MODEL, "misses")
+            return None
+        model, response = row
+        connection.execute(
+            "UPDATE responses SET last_used = ? WHERE model = ? AND key = ?",
+            (now, model, key),
+        )
+        self._count(model, "hits")
+        return response
+
+    def put(self, model, key, response):
+        """Store an answer, then trim the model's partition to its bounds."""
+        try:
+            self._put(model, key, response)
+        except sqlite3.Error as e:
+            logger.warning("LLM response cache write skipped: %s", e)
+
+    def _put(self, model, key, response):
+        now = time.time()
+        connection = self._connection()
+        with connection:  # one transaction
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (model, key, response, now, now),
+            )
+            connection.execute(
+                "DELETE FROM responses WHERE model = ? AND created <= ?",
+                (model, now - self.ttl_s),
+            )
+            connection.execute(
+                "DELETE FROM responses WHERE model = ? AND key NOT IN ("
+                "SELECT key FROM responses WHERE model = ? "
+                "ORDER BY last_used DESC LIMIT ?)",
+                (model, model, self.max_entries),
+            )
+
+    def clear(self, model=None):
+        """Drop every cached answer, or only those of ``model``."""
+        if model is None:
+            self._connection().execute("DELETE FROM responses")
+        else:
+            self._connection().execute(
+                "DELETE FROM responses WHERE model = ?", (model,)
+            )
+
+    def stats(self):
+        """Lookup totals, plus entries and hits served per model.
+
+        Misses belong to no model, so they are only counted in the totals.
+        None if the database cannot be read.
+        """
+        try:
+            return self._stats()
+        except sqlite3.Error as e:
+            logger.warning("LLM response cache stats unavailable: %s", e)
+            return None
+
+    def _stats(self):
+        connection = self._connection()
+        models = {}
+        hits = misses = 0
+        for model, model_hits, model_misses in connection.execute(
+            "SELECT model, hits, misses FROM stats"
+        ):
+            hits += model_hits
+            misses += model_misses
+            if model != ANY_MODEL:
+                models[model] = {"entries": 0, "hits": model_hits}
+        for model, entries in connection.execute(
+            "SELECT model, COUNT(*) FROM responses GROUP BY model"
+        ):
+            models.setdefault(model, {"entries": 0, "hits": 0})
+            models[model]["entries"] = entries
+        lookups = hits + misses
+        return {
+            "lookups": lookups,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "models": models,
+        }
+
+
+def get_response_cache():
+    """Process-wide response cache, or None when ``LLM_CACHE_PATH`` is empty.
+
+    Also None, for the rest of the process, when the database cannot be
+    opened; LLM calls then go uncached.
+    """
+    global _response_cache, _response_cache_failed
+    if not LLM_CACHE_PATH:
+        return None
+    if _response_cache is None and not _response_cache_failed:
+        with _response_cache_lock:
+            if _response_cache is None and not _response_cache_failed:
+                try:
+                    _response_cache = LLMResponseCache(LLM_CACHE_PATH)
+                except (sqlite3.Error, OSError) as e:
+                    _response_cache_failed = True
+                    logger.warning(
+                        "LLM response cache disabled, cannot open %s: %s",
+                        LLM_CACHE_PATH,
+                        e,
+                    )
+    return _response_cache
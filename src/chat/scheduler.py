@@ -0,0 +1,360 @@
+import asyncio
+import itertools
+import threading
+import time
+from config.config import (
+    LLM_BREAKER_BASE_BACKOFF_S,
+    LLM_BREAKER_MAX_BACKOFF_S,
+    LLM_LATENCY_EWMA_ALPHA,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_SCHEDULER_MAX_WAIT_S,
+)
+
+# Async waiters are not woken by the condition variable, so they poll for
+# trial-call outcomes at this interval.
+_ASYNC_POLL_S = 0.05
+
+
+class LLMUnavailableError(RuntimeError):
+    """No API key/model pair could take a request within the wait limit.
+
+    When pairs are out of rotation because calls on them failed, the error
+    that tripped them is the ``__cause__``, preferring a rejected key or an
+    unknown model over a transient failure.
+    """
+
+
+def error_status(error):
+    """HTTP status code carried by an LLM client exception, if any."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+def retry_after(error):
+    """Seconds from a ``Retry-After`` header on the error's response, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def failure_scope(error):
+    """What a failed call says is unhealthy: "key", "model", "pair" or None.
+
+    Rejected credentials disable the key for every model and an unknown or
+    decommissioned model is skipped on every key. Rate limits, server errors
+    and network failures count against the pair. Other client errors describe
+    the request itself, so they are not held against any pair.
+    """
+    status = error_status(error)
+    message = str(error).lower()
+    if status in (401, 403):
+        return "key"
+    if status == 404 or "decommissioned" in message or "model_not_found" in message:
+        return "model"
+    if status is None or status in (408, 409, 429) or status >= 500:
+        return "pair"
+    return None
+
+
+class _PairState:
+    """Rate budget, latency and circuit breaker of one API key/model pair."""
+
+    def __init__(self, key_index, api_key, model, capacity, now):
+        self.key_index = key_index
+        self.api_key = api_key
+        self.model = model
+        self.tokens = float(capacity)
+        self.refilled = now
+        self.latency = None  # EWMA in seconds; None until the first success
+        self.failures = 0  # consecutive
+        self.open_until = 0.0
+        self.probing = False  # a half-open trial call is in flight
+        self.tripped_at = float("-inf")  # when the breaker last opened
+        self.last_error = None  # the failure that opened it
+        self.last_picked = 0
+        self.requests = 0
+        self.errors = 0
+
+    def stats(self, now):
+        return {
+            "key": f"#{self.key_index}",
+            "model": self.model,
+            "tokens": round(self.tokens, 2),
+            "latency_s": None if self.latency is None else round(self.latency, 3),
+            "failures": self.failures,
+            "open_for_s": round(max(0.0, self.open_until - now), 1),
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+class LLMLease:
+    """One scheduled call on an API key/model pair.
+
+    Report the outcome with ``succeeded()`` or ``failed(error)``, or use the
+    lease as a context manager, which does so from the ``with`` block. A call
+    cancelled mid-way (a lost hedge) only reports its elapsed time, and one
+    abandoned by the caller (a closed stream) reports nothing.
+    """
+
+    def __init__(self, scheduler, pair):
+        self._scheduler = scheduler
+        self._pair = pair
+        self.api_key = pair.api_key
+        self.model = pair.model
+        self.probe = pair.probing  # the half-open trial call of the pair
+        self.started = time.monotonic()
+
+    def succeeded(self):
+        self._scheduler._report(self, time.monotonic() - self.started)
+
+    def failed(self, error):
+        self._scheduler._report(self, error=error)
+
+    def outpaced(self):
+        """The call was cancelled: another pair answered first, or time ran out.
+
+        Its time so far is a lower bound of its latency, so it still counts
+        towards the EWMA, while the breaker is left as it was.
+        """
+        self._scheduler._report(self, time.monotonic() - self.started, healthy=False)
+
+    def release(self):
+        """Give the pair back without an outcome, e.g. for a closed stream."""
+        self._scheduler._report(self, healthy=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.succeeded()
+        elif issubclass(exc_type, Exception):
+            self.failed(exc)
+        elif issubclass(exc_type, asyncio.CancelledError):
+            self.outpaced()
+        else:  # GeneratorExit, KeyboardInterrupt
+            self.release()
+
+
+class LLMScheduler:
+    """Thread-safe choice of the healthiest API key/model pair per request.
+
+    Every pair has a token bucket of ``requests_per_minute`` (refilled
+    continuously, bursting up to one minute's budget), an EWMA of successful
+    call latency and a circuit breaker. A failed pair opens its breaker for
+    an exponentially growing backoff (``base_backoff_s`` doubling per
+    consecutive failure, capped at ``max_backoff_s``, and at least any
+    ``Retry-After`` the API sent); a rejected key or an unknown model opens
+    the breaker of every pair sharing it for ``max_backoff_s`` at once. Once
+    the backoff expires a single trial call is let through, and its success
+    closes the breaker again. Outcomes of calls started before the breaker
+    last opened are stale and leave it as it is.
+
+    ``acquire`` picks, among pairs with a closed breaker and a token to
+    spend, the one with the lowest latency EWMA. Untried pairs go first, and
+    ties go to the pair picked least recently, so load still rotates over
+    keys and models. When no pair is ready it waits for the soonest one, up
+    to ``max_wait_s``. ``acquire_async`` does the same without blocking an
+    event loop.
+    """
+
+    def __init__(
+        self,
+        api_keys,
+        models,
+        requests_per_minute=LLM_REQUESTS_PER_MINUTE,
+        ewma_alpha=LLM_LATENCY_EWMA_ALPHA,
+        base_backoff_s=LLM_BREAKER_BASE_BACKOFF_S,
+        max_backoff_s=LLM_BREAKER_MAX_BACKOFF_S,
+        max_wait_s=LLM_SCHEDULER_MAX_WAIT_S,
+    ):
+        self.rate = requests_per_minute / 60
+        self.capacity = max(1.0, float(requests_per_minute))
+        self.ewma_alpha = ewma_alpha
+        self.base_backoff_s = base_backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.max_wait_s = max_wait_s
+        self._ticks = itertools.count(1)
+        self._changed = threading.Condition()
+        now = time.monotonic()
+        # Unset keys are skipped; with none at all the client falls back to
+        # its own environment lookup and reports the missing key itself.
+        keys = [key for key in api_keys if key] or [None]
+        self._pairs = []
+        for key_index, key in enumerate(keys):
+            for model in models:
+                self._pairs.append(
+                    _PairState(key_index, key, model, self.capacity, now)
+                )
+
+    def _refill(self, pair, now):
+        pair.tokens = min(
+            self.capacity, pair.tokens + (now - pair.refilled) * self.rate
+        )
+        pair.refilled = now
+
+    def _ready_in(self, pair, now):
+        """Seconds until ``pair`` can take a call (0 when it can now)."""
+        if pair.probing:
+            return float("inf")
+        return max(pair.open_until - now, (1 - pair.tokens) / self.rate, 0.0)
+
+    def _pick(self, excluded):
+        """Lease the best ready pair, else None and the seconds until one may be.
+
+        Must be called holding ``self._changed``.
+        """
+        now = time.monotonic()
+        candidates = []
+        for pair in self._pairs:
+            if (pair.api_key, pair.model) in excluded:
+                continue
+            self._refill(pair, now)
+            candidates.append((self._ready_in(pair, now), pair))
+        if not candidates:
+            raise LLMUnavailableError("No other API key/model pair to try")
+        ready = [pair for wait, pair in candidates if wait == 0]
+        if not ready:
+            return None, min(wait for wait, _ in candidates)
+        pair = min(
+            ready,
+            key=lambda p: (p.latency is not None, p.latency or 0.0, p.last_picked),
+        )
+        pair.tokens -= 1
+        pair.probing = pair.open_until > 0
+        pair.last_picked = next(self._ticks)
+        pair.requests += 1
+        return LLMLease(self, pair), 0.0
+
+    def _check_wait(self, wait, remaining, excluded):
+        # An infinite wait means only trial calls are pending; their outcome
+        # is awaited until the deadline.
+        if remaining <= 0 or (wait > remaining and wait != float("inf")):
+            raise LLMUnavailableError(
+                "Every API key/model pair is rate limited or failing; "
+                "try again shortly"
+            ) from self._trip_cause(excluded)
+
+    def _trip_cause(self, excluded):
+        """The most telling error behind the open breakers, if any."""
+        with self._changed:
+            now = time.monotonic()
+            tripped = [
+                pair
+                for pair in self._pairs
+                if (pair.api_key, pair.model) not in excluded
+                and pair.open_until > now
+                and pair.last_error is not None
+            ]
+            if not tripped:
+                return None
+            pair = max(
+                tripped,
+                key=lambda p: (
+                    failure_scope(p.last_error) in ("key", "model"),
+                    p.tripped_at,
+                ),
+            )
+            return pair.last_error
+
+    def acquire(self, exclude=(), max_wait_s=None):
+        """Lease the healthiest pair, skipping pairs leased in ``exclude``.
+
+        ``max_wait_s`` overrides the scheduler's wait limit; 0 fails at once
+        when no pair is ready.
+        """
+        excluded = {(lease.api_key, lease.model) for lease in exclude}
+        if max_wait_s is None:
+            max_wait_s = self.max_wait_s
+        deadline = time.monotonic() + max_wait_s
+        with self._changed:
+            while True:
+                lease, wait = self._pick(excluded)
+                if lease is not None:
+                    return lease
+                remaining = deadline - time.monotonic()
+                self._check_wait(wait, remaining, excluded)
+                self._changed.wait(min(wait, remaining))
+
+    async def acquire_async(self, exclude=(), max_wait_s=None):
+        """``acquire`` for a running event loop.
+
+        Waits with ``asyncio.sleep``, so other tasks keep running, and a
+        caller cancelled while waiting holds no lease.
+        """
+        excluded = {(lease.api_key, lease.model) for lease in exclude}
+        if max_wait_s is None:
+            max_wait_s = self.max_wait_s
+        deadline = time.monotonic() + max_wait_s
+        while True:
+            with self._changed:
+                lease, wait = self._pick(excluded)
+            if lease is not None:
+                return lease
+            remaining = deadline - time.monotonic()
+            self._check_wait(wait, remaining, excluded)
+            await asyncio.sleep(min(wait, remaining, _ASYNC_POLL_S))
+
+    def _report(self, lease, latency=None, error=None, healthy=True):
+        pair = lease._pair
+        with self._changed:
+            if lease.probe:
+                pair.probing = False
+            if latency is not None:
+                pair.latency = (
+                    latency
+                    if pair.latency is None
+                    else self.ewma_alpha * latency
+                    + (1 - self.ewma_alpha) * pair.latency
+                )
+            if error is None and healthy:
+                if lease.started >= pair.tripped_at:
+                    pair.failures = 0
+                    pair.open_until = 0.0
+                    pair.last_error = None
+            elif error is not None:
+                pair.errors += 1
+                scope = failure_scope(error)
+                if scope == "key":
+                    tripped = [p for p in self._pairs if p.api_key == pair.api_key]
+                elif scope == "model":
+                    tripped = [p for p in self._pairs if p.model == pair.model]
+                else:
+                    tripped = [pair] if scope == "pair" else []
+                now = time.monotonic()
+                for p in tripped:
+                    if lease.started < p.tripped_at:
+                        continue  # already opened since this call began
+                    p.failures += 1
+                    if scope == "pair":
+                        backoff = min(
+                            self.max_backoff_s,
+                            self.base_backoff_s * 2 ** (p.failures - 1),
+                        )
+                    else:  # retrying will not fix a key or a model
+                        backoff = self.max_backoff_s
+                    backoff = max(backoff, retry_after(error) or 0.0)
+                    p.open_until = max(p.open_until, now + backoff)
+                    p.tripped_at = now
+                    p.last_error = error
+            self._changed.notify_all()
+
+    def stats(self):
+        """Budget, latency and breaker state per pair, healthiest first."""
+        with self._changed:
+            now = time.monotonic()
+            for pair in self._pairs:
+                self._refill(pair, now)
+            return sorted(
+                (pair.stats(now) for pair in self._pairs),
+                key=lambda s: (
+                    s["open_for_s"],
+                    s["latency_s"] is not None,
+                    s["latency_s"] or 0.0,
+                ),
+            )
@@ -2,9 +2,27 @@ import os
 
 # ------------------------ Constants & Config ------------------------
 BASE_PATH = "src"
+SCIBERT_BUNDLE_VERSION = os.getenv("SCIBERT_BUNDLE_VERSION", "v1")
+# Compressed classifier built by tools.compress_forest (e.g. "t25_d12");
+# empty uses the full random forest.
+CLASSIFIER_VARIANT = os.getenv("CLASSIFIER_VARIANT", "")
+FOREST_VARIANTS_DIR = os.path.join(BASE_PATH, "models", "classifiers", "variants")
+# Versioned artifacts published by tools.publish_model; when its CURRENT
+# pointer exists, CorrosionClassifier serves that version instead of
+# MODEL_PATHS and checks for a new one every MODEL_RELOAD_INTERVAL_S
+# seconds (0 disables hot reload).
+MODEL_REGISTRY_DIR = os.getenv(
+    "MODEL_REGISTRY_DIR", os.path.join(BASE_PATH, "models", "registry")
+)
+MODEL_RELOAD_INTERVAL_S = float(os.getenv("MODEL_RELOAD_INTERVAL_S", "5"))
 MODEL_PATHS = {
     "pca": os.path.join(BASE_PATH, "models", "decomposers", "pca.pkl"),
-    "model": os.path.join(BASE_PATH, "models", "classifiers", "rf_all_data.pkl"),
+    "model": (
+        os.path.join(FOREST_VARIANTS_DIR, f"{CLASSIFIER_VARIANT}.npz")
+        if CLASSIFIER_VARIANT
+        else os.path.join(BASE_PATH, "models", "classifiers", "rf_all_data.pkl")
+    ),
+    "full_model": os.path.join(BASE_PATH, "models", "classifiers", "rf_all_data.pkl"),
     "uns_encoder": os.path.join(BASE_PATH, "models", "encoders", "uns_encoder.pkl"),
     "env_encoder": os.path.join(
         BASE_PATH, "models", "encoders", "env_target_encoder.pkl"
@@ -12,6 +30,21 @@ MODEL_PATHS = {
     "temp_scaler": os.path.join(
         BASE_PATH, "models", "scalers", "temprature_scaler.pkl"
     ),
+    "encoding_tables": os.path.join(
+        BASE_PATH, "models", "encoders", "encoding_tables.npz"
+    ),
+    "pipeline": os.path.join(
+        BASE_PATH, "models", "pipelines", "fused_preprocessor.pkl"
+    ),
+    "mmap_artifacts": os.path.join(BASE_PATH, "models", "mmap"),
+    "corrosion_map": os.path.join(BASE_PATH, "models", "maps", "corrosion_map.npz"),
+    "flat_forest": os.path.join(
+        BASE_PATH, "models", "classifiers", "rf_all_data_flat.npz"
+    ),
+    "scibert": os.path.join(BASE_PATH, "models", "scibert", SCIBERT_BUNDLE_VERSION),
+    "scibert_onnx": os.path.join(
+        BASE_PATH, "models", "scibert", SCIBERT_BUNDLE_VERSION, "model.onnx"
+    ),
 }
 NOT_COMPOSE_COLUMNS = [
     "Environment",
@@ -20,11 +53,78 @@ NOT_COMPOSE_COLUMNS = [
     "Concentration_clean",
 ]
 CATEGORICAL_COLUMNS = ["Environment"]
+# "prior": unseen Environment/UNS labels get the encoder's prior (as the
+# fitted encoders do); "error": reject them with a ValueError.
+UNKNOWN_CATEGORY_POLICY = os.getenv("UNKNOWN_CATEGORY_POLICY", "prior")
+# Load the exports under MODEL_PATHS["mmap_artifacts"] (tools.export_mmap_artifacts)
+# with mmap_mode="r" when present, so worker processes share their pages.
+ARTIFACT_MMAP = os.getenv("ARTIFACT_MMAP", "1") != "0"
+# Larger batches go to sklearn, whose compiled tree walk wins at volume.
+FLAT_FOREST_MAX_ROWS = int(os.getenv("FLAT_FOREST_MAX_ROWS", "512"))
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+# Texts per task handed to an EmbeddingPool worker (utils.embedding_pool).
+EMBEDDING_POOL_CHUNK_SIZE = int(os.getenv("EMBEDDING_POOL_CHUNK_SIZE", "256"))
+EMBEDDING_MAX_LENGTH = 128
+SCIBERT_MODEL_NAME = "allenai/scibert_scivocab_uncased"
+SCIBERT_EMBEDDING_DIM = 768
+SCIBERT_BACKENDS = ["torch", "torch-int8", "onnx"]
+SCIBERT_BACKEND = os.getenv("SCIBERT_BACKEND", "torch")
+SCIBERT_WARMUP = os.getenv("SCIBERT_WARMUP", "1") == "1"
+# Intra-op threads: unset for the library default, a number, or "auto" to
+# benchmark the candidates at startup. Inter-op threads default to 1 since
+# every forward pass is a single graph.
+INFERENCE_NUM_THREADS = os.getenv("INFERENCE_NUM_THREADS", "")
+INFERENCE_INTEROP_THREADS = os.getenv("INFERENCE_INTEROP_THREADS", "1")
+EMBEDDING_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR", os.path.join(BASE_PATH, "models", "embedding_cache")
+)
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000"))
+SERVICE_HOST = os.getenv("SERVICE_HOST", "0.0.0.0")
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8000"))
+SERVICE_MAX_BATCH_SIZE = int(os.getenv("SERVICE_MAX_BATCH_SIZE", "64"))
+SERVICE_MAX_WAIT_MS = float(os.getenv("SERVICE_MAX_WAIT_MS", "10"))
+SERVICE_REQUEST_TIMEOUT_S = float(os.getenv("SERVICE_REQUEST_TIMEOUT_S", "30"))
+BATCH_INPUT_COLUMNS = ["Environment", "Temperature", "Concentration", "UNS", "Comment"]
+# Rows read, scored and written at a time when scoring uploaded CSV files.
+BATCH_CHUNK_ROWS = int(os.getenv("BATCH_CHUNK_ROWS", "2000"))
+BATCH_OUTPUT_FORMATS = ["csv", "parquet"]
+# Default grid of tools.build_corrosion_map: every environment x alloy at
+# these temperatures (deg C) and concentrations (%), with one fixed comment.
+CORROSION_MAP_TEMPERATURES = list(range(0, 201, 5))
+CORROSION_MAP_CONCENTRATIONS = list(range(0, 101, 10))
+CORROSION_MAP_COMMENT = ""
+# Upper bound on temperature x concentration points per sensitivity sweep.
+SWEEP_MAX_POINTS = int(os.getenv("SWEEP_MAX_POINTS", "50000"))
 PAGE_ICON = "src/assets/images/corrosive.png"
 PIPE_ICON = "src/assets/images/pipe.png"
 SIDEBAR_IMAGE = (
     "https://www.ddcoatings.co.uk/wp-content/uploads/2019/09/pipeline-corrosion.jpg"
 )
+# Persistent cache of LLM answers shared by all processes (chat.response_cache);
+# set LLM_CACHE_PATH to an empty string to disable it.
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(BASE_PATH, "models", "llm_cache", "responses.sqlite3"),
+)
+LLM_CACHE_TTL_S = float(os.getenv("LLM_CACHE_TTL_S", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))  # per model
+# API key/model scheduling (chat.scheduler): request budget per pair, latency
+# smoothing, circuit breaker backoff and the longest wait for a free pair.
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "30"))
+LLM_LATENCY_EWMA_ALPHA = float(os.getenv("LLM_LATENCY_EWMA_ALPHA", "0.3"))
+LLM_BREAKER_BASE_BACKOFF_S = float(os.getenv("LLM_BREAKER_BASE_BACKOFF_S", "2"))
+LLM_BREAKER_MAX_BACKOFF_S = float(os.getenv("LLM_BREAKER_MAX_BACKOFF_S", "300"))
+LLM_SCHEDULER_MAX_WAIT_S = float(os.getenv("LLM_SCHEDULER_MAX_WAIT_S", "10"))
+# Pairs tried per recommendation before the error is shown.
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "3"))
+# Hedging (chat.hedging): a second pair is asked when the first has not
+# answered (or, when streaming, sent its first token) within the delay.
+LLM_HEDGE_DELAY_S = float(os.getenv("LLM_HEDGE_DELAY_S", "4"))
+LLM_STREAM_HEDGE_DELAY_S = float(os.getenv("LLM_STREAM_HEDGE_DELAY_S", "1.5"))
+# Per-call deadline after which a fallback (or the partial answer) is shown.
+LLM_DEADLINE_S = float(os.getenv("LLM_DEADLINE_S", "60"))
+# Threads running LLM calls in the background, one per answer being streamed.
+LLM_BACKGROUND_WORKERS = int(os.getenv("LLM_BACKGROUND_WORKERS", "16"))
 GROQ_MODELS = [
     "llama-3.3-70b-versatile",
     "llama3-70b-8192",
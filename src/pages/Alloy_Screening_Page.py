@@ -0,0 +1,108 @@
+import streamlit as st
+from config.config import PAGE_ICON
+from utils.predictor import CorrosionClassifier
+from utils.vars import environment, uns_nums
+
+st.set_page_config(page_title="Alloy Screening", layout="wide", page_icon=PAGE_ICON)
+
+clf = CorrosionClassifier()
+
+# ------------------------ Sidebar ------------------------
+with st.sidebar:
+    st.markdown("## 🧬 Alloy Screening")
+    st.markdown(
+        "Rank every alloy for one environment and condition in a single pass "
+        "instead of predicting them one by one."
+    )
+    st.markdown("🔬 Powered by ML | 📊 PCA | 🧠 SciBERT")
+
+# ------------------------ Page Header ------------------------
+st.markdown(
+    "<h1 style='text-align: center;'>🧬 Alloy Screening</h1>",
+    unsafe_allow_html=True,
+)
+st.markdown(
+    "<p style='text-align: center; font-size: 18px;'>Describe the service "
+    "conditions to rank all alloys by predicted corrosion rate.</p>",
+    unsafe_allow_html=True,
+)
+
+# ------------------------ Input Form ------------------------
+with st.form("alloy_screening_form"):
+    col1, col2 = st.columns(2)
+
+    with col1:
+        env = st.selectbox(
+            "🌍 Environment",
+            options=environment,
+            help="Select the surrounding medium (e.g., seawater, acidic, etc.)",
+        )
+        temp = st.number_input(
+            "🌡️ Temperature (°C)",
+            step=1,
+            value=25,
+            help="Temperature of the environment in Celsius",
+        )
+
+    with col2:
+        conc = st.number_input(
+            "🧪 Concentration (%)",
+            min_value=0,
+            max_value=100,
+            value=50,
+            help="Concentration of the surrounding medium as a percentage",
+        )
+        alloys = st.multiselect(
+            "🧬 Alloys to screen",
+            options=uns_nums,
+            help="Leave empty to screen every alloy",
+        )
+
+    comment = st.text_area(
+        "💬 Describe the Condition in details",
+        height=120,
+        placeholder="e.g. acidic environment with high humidity..",
+        help="Describe the environmental condition",
+    )
+
+    submitted = st.form_submit_button("🚀 Screen alloys")
+
+# ------------------------ Screening & Output ------------------------
+if submitted:
+    st.session_state.screening = {
+        "condition": f"{env}, {temp} °C, {conc} %",
+        "ranking": clf.screen_alloys(env, temp, conc, comment, alloys or uns_nums),
+    }
+
+if "screening" in st.session_state:
+    ranking = st.session_state.screening["ranking"]
+    st.markdown(f"## 🏆 Alloy Ranking — {st.session_state.screening['condition']}")
+    if ranking.empty:
+        st.warning("None of the selected alloys can be scored by the model.")
+    else:
+        st.success(
+            f"✅ Lowest predicted corrosion rate: **{ranking['Alloy UNS'][0]}** "
+            f"({ranking['Predicted Corrosion Rate'][0].strip()})"
+        )
+        counts = ranking["Predicted Corrosion Rate"].value_counts(sort=False)
+        st.bar_chart(counts)
+        st.dataframe(
+            ranking,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Confidence": st.column_config.ProgressColumn(
+                    "Confidence", min_value=0.0, max_value=1.0, format="%.2f"
+                )
+            },
+        )
+        st.download_button(
+            label="💾 Download Ranking as CSV",
+            data=ranking.to_csv(index=False).encode("utf-8"),
+            file_name="alloy_screening.csv",
+            mime="text/csv",
+        )
+
+# ------------------------ Footer ------------------------
+st.markdown("<hr>", unsafe_allow_html=True)
+st.caption("💪 Built with Streamlit | 🧠 Machine Learning | 👨‍🔬 SciBERT + PCA Model")
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import time
+import streamlit as st
+from config.config import (
+    BATCH_CHUNK_ROWS,
+    BATCH_INPUT_COLUMNS,
+    BATCH_OUTPUT_FORMATS,
+    PAGE_ICON,
+)
+from utils.batch_scoring import CHUNK_WRITERS, score_csv
+from utils.predictor import CorrosionClassifier
+
+st.set_page_config(page_title="Batch Prediction", layout="wide", page_icon=PAGE_ICON)
+
+clf = CorrosionClassifier()
+
+# ------------------------ Sidebar ------------------------
+with st.sidebar:
+    st.markdown("## 📁 Batch Prediction")
+    st.markdown(
+        "Upload a CSV of conditions and download the predicted corrosion rate "
+        "for every row."
+    )
+    st.markdown("🔬 Powered by ML | 📊 PCA | 🧠 SciBERT")
+
+# ------------------------ Page Header ------------------------
+st.markdown(
+    "<h1 style='text-align: center;'>📁 Batch Corrosion Rate Prediction</h1>",
+    unsafe_allow_html=True,
+)
+st.markdown(
+    "<p style='text-align: center; font-size: 18px;'>The file is scored "
+    f"{BATCH_CHUNK_ROWS:,} rows at a time, so it can be as long as you need.</p>",
+    unsafe_allow_html=True,
+)
+st.caption(
+    "Expected columns: "
+    + ", ".join(f"`{col}`" for col in BATCH_INPUT_COLUMNS)
+    + " (`Comment` is optional; other columns are kept as-is)."
+)
+
+# ------------------------ Upload ------------------------
+with st.form("batch_form"):
+    uploaded = st.file_uploader("📄 Conditions CSV", type="csv")
+    output_format = st.radio(
+        "💾 Output format", BATCH_OUTPUT_FORMATS, format_func=str.upper, horizontal=True
+    )
+    submitted = st.form_submit_button("🚀 Predict")
+
+# ------------------------ Scoring ------------------------
+if submitted and uploaded is None:
+    st.warning("Upload a CSV file first.")
+elif submitted:
+    previous = st.session_state.pop("batch", None)
+    if previous is not None and os.path.exists(previous["path"]):
+        os.remove(previous["path"])
+
+    # Outputs live in a directory owned by the session: it is deleted when
+    # the session's state is garbage collected, or at the latest on exit.
+    if "batch_dir" not in st.session_state:
+        st.session_state.batch_dir = tempfile.TemporaryDirectory(prefix="batch_")
+    fd, path = tempfile.mkstemp(
+        suffix=f".{output_format}", dir=st.session_state.batch_dir.name
+    )
+    os.close(fd)
+    progress = st.progress(0.0, text="Scoring…")
+    start = time.perf_counter()
+    rows_done = 0
+    scored = False
+    try:
+        with CHUNK_WRITERS[output_format](path) as writer:
+            for rows_done in score_csv(clf, uploaded, writer):
+                fraction = min(uploaded.tell() / max(uploaded.size, 1), 1.0)
+                progress.progress(fraction, text=f"Scored {rows_done:,} rows…")
+        scored = True
+    except ValueError as e:
+        progress.empty()
+        st.error(f"❌ {e}")
+    finally:
+        # Also on errors other than bad input, and on a rerun mid-loop.
+        if not scored:
+            os.remove(path)
+    if scored:
+        progress.progress(1.0, text=f"Scored {rows_done:,} rows.")
+        st.session_state.batch = {
+            "path": path,
+            "format": output_format,
+            "name": os.path.splitext(uploaded.name)[0],
+            "rows": rows_done,
+            "seconds": time.perf_counter() - start,
+        }
+
+# ------------------------ Download ------------------------
+if "batch" in st.session_state:
+    batch = st.session_state.batch
+    if batch["rows"] == 0:
+        st.warning("The uploaded file has no rows.")
+    else:
+        st.success(
+            f"✅ Scored {batch['rows']:,} rows in {batch['seconds']:.1f} s. "
+            "Rows that could not be scored explain why in the `Error` column."
+        )
+        with open(batch["path"], "rb") as f:
+            st.download_button(
+                label=f"💾 Download Predictions as {batch['format'].upper()}",
+                data=f,
+                file_name=f"{batch['name']}_predictions.{batch['format']}",
+                mime=(
+                    "text/csv"
+                    if batch["format"] == "csv"
+                    else "application/vnd.apache.parquet"
+                ),
+            )
+
+# ------------------------ Footer ------------------------
+st.markdown("<hr>", unsafe_allow_html=True)
+st.caption("💪 Built with Streamlit | 🧠 Machine Learning | 👨‍🔬 SciBERT + PCA Model")
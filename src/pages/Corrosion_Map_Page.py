@@ -0,0 +1,112 @@
+import altair as alt
+import streamlit as st
+from config.config import PAGE_ICON
+from utils.corrosion_map import get_corrosion_map
+
+st.set_page_config(page_title="Corrosion Map", layout="wide", page_icon=PAGE_ICON)
+
+# ------------------------ Sidebar ------------------------
+with st.sidebar:
+    st.markdown("## 🗺️ Corrosion Map")
+    st.markdown(
+        "Predicted corrosion rate for every environment and alloy, read straight "
+        "from the precomputed map."
+    )
+    st.markdown("📊 Precomputed | ⚡ Instant lookups")
+
+# ------------------------ Page Header ------------------------
+st.markdown(
+    "<h1 style='text-align: center;'>🗺️ Environment × Alloy Corrosion Map</h1>",
+    unsafe_allow_html=True,
+)
+
+corrosion_map = get_corrosion_map()
+if corrosion_map is None:
+    st.info(
+        "No corrosion map has been built yet. Run `make corrosion-map` to "
+        "precompute it."
+    )
+    st.stop()
+
+st.markdown(
+    "<p style='text-align: center; font-size: 18px;'>Pick a temperature and "
+    "concentration to see the predicted class of every environment and alloy.</p>",
+    unsafe_allow_html=True,
+)
+st.caption(
+    f"Computed for the condition description “{corrosion_map.comment or '(empty)'}” "
+    f"on {corrosion_map.cells.size:,} grid points."
+)
+
+# ------------------------ Controls ------------------------
+col1, col2 = st.columns(2)
+with col1:
+    temp = st.select_slider(
+        "🌡️ Temperature (°C)",
+        options=corrosion_map.temperatures,
+        value=min(corrosion_map.temperatures, key=lambda t: abs(t - 25)),
+    )
+with col2:
+    conc = st.select_slider(
+        "🧪 Concentration (%)",
+        options=corrosion_map.concentrations,
+        value=min(corrosion_map.concentrations, key=lambda c: abs(c - 50)),
+    )
+
+col1, col2 = st.columns(2)
+with col1:
+    environments = st.multiselect(
+        "🌍 Environments",
+        options=corrosion_map.environments,
+        default=corrosion_map.environments[:25],
+    )
+with col2:
+    alloys = st.multiselect(
+        "🧬 Alloys (UNS)",
+        options=corrosion_map.alloys,
+        default=corrosion_map.alloys[:40],
+    )
+
+if not environments or not alloys:
+    st.warning("Select at least one environment and one alloy.")
+    st.stop()
+
+# ------------------------ Heatmap ------------------------
+grid = corrosion_map.slice(temp, conc).loc[environments, alloys]
+cells = grid.stack().rename("Corrosion Rate").rename_axis(["Environment", "UNS"])
+cells = cells.reset_index()
+
+class_order = corrosion_map.class_names + ["No prediction"]
+heatmap = (
+    alt.Chart(cells)
+    .mark_rect()
+    .encode(
+        x=alt.X("UNS:N", sort=alloys, title="Alloy (UNS)"),
+        y=alt.Y("Environment:N", sort=environments),
+        color=alt.Color(
+            "Corrosion Rate:N",
+            sort=class_order,
+            scale=alt.Scale(domain=class_order, scheme="redyellowgreen", reverse=True),
+        ),
+        tooltip=["Environment", "UNS", "Corrosion Rate"],
+    )
+    .properties(height=max(300, 18 * len(environments)))
+)
+st.altair_chart(heatmap, use_container_width=True)
+
+# ------------------------ Summary & Download ------------------------
+st.markdown("### 📊 Class distribution")
+counts = cells["Corrosion Rate"].value_counts().reindex(class_order, fill_value=0)
+st.dataframe(counts[counts > 0].rename("Cells"), use_container_width=True)
+
+csv_bytes = grid.to_csv().encode("utf-8")
+st.download_button(
+    label="💾 Download this map slice as CSV",
+    data=csv_bytes,
+    file_name=f"corrosion_map_{temp:g}C_{conc:g}pct.csv",
+    mime="text/csv",
+)
+
+# ------------------------ Footer ------------------------
+st.markdown("<hr>", unsafe_allow_html=True)
+st.caption("💪 Built with Streamlit | 🧠 Machine Learning | 👨‍🔬 SciBERT + PCA Model")
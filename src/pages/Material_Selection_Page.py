@@ -1,8 +1,8 @@
 import streamlit as st
-from chat.chat import invoke_llm
+from chat.chat import get_material_prompt, get_material_prompt_key, stream_llm
 from utils.vars import environment
 from config.config import PIPE_ICON
-from utils.processors import remove_think_tags
+from utils.processors import strip_think_tags
 
 st.set_page_config(
     page_title="Material Selector (LLM)", layout="wide", page_icon=PIPE_ICON
@@ -66,40 +66,29 @@ with st.form("llm_material_selector"):
 
 # ------------------------ LLM Output ------------------------
 if submitted:
-    user_prompt = f"""
-You are a corrosion engineering assistant helping select optimal materials for corrosion resistance in industrial settings.
+    fields = {
+        "env": env,
+        "pH": pH,
+        "chloride": chloride,
+        "temperature": temperature,
+        "pressure": pressure,
+        "flow": flow,
+        "contact": contact,
+        "design_life": design_life,
+        "maintenance": maintenance,
+        "budget": budget,
+        "custom_notes": custom_notes,
+    }
+    user_prompt = get_material_prompt(fields)
 
-Based on the following operating and environmental conditions, recommend the **top 2–3 materials**:
-
-- 🌍 Environment: {env}
-- 🧪 pH Level: {pH}
-- 🧂 Chloride Presence: {chloride}
-- 🌡️ Temperature: {temperature}°C
-- ⚙️ Pressure: {pressure} bar
-- 💨 Flow Condition: {flow}
-- 🔗 Galvanic Contact: {contact}
-- 📆 Required Design Life: {design_life} years
-- 🛠️ Maintenance Requirements: {maintenance}
-- 💰 Budget Constraints: {budget}
-- 📝 Additional Notes: {custom_notes}
-
-Please provide your output in the following format:
-
-1. **Material Name (UNS Code)**  
-   - ✅ *Why it is suitable* (highlight corrosion resistance, mechanical properties, compatibility, etc.)  
-   - ⚠️ *Limitations* or special handling considerations  
-   - Suggestions: Suggested surface treatments or enhancements (if needed)  
-
-Conclude with:
-- 🎯 A final recommendation if one material clearly stands out for the given case.
-- 🧠 Reminders or caveats (e.g., importance of site-specific testing, monitoring methods, etc.)
-
-Use a **professional and concise tone**. Structure your response clearly with bullet points or short paragraphs to enhance readability for engineers in the field.
-"""
-
-    response = remove_think_tags(invoke_llm(user_prompt))
     st.markdown("## 🧪 Suggested Materials")
-    st.success(response)
+    # Show the answer as it is generated, then settle it into the result box.
+    placeholder = st.empty()
+    with placeholder.container():
+        response = st.write_stream(
+            strip_think_tags(stream_llm(user_prompt, get_material_prompt_key(fields)))
+        )
+    placeholder.success(response)
 
     # Combine inputs with LLM response for download
     txt_content = "Material Selection Report\n\n"
@@ -0,0 +1,159 @@
+import altair as alt
+import numpy as np
+import streamlit as st
+from config.config import PAGE_ICON
+from utils.predictor import CorrosionClassifier
+from utils.sweeps import find_crossings
+from utils.vars import environment, uns_nums
+
+st.set_page_config(page_title="Sensitivity Sweep", layout="wide", page_icon=PAGE_ICON)
+
+clf = CorrosionClassifier()
+
+# ------------------------ Sidebar ------------------------
+with st.sidebar:
+    st.markdown("## 📈 Sensitivity Sweep")
+    st.markdown(
+        "See where an alloy moves from one corrosion class to the next as "
+        "temperature or concentration changes."
+    )
+    st.markdown("🔬 Powered by ML | 📊 PCA | 🧠 SciBERT")
+
+# ------------------------ Page Header ------------------------
+st.markdown(
+    "<h1 style='text-align: center;'>📈 Temperature & Concentration Sweep</h1>",
+    unsafe_allow_html=True,
+)
+st.markdown(
+    "<p style='text-align: center; font-size: 18px;'>Sweep the service conditions "
+    "of one alloy to find its corrosion class boundaries.</p>",
+    unsafe_allow_html=True,
+)
+
+# ------------------------ Input Form ------------------------
+with st.form("sweep_form"):
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        env = st.selectbox("🌍 Environment", options=environment)
+        uns_input = st.selectbox("🧬 Alloy UNS", options=uns_nums)
+        mode = st.radio(
+            "📐 Sweep",
+            ["Temperature", "Concentration", "Temperature × Concentration"],
+        )
+
+    with col2:
+        temp_range = st.slider("🌡️ Temperature range (°C)", -50, 400, (0, 200))
+        temp_step = st.number_input("Temperature step (°C)", 0.5, 50.0, 1.0)
+        fixed_temp = st.number_input(
+            "Fixed temperature (°C)", step=1, value=25, help="Used when not swept"
+        )
+
+    with col3:
+        conc_range = st.slider("🧪 Concentration range (%)", 0, 100, (0, 100))
+        conc_step = st.number_input("Concentration step (%)", 0.5, 25.0, 1.0)
+        fixed_conc = st.number_input(
+            "Fixed concentration (%)", 0, 100, 50, help="Used when not swept"
+        )
+
+    comment = st.text_area(
+        "💬 Describe the Condition in details",
+        height=100,
+        placeholder="e.g. acidic environment with high humidity..",
+    )
+
+    submitted = st.form_submit_button("🚀 Run sweep")
+
+
+def axis_values(value_range, step):
+    return np.arange(value_range[0], value_range[1] + step / 2, step)
+
+
+# ------------------------ Sweep & Output ------------------------
+if submitted:
+    temperatures = (
+        [fixed_temp] if mode == "Concentration" else axis_values(temp_range, temp_step)
+    )
+    concentrations = (
+        [fixed_conc] if mode == "Temperature" else axis_values(conc_range, conc_step)
+    )
+    try:
+        st.session_state.sweep = {
+            "mode": mode,
+            "title": f"{uns_input} in {env}",
+            "result": clf.sweep(env, uns_input, comment, temperatures, concentrations),
+        }
+    except ValueError as e:
+        st.error(f"❌ {e}")
+
+if "sweep" in st.session_state:
+    mode = st.session_state.sweep["mode"]
+    result = st.session_state.sweep["result"]
+    classes = (
+        result.drop_duplicates("Class")
+        .sort_values("Class")["Predicted Corrosion Rate"]
+        .tolist()
+    )
+    st.markdown(f"## 🧭 Class Boundaries — {st.session_state.sweep['title']}")
+
+    if mode == "Temperature × Concentration":
+        chart = (
+            alt.Chart(result)
+            .mark_rect()
+            .encode(
+                x=alt.X("Temperature (°C):O", axis=alt.Axis(labelOverlap=True)),
+                y=alt.Y(
+                    "Concentration (%):O",
+                    sort="descending",
+                    axis=alt.Axis(labelOverlap=True),
+                ),
+                color=alt.Color(
+                    "Predicted Corrosion Rate:N",
+                    sort=classes,
+                    scale=alt.Scale(scheme="redyellowgreen", reverse=True),
+                ),
+                tooltip=list(result.columns),
+            )
+        )
+        along = "Temperature (°C)"
+    else:
+        along = f"{mode} (°C)" if mode == "Temperature" else f"{mode} (%)"
+        chart = (
+            alt.Chart(result)
+            .mark_line(interpolate="step-after", point=True)
+            .encode(
+                x=alt.X(f"{along}:Q"),
+                y=alt.Y(
+                    "Predicted Corrosion Rate:N",
+                    sort=list(reversed(classes)),
+                    title="Predicted class",
+                ),
+                tooltip=list(result.columns),
+            )
+        )
+
+    crossings = find_crossings(result, along=along)
+    if not crossings.empty and mode != "Temperature × Concentration":
+        chart += (
+            alt.Chart(crossings)
+            .mark_rule(strokeDash=[4, 4], color="gray")
+            .encode(x="Crossing at:Q", tooltip=list(crossings.columns))
+        )
+    st.altair_chart(chart.properties(height=420), use_container_width=True)
+
+    st.markdown(f"### 🎯 Threshold crossings along {along.split(' (')[0].lower()}")
+    if crossings.empty:
+        st.info("The predicted class does not change over the swept range.")
+    else:
+        st.dataframe(crossings, use_container_width=True, hide_index=True)
+
+    st.download_button(
+        label="💾 Download Sweep as CSV",
+        data=result.to_csv(index=False).encode("utf-8"),
+        file_name="corrosion_sweep.csv",
+        mime="text/csv",
+    )
+
+# ------------------------ Footer ------------------------
+st.markdown("<hr>", unsafe_allow_html=True)
+st.caption("💪 Built with Streamlit | 🧠 Machine Learning | 👨‍🔬 SciBERT + PCA Model")
@@ -0,0 +1,86 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from config.config import SERVICE_MAX_BATCH_SIZE, SERVICE_MAX_WAIT_MS
+
+
+class MicroBatcher:
+    """Group concurrent single-row predictions into one ``predict_batch`` call.
+
+    The worker thread takes the first queued record, then keeps collecting
+    until ``max_batch_size`` records are queued or ``max_wait_ms`` has passed
+    since that first record, and scores the whole group at once. If the
+    group fails, its records are retried one at a time, so an error reaches
+    only the request that caused it.
+    """
+
+    def __init__(
+        self,
+        predict_batch,
+        max_batch_size=SERVICE_MAX_BATCH_SIZE,
+        max_wait_ms=SERVICE_MAX_WAIT_MS,
+    ):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.records = 0
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run, name="micro-batcher", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, record):
+        """Queue one record and return a Future for its predicted class."""
+        future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "records": self.records,
+            "mean_batch_size": self.records / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                predictions, _ = self.predict_batch([record for record, _ in batch])
+            except Exception:
+                # One bad record must not fail its neighbours: score them
+                # one by one so only the offending request sees the error.
+                self._predict_each(batch)
+                continue
+            self.batches += 1
+            self.records += len(batch)
+            for (_, future), prediction in zip(batch, predictions):
+                future.set_result(prediction)
+
+    def _predict_each(self, batch):
+        for record, future in batch:
+            try:
+                predictions, _ = self.predict_batch([record])
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            self.batches += 1
+            self.records += 1
+            future.set_result(predictions[0])
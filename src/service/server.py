@@ -0,0 +1,162 @@
+"""Headless HTTP inference service for the corrosion classifier.
+
+Endpoints:
+
+    GET  /health          liveness, served model version and batching counters
+    POST /predict         one record -> {"prediction": ...}
+    POST /predict_batch   {"records": [...]} -> {"predictions": [...]}
+    POST /screen_alloys   one condition (no UNS) -> {"ranking": [...]} over
+                          every alloy, or over "Alloys" when given
+
+Single-record requests arriving together are grouped by a MicroBatcher into
+one ``predict_batch`` call. Records use the batch input schema
+(Environment, Temperature, Concentration, UNS, Comment).
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m service.server --port 8000
+"""
+
+import argparse
+import json
+import math
+import numbers
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config.config import (
+    BATCH_INPUT_COLUMNS,
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_REQUEST_TIMEOUT_S,
+)
+from service.batcher import MicroBatcher
+from utils.predictor import CorrosionClassifier
+from utils.processors import warm_up_scibert
+from utils.vars import uns_nums
+
+
+def validate_record(record, columns=BATCH_INPUT_COLUMNS):
+    """Check one request record so a bad row cannot fail a shared batch."""
+    if not isinstance(record, dict):
+        raise ValueError("Each record must be a JSON object")
+    record = {"Comment": "", **record}
+    missing = [col for col in columns if col not in record]
+    if missing:
+        raise ValueError(f"Record is missing fields: {missing}")
+    for col in ("Temperature", "Concentration"):
+        value = record[col]
+        if isinstance(value, bool) or not isinstance(value, numbers.Number):
+            raise ValueError(f"{col} must be a number")
+        if not math.isfinite(value):
+            raise ValueError(f"{col} must be finite")
+    if not isinstance(record["Comment"] or "", str):
+        raise ValueError("Comment must be a string")
+    return {col: record[col] for col in columns}
+
+
+def validate_screening(payload):
+    """Check an alloy screening request: one condition and optional alloys."""
+    condition = validate_record(
+        payload, [col for col in BATCH_INPUT_COLUMNS if col != "UNS"]
+    )
+    alloys = payload.get("Alloys", uns_nums)
+    if not isinstance(alloys, list) or not all(isinstance(a, str) for a in alloys):
+        raise ValueError("Alloys must be a list of UNS codes")
+    return condition, alloys
+
+
+class InferenceHandler(BaseHTTPRequestHandler):
+    classifier = None
+    batcher = None
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send(404, {"error": "Not found"})
+        watcher = self.classifier.registry_watcher
+        self._send(
+            200,
+            {
+                "status": "ok",
+                "model": watcher.stats() if watcher else {"version": None},
+                "batching": self.batcher.stats(),
+            },
+        )
+
+    def do_POST(self):
+        try:
+            payload = self._read_json()
+            if self.path == "/predict":
+                future = self.batcher.submit(validate_record(payload))
+                prediction = future.result(timeout=SERVICE_REQUEST_TIMEOUT_S)
+                return self._send(200, {"prediction": prediction})
+            if self.path == "/predict_batch":
+                records = [validate_record(r) for r in payload.get("records", [])]
+                predictions, _ = self.classifier.predict_batch(records)
+                return self._send(200, {"predictions": predictions})
+            if self.path == "/screen_alloys":
+                condition, alloys = validate_screening(payload)
+                ranking = self.classifier.screen_alloys(
+                    condition["Environment"],
+                    condition["Temperature"],
+                    condition["Concentration"],
+                    condition["Comment"],
+                    alloys=alloys,
+                )
+                return self._send(200, {"ranking": ranking.to_dict("records")})
+            self._send(404, {"error": "Not found"})
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": f"Prediction failed: {e}"})
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON body: {e}") from e
+        if not isinstance(payload, dict):
+            raise ValueError("Request body must be a JSON object")
+        return payload
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class InferenceServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # concurrent clients queue instead of being reset
+
+
+def build_server(host=SERVICE_HOST, port=SERVICE_PORT, **batcher_options):
+    classifier = CorrosionClassifier()
+    InferenceHandler.classifier = classifier
+    InferenceHandler.batcher = MicroBatcher(classifier.predict_batch, **batcher_options)
+    return InferenceServer((host, port), InferenceHandler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--max-batch-size", type=int)
+    parser.add_argument("--max-wait-ms", type=float)
+    args = parser.parse_args()
+
+    batcher_options = {}
+    if args.max_batch_size:
+        batcher_options["max_batch_size"] = args.max_batch_size
+    if args.max_wait_ms is not None:
+        batcher_options["max_wait_ms"] = args.max_wait_ms
+    server = build_server(args.host, args.port, **batcher_options)
+    warm_up_scibert(background=False)
+    print(f"Serving corrosion predictions on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Report per-process memory of the classifier artifacts, private vs mapped.
+
+Starts ``--workers`` processes side by side for each loading mode
+(``ARTIFACT_MMAP=0`` unpickles private copies, ``ARTIFACT_MMAP=1`` maps the
+exports from ``tools.export_mmap_artifacts``). Each worker reports its RSS
+before and after loading and scoring, plus its proportional (PSS) and
+private memory while all workers of the mode are alive.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tools.artifact_memory [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from config.config import BASE_PATH
+
+_WORKER = r"""
+import json, sys
+import numpy as np
+
+
+def memory():
+    with open("/proc/self/smaps_rollup") as smaps:
+        fields = dict(line.split(":", 1) for line in smaps if ":" in line)
+    mb = lambda key: int(fields[key].split()[0]) / 1024
+    return {
+        "rss_mb": mb("Rss"),
+        "pss_mb": mb("Pss"),
+        "private_mb": mb("Private_Clean") + mb("Private_Dirty"),
+    }
+
+
+from utils.pipeline import FEATURE_COLUMNS
+from utils.predictor import CorrosionClassifier
+import pandas as pd
+
+before = memory()["rss_mb"]
+clf = CorrosionClassifier()
+X = np.random.default_rng(0).normal(size=(512, len(FEATURE_COLUMNS)))
+clf.classify(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+print(json.dumps({"rss_before_mb": before, "model": type(clf.models["model"]).__name__}), flush=True)
+sys.stdin.readline()  # wait until every worker has loaded
+print(json.dumps(memory()), flush=True)
+"""
+
+
+def run_workers(n_workers, mmap):
+    """Start the workers of one mode together and collect their reports."""
+    env = dict(os.environ, ARTIFACT_MMAP="1" if mmap else "0", SCIBERT_WARMUP="0")
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [BASE_PATH, env.get("PYTHONPATH")])
+    )
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", _WORKER],
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(n_workers)
+    ]
+    loaded = [json.loads(worker.stdout.readline()) for worker in workers]
+    reports = []
+    for worker, report in zip(workers, loaded):
+        worker.stdin.write("\n")
+        worker.stdin.flush()
+        report.update(json.loads(worker.stdout.readline()))
+        reports.append(report)
+    for worker in workers:
+        worker.stdin.close()
+        worker.wait()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        f"{'mode':<8} {'worker':>6} {'model':<22} {'RSS before':>11} "
+        f"{'RSS after':>10} {'PSS':>8} {'private':>8}"
+    )
+    for mmap in (False, True):
+        reports = run_workers(args.workers, mmap)
+        mode = "mmap" if mmap else "private"
+        for i, r in enumerate(reports):
+            print(
+                f"{mode:<8} {i:>6} {r['model']:<22} {r['rss_before_mb']:>11.1f} "
+                f"{r['rss_mb']:>10.1f} {r['pss_mb']:>8.1f} {r['private_mb']:>8.1f}"
+            )
+        total_pss = sum(r["pss_mb"] for r in reports)
+        print(f"{mode:<8} {'total':>6} {'':<22} {'':>11} {'':>10} {total_pss:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
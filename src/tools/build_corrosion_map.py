@@ -0,0 +1,102 @@
+"""Precompute the corrosion map: classes for every environment x alloy x grid point.
+
+Every ``environment`` x ``uns_nums`` pair from ``utils.vars`` is classified
+at each temperature and concentration of the grid, with one fixed comment
+embedding, and stored as uint8 class indices in a compressed ``.npz`` at
+``MODEL_PATHS["corrosion_map"]``. A random sample of cells is checked
+against ``CorrosionClassifier.predict_batch`` before writing.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tools.build_corrosion_map [--temperatures 25 50 100] [--concentrations 10 50]
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+from config.config import (
+    CORROSION_MAP_COMMENT,
+    CORROSION_MAP_CONCENTRATIONS,
+    CORROSION_MAP_TEMPERATURES,
+    MODEL_PATHS,
+)
+from utils.corrosion_map import NO_PREDICTION, CorrosionMap
+from utils.predictor import CorrosionClassifier
+from utils.vars import environment, uns_nums
+
+
+def verify_map(clf, corrosion_map, comment, n_samples, seed=0):
+    """Return the number of sampled cells that differ from ``predict_batch``."""
+    rng = np.random.default_rng(seed)
+    points = np.stack(
+        [rng.integers(0, n, size=n_samples) for n in corrosion_map.cells.shape], axis=1
+    )
+    points = points[corrosion_map.cells[tuple(points.T)] != NO_PREDICTION]
+    records = [
+        {
+            "Environment": corrosion_map.environments[e],
+            "UNS": corrosion_map.alloys[u],
+            "Temperature": corrosion_map.temperatures[t],
+            "Concentration": corrosion_map.concentrations[c],
+            "Comment": comment,
+        }
+        for e, u, t, c in points
+    ]
+    expected, _ = clf.predict_batch(records)
+    actual = [
+        corrosion_map.lookup(
+            r["Environment"], r["Temperature"], r["Concentration"], r["UNS"]
+        )
+        for r in records
+    ]
+    return sum(a != e for a, e in zip(actual, expected)), len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--temperatures", type=float, nargs="+", default=CORROSION_MAP_TEMPERATURES
+    )
+    parser.add_argument(
+        "--concentrations", type=float, nargs="+", default=CORROSION_MAP_CONCENTRATIONS
+    )
+    parser.add_argument("--comment", default=CORROSION_MAP_COMMENT)
+    parser.add_argument("--out", default=MODEL_PATHS["corrosion_map"])
+    parser.add_argument("--verify", type=int, default=500, help="Cells to re-check")
+    args = parser.parse_args()
+
+    clf = CorrosionClassifier()
+    start = time.perf_counter()
+    corrosion_map = CorrosionMap.build(
+        clf,
+        environment,
+        uns_nums,
+        args.temperatures,
+        args.concentrations,
+        args.comment,
+    )
+    seconds = time.perf_counter() - start
+    n_cells = corrosion_map.cells.size
+    print(
+        f"Classified {n_cells:,} cells {corrosion_map.cells.shape} in {seconds:.1f} s "
+        f"({n_cells / seconds:,.0f} cells/s)"
+    )
+
+    mismatches, checked = verify_map(clf, corrosion_map, args.comment, args.verify)
+    print(
+        f"Verified {checked} sampled cells against predict_batch: {mismatches} differ"
+    )
+    if mismatches:
+        raise SystemExit("Corrosion map disagrees with the classifier; not written")
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    corrosion_map.save(args.out)
+    print(
+        f"Wrote {args.out} ({os.path.getsize(args.out) / 1024:,.0f} KB, "
+        f"{n_cells / 1024:,.0f} KB uncompressed)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Precompile the Environment and UNS target encoders into lookup tables.
+
+Each table is verified against its pickled encoder for every fitted
+category, every option in ``utils.vars``, an unseen label and a missing
+value before ``MODEL_PATHS["encoding_tables"]`` is written.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tools.build_encoding_tables
+"""
+
+import argparse
+import joblib
+from config.config import MODEL_PATHS
+from utils.encoding_tables import EncodingTable, save_encoding_tables
+from utils.vars import environment, uns_nums
+
+
+def build_encoding_tables():
+    """Build and verify both tables; return them in save order."""
+    tables = []
+    for encoder_key, col, options in [
+        ("env_encoder", "Environment", environment),
+        ("uns_encoder", "UNS", uns_nums),
+    ]:
+        encoder = joblib.load(MODEL_PATHS[encoder_key])
+        table = EncodingTable.from_target_encoder(encoder, col)
+        checked = table.verify(encoder, extra_categories=options)
+        unseen_options = [o for o in options if o not in table.index_of]
+        print(
+            f"{col}: {len(table.categories)} categories, {checked} labels verified, "
+            f"{len(unseen_options)} UI options fall back to the prior"
+        )
+        tables.append(table)
+    return tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default=MODEL_PATHS["encoding_tables"])
+    args = parser.parse_args()
+    save_encoding_tables(build_encoding_tables(), args.out)
+    print(f"Wrote encoding tables to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Build the fused NumPy preprocessing artifact for CorrosionClassifier.
+
+The encoders, scaler and PCA are folded into one FusedPreprocessor saved at
+``MODEL_PATHS["pipeline"]``. Before saving, its output is compared with the
+pandas preprocessing on a reference set and must be bit-identical.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tools.build_fused_pipeline [--input reference.csv]
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+from config.config import MODEL_PATHS
+from tools.encoder_fidelity import reference_records
+from utils.pipeline import FusedPreprocessor
+from utils.predictor import CorrosionClassifier
+
+
+def verify_pipeline(clf, pipeline, records):
+    """Compare fused and pandas preprocessing; return (identical, timings).
+
+    The reference run uses the original encoder objects, not lookup tables.
+    """
+    encoding_tables = clf.encoding_tables
+    clf.pipeline = clf.encoding_tables = None
+    start = time.perf_counter()
+    expected = clf.preprocess_batch(records)
+    pandas_seconds = time.perf_counter() - start
+    clf.encoding_tables = encoding_tables
+
+    clf.pipeline = pipeline
+    start = time.perf_counter()
+    actual = clf.preprocess_batch(records)
+    fused_seconds = time.perf_counter() - start
+
+    identical = list(actual.columns) == list(expected.columns) and np.array_equal(
+        actual.to_numpy(dtype=np.float64), expected.to_numpy(dtype=np.float64)
+    )
+    return identical, pandas_seconds, fused_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", help="Reference CSV in the batch input schema")
+    parser.add_argument("--out", default=MODEL_PATHS["pipeline"])
+    args = parser.parse_args()
+
+    clf = CorrosionClassifier()
+    pipeline = FusedPreprocessor(clf.models)
+    records = reference_records(args.input)
+    clf.embed_comments(records["Comment"])  # keep embedding time out of the timings
+    identical, pandas_seconds, fused_seconds = verify_pipeline(clf, pipeline, records)
+    print(
+        f"{len(records)} rows: pandas {pandas_seconds * 1000:.1f} ms, "
+        f"fused {fused_seconds * 1000:.1f} ms, bit-identical: {identical}"
+    )
+    if not identical:
+        raise SystemExit("Fused pipeline output differs; artifact not written")
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    pipeline.save(args.out)
+    print(f"Wrote fused pipeline to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Export SciBERT into a versioned local bundle for offline loading.
+
+The tokenizer and weights are written as safetensors under
+``src/models/scibert/<version>/`` together with a ``manifest.json`` that
+records the source model, hub revision and file checksums. Point
+``SCIBERT_BUNDLE_VERSION`` at the version to load it with no network access.
+
+Run from the repository root on a machine with hub access:
+
+    PYTHONPATH=src python -m tools.bundle_scibert --version v1
+"""
+
+import argparse
+import json
+import os
+from config.config import MODEL_PATHS, SCIBERT_MODEL_NAME
+from utils.artifacts import file_sha256
+
+
+def bundle_scibert(source, version, out_root):
+    """Save tokenizer, config and safetensors weights into ``out_root/version``."""
+    from transformers import AutoTokenizer, AutoModel
+
+    out_dir = os.path.join(out_root, version)
+    if os.path.exists(out_dir):
+        raise FileExistsError(f"Bundle {out_dir} already exists; pick a new version")
+
+    tokenizer = AutoTokenizer.from_pretrained(source)
+    model = AutoModel.from_pretrained(source)
+    tokenizer.save_pretrained(out_dir)
+    model.save_pretrained(out_dir, safe_serialization=True)
+
+    manifest = {
+        "source": source,
+        "revision": getattr(model.config, "_commit_hash", None),
+        "version": version,
+        "files": {
+            name: file_sha256(os.path.join(out_dir, name))
+            for name in sorted(os.listdir(out_dir))
+        },
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return out_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=SCIBERT_MODEL_NAME)
+    parser.add_argument("--version", required=True)
+    parser.add_argument("--out", default=os.path.dirname(MODEL_PATHS["scibert"]))
+    args = parser.parse_args()
+    out_dir = bundle_scibert(args.source, args.version, args.out)
+    print(f"Wrote SciBERT bundle to {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
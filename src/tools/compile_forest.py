@@ -0,0 +1,110 @@
+"""Compile the random forest classifier into flat NumPy node arrays.
+
+The compiled FlatForest is checked for prediction equality against the
+sklearn model on a reference input set plus copies nudged onto split
+thresholds and copies with missing (NaN) features. Single-row p50/p99
+latency and batch throughput of both are reported, and the arrays are
+written to ``MODEL_PATHS["flat_forest"]``.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tools.compile_forest [--input reference.csv]
+"""
+
+import argparse
+import os
+import joblib
+import time
+import numpy as np
+import pandas as pd
+from config.config import MODEL_PATHS
+from tools.encoder_fidelity import reference_records
+from utils.flat_forest import FlatForest
+from utils.predictor import CorrosionClassifier
+
+
+def threshold_edge_rows(flat, X, seed=0):
+    """Copies of ``X`` with one feature per row set exactly to a split threshold."""
+    rng = np.random.default_rng(seed)
+    X = np.array(X, dtype=np.float64)
+    # Splits that only separate missing values have an infinite threshold.
+    splits = np.flatnonzero(
+        (flat.children[0::2] != np.arange(len(flat.feature)))
+        & np.isfinite(flat.threshold)
+    )
+    chosen = rng.choice(splits, size=len(X))
+    X[np.arange(len(X)), flat.feature[chosen]] = flat.threshold[chosen]
+    return X
+
+
+def missing_value_rows(X, fraction=0.3, seed=0):
+    """Copies of ``X`` with a random ``fraction`` of the features set to NaN."""
+    rng = np.random.default_rng(seed)
+    X = np.array(X, dtype=np.float64)
+    X[rng.random(X.shape) < fraction] = np.nan
+    return X
+
+
+def equality_check_rows(flat, X):
+    """``X`` plus its copies nudged onto split thresholds and with NaN features."""
+    X = np.asarray(X, dtype=np.float64)
+    return np.vstack([X, threshold_edge_rows(flat, X), missing_value_rows(X)])
+
+
+def latency_percentiles(predict, rows, repeats=1):
+    """p50/p99 milliseconds of ``predict`` on one row at a time."""
+    timings = []
+    for _ in range(repeats):
+        for row in rows:
+            start = time.perf_counter()
+            predict(row)
+            timings.append(time.perf_counter() - start)
+    return np.percentile(timings, [50, 99]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", help="Reference CSV in the batch input schema")
+    parser.add_argument("--out", default=MODEL_PATHS["flat_forest"])
+    parser.add_argument("--latency-rows", type=int, default=200)
+    args = parser.parse_args()
+
+    clf = CorrosionClassifier()
+    forest = joblib.load(MODEL_PATHS["full_model"])
+    flat = FlatForest.from_sklearn(forest)
+    print(
+        f"Compiled {flat.n_trees} trees, {len(flat.feature)} nodes, depth {flat.depth}"
+    )
+
+    full_input = clf.preprocess_batch(reference_records(args.input))
+    X = equality_check_rows(flat, full_input)
+    expected = forest.predict(pd.DataFrame(X, columns=full_input.columns))
+    mismatches = int(np.sum(flat.predict(X) != expected))
+    print(f"Prediction equality on {len(X)} rows: {mismatches} mismatches")
+    if mismatches:
+        raise SystemExit("Compiled forest disagrees with sklearn; artifact not written")
+
+    sample = full_input.sample(min(args.latency_rows, len(full_input)), random_state=0)
+    frames = [sample.iloc[[i]] for i in range(len(sample))]
+    arrays = [frame.to_numpy() for frame in frames]
+    sk_p50, sk_p99 = latency_percentiles(forest.predict, frames)
+    flat_p50, flat_p99 = latency_percentiles(flat.predict, arrays)
+    print(f"Single row  sklearn p50 {sk_p50:.3f} ms  p99 {sk_p99:.3f} ms")
+    print(f"Single row  flat    p50 {flat_p50:.3f} ms  p99 {flat_p99:.3f} ms")
+
+    for name, predict, X in [
+        ("sklearn", forest.predict, full_input),
+        ("flat", flat.predict, full_input.to_numpy()),
+    ]:
+        start = time.perf_counter()
+        predict(X)
+        rate = len(full_input) / (time.perf_counter() - start)
+        print(f"Batch {len(full_input)} rows  {name:<7} {rate:,.0f} rows/s")
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    flat.save(args.out)
+    print(f"Wrote compiled forest to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Build compressed variants of the random forest classifier.
+
+Trees are ranked by greedy forward selection: each step adds the tree that
+most increases agreement with the full forest's predictions on the
+reference set. Every (tree count, depth limit) combination is compiled into
+a compact FlatForest with float32 thresholds and written to
+``FOREST_VARIANTS_DIR/<name>.npz`` with a ``<name>.json`` report of
+agreement, artifact size, load time and predict latency. Select one with
+``CLASSIFIER_VARIANT=<name>``.
+
+Trees are selected on the even reference rows; agreement is reported on
+those and on the held-out odd rows.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tools.compress_forest [--trees 10 25 50] [--depths full 12 8]
+"""
+
+import argparse
+import json
+import os
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from config.config import FOREST_VARIANTS_DIR, MODEL_PATHS
+from tools.compile_forest import latency_percentiles
+from tools.encoder_fidelity import reference_records
+from utils.flat_forest import FlatForest
+from utils.predictor import CorrosionClassifier
+
+
+def greedy_tree_order(tree_probas, target, n_trees):
+    """Indices of ``n_trees`` trees chosen greedily for agreement with ``target``.
+
+    ``tree_probas`` has shape ``(n_rows, n_trees_total, n_classes)`` and
+    ``target`` holds the class index the full forest predicts for each row.
+    """
+    total = np.zeros((tree_probas.shape[0], tree_probas.shape[2]))
+    remaining = list(range(tree_probas.shape[1]))
+    order = []
+    for _ in range(min(n_trees, len(remaining))):
+        candidates = total[:, np.newaxis, :] + tree_probas[:, remaining, :]
+        agreement = (candidates.argmax(axis=2) == target[:, np.newaxis]).mean(axis=0)
+        best = remaining.pop(int(np.argmax(agreement)))
+        order.append(best)
+        total += tree_probas[:, best, :]
+    return order
+
+
+def variant_name(n_trees, max_depth):
+    return f"t{n_trees}" if max_depth is None else f"t{n_trees}_d{max_depth}"
+
+
+def measure(predict, load, X, expected, latency_rows):
+    """Load time, agreement per split and latency of one classifier."""
+    start = time.perf_counter()
+    load()
+    load_ms = (time.perf_counter() - start) * 1000
+
+    agreement = {
+        split: float(np.mean(predict(X[split]) == expected[split]))
+        for split in ("selection", "holdout")
+    }
+    rows = X["holdout"][:latency_rows]
+    p50, p99 = latency_percentiles(predict, [rows[i : i + 1] for i in range(len(rows))])
+    start = time.perf_counter()
+    predict(X["holdout"])
+    rate = len(X["holdout"]) / (time.perf_counter() - start)
+    return {
+        "load_ms": round(load_ms, 3),
+        "agreement_selection": agreement["selection"],
+        "agreement_holdout": agreement["holdout"],
+        "p50_ms": round(float(p50), 4),
+        "p99_ms": round(float(p99), 4),
+        "batch_rows_per_s": round(rate),
+    }
+
+
+def parse_depth(value):
+    return None if value == "full" else int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", help="Reference CSV in the batch input schema")
+    parser.add_argument("--source", default=MODEL_PATHS["full_model"])
+    parser.add_argument("--out-dir", default=FOREST_VARIANTS_DIR)
+    parser.add_argument("--trees", type=int, nargs="+", default=[10, 25, 50])
+    parser.add_argument("--depths", type=parse_depth, nargs="+", default=[None, 12, 8])
+    parser.add_argument("--latency-rows", type=int, default=200)
+    args = parser.parse_args()
+
+    forest = joblib.load(args.source)
+    full_input = CorrosionClassifier().preprocess_batch(reference_records(args.input))
+    X_all = full_input.to_numpy(dtype=np.float64)
+    X = {"selection": X_all[0::2], "holdout": X_all[1::2]}
+
+    def predict_full(rows):
+        return forest.predict(pd.DataFrame(rows, columns=full_input.columns))
+
+    expected = {split: predict_full(rows) for split, rows in X.items()}
+
+    flat = FlatForest.from_sklearn(forest)
+    tree_probas = flat.value[flat.apply(X["selection"])]
+    target = np.searchsorted(flat.classes, expected["selection"])
+    order = greedy_tree_order(tree_probas, target, max(args.trees))
+
+    reports = [
+        {
+            "variant": "full",
+            "trees": flat.n_trees,
+            "max_depth": None,
+            "size_bytes": os.path.getsize(args.source),
+            **measure(
+                predict_full,
+                lambda: joblib.load(args.source),
+                X,
+                expected,
+                args.latency_rows,
+            ),
+        }
+    ]
+    os.makedirs(args.out_dir, exist_ok=True)
+    for n_trees in sorted(set(min(n, flat.n_trees) for n in args.trees)):
+        for max_depth in args.depths:
+            name = variant_name(n_trees, max_depth)
+            path = os.path.join(args.out_dir, f"{name}.npz")
+            variant = FlatForest.from_sklearn(
+                forest, trees=order[:n_trees], max_depth=max_depth
+            ).compact()
+            variant.save(path)
+            report = {
+                "variant": name,
+                "trees": n_trees,
+                "max_depth": max_depth,
+                "size_bytes": os.path.getsize(path),
+                **measure(
+                    variant.predict,
+                    lambda: FlatForest.load(path),
+                    X,
+                    expected,
+                    args.latency_rows,
+                ),
+                "source": args.source,
+                "tree_indices": [int(i) for i in order[:n_trees]],
+            }
+            with open(os.path.join(args.out_dir, f"{name}.json"), "w") as f:
+                json.dump(report, f, indent=2)
+            reports.append(report)
+
+    print(
+        f"{'variant':<10} {'trees':>5} {'depth':>5} {'size KB':>9} {'load ms':>8} "
+        f"{'agree sel':>9} {'agree hold':>10} {'p50 ms':>7} {'p99 ms':>7} {'rows/s':>9}"
+    )
+    for r in reports:
+        print(
+            f"{r['variant']:<10} {r['trees']:>5} {str(r['max_depth'] or '-'):>5} "
+            f"{r['size_bytes'] / 1024:>9.1f} {r['load_ms']:>8.2f} "
+            f"{r['agreement_selection']:>9.4f} {r['agreement_holdout']:>10.4f} "
+            f"{r['p50_ms']:>7.3f} {r['p99_ms']:>7.3f} {r['batch_rows_per_s']:>9,}"
+        )
+    print(f"Wrote {len(reports) - 1} variants to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
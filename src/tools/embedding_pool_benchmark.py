@@ -0,0 +1,87 @@
+"""Benchmark SciBERT embedding throughput against the number of pool workers.
+
+The same set of distinct synthetic condition descriptions is embedded once in
+this process (the single-process baseline) and then with an ``EmbeddingPool``
+of each worker count. Worker startup (spawning and loading the encoder) is
+reported separately and excluded from the throughput. Every run is checked
+against the baseline vectors.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tools.embedding_pool_benchmark [--texts 4000] [--workers 1 2 4 8]
+"""
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from tools.encoder_fidelity import REFERENCE_COMMENTS
+from utils.embedding_pool import EmbeddingPool
+from utils.processors import clean_condition_text, get_scibert_embeddings
+from utils.runtime import available_cores, thread_candidates
+
+
+def synthetic_texts(n_texts, seed=0):
+    """Distinct descriptions of varied length built from the reference phrases."""
+    rng = np.random.default_rng(seed)
+    phrases = [comment for comment in REFERENCE_COMMENTS if comment]
+    texts = []
+    for i in range(n_texts):
+        picked = rng.choice(phrases, size=rng.integers(1, 6))
+        texts.append(clean_condition_text(f"{', '.join(picked)} batch {i}"))
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=4000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=thread_candidates(available_cores())
+    )
+    parser.add_argument("--chunk-size", type=int)
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.texts)
+    get_scibert_embeddings(texts[:8])  # load the encoder outside the timing
+    start = time.perf_counter()
+    baseline = get_scibert_embeddings(texts)
+    baseline_rate = len(texts) / (time.perf_counter() - start)
+
+    rows = [
+        {
+            "workers": "in-process",
+            "startup (s)": 0.0,
+            "rows/s": baseline_rate,
+            "speedup": 1.0,
+            "max |diff|": 0.0,
+        }
+    ]
+    for workers in args.workers:
+        options = {"chunk_size": args.chunk_size} if args.chunk_size else {}
+        start = time.perf_counter()
+        with EmbeddingPool(workers, **options) as pool:
+            pool.warm_up()
+            startup = time.perf_counter() - start
+            start = time.perf_counter()
+            embeddings = pool.embed(texts)
+            rate = len(texts) / (time.perf_counter() - start)
+        rows.append(
+            {
+                "workers": workers,
+                "startup (s)": startup,
+                "rows/s": rate,
+                "speedup": rate / baseline_rate,
+                "max |diff|": float(np.abs(embeddings - baseline).max()),
+            }
+        )
+        print(
+            f"{workers} workers: {rate:,.0f} rows/s ({startup:.1f} s startup)",
+            flush=True,
+        )
+
+    print(f"\n{len(texts):,} texts on {available_cores()} cores")
+    print(pd.DataFrame(rows).to_string(index=False, float_format="{:,.3g}".format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Compare SciBERT encoder backends against the fp32 baseline.
+
+Every backend embeds the same reference set; its vectors go through the
+fitted PCA and the classifier, and the report shows how far the 15 PCA
+outputs drift, how many predicted classes still agree with fp32, and the
+embedding latency. Run it before switching ``SCIBERT_BACKEND``.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tools.encoder_fidelity [--input reference.csv]
+"""
+
+import argparse
+import itertools
+import time
+import numpy as np
+import pandas as pd
+from config.config import SCIBERT_BACKENDS
+from utils.predictor import CorrosionClassifier
+from utils.processors import (
+    build_batch_frame,
+    build_text_encoder,
+    clean_condition_text,
+    get_scibert_embeddings,
+)
+from utils.vars import environment, uns_nums
+
+REFERENCE_COMMENTS = [
+    "",
+    "seawater splash zone",
+    "acidic environment with high humidity",
+    "stagnant aerated brine at elevated temperature",
+    "hot concentrated sulfuric acid with trace chlorides",
+    "alternate wetting and drying in marine atmosphere",
+    "high velocity turbulent flow with entrained sand",
+    "crevice under gasket exposed to chloride deposits",
+    "dilute caustic cleaning solution, intermittent service",
+    "buried pipe in wet clay soil with cathodic protection",
+    "vapour space above boiling acetic acid",
+    "oxidizing acid with ferric ions present",
+]
+PCA_COLUMNS = [f"PCA_{i+1}" for i in range(15)]
+
+
+def reference_records(input_path=None):
+    """Reference inputs: a CSV in the batch schema, or a fixed synthetic grid."""
+    if input_path:
+        return build_batch_frame(pd.read_csv(input_path))
+    grid = itertools.product(
+        environment[::40], uns_nums[::20], [25, 80], [10, 60], REFERENCE_COMMENTS
+    )
+    return build_batch_frame(
+        [
+            {
+                "Environment": env,
+                "UNS": uns,
+                "Temperature": temp,
+                "Concentration": conc,
+                "Comment": comment,
+            }
+            for env, uns, temp, conc, comment in grid
+        ]
+    )
+
+
+def evaluate_backend(clf, base_input, texts, inverse, encoder):
+    """Embed with one encoder and return its PCA outputs, classes and latency."""
+    start = time.perf_counter()
+    embeddings = get_scibert_embeddings(texts, encoder=encoder)
+    seconds = time.perf_counter() - start
+
+    scibert_df = pd.DataFrame(
+        embeddings, columns=[f"scibert_{i}" for i in range(embeddings.shape[1])]
+    )
+    pca = clf.models["pca"].transform(scibert_df)[inverse]
+    full_input = base_input.copy()
+    full_input[PCA_COLUMNS] = pca
+    return pca, clf.models["model"].predict(full_input), seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", help="Reference CSV in the batch input schema")
+    parser.add_argument("--backends", nargs="+", default=SCIBERT_BACKENDS)
+    args = parser.parse_args()
+
+    clf = CorrosionClassifier()
+    records = reference_records(args.input)
+    base_input = clf.preprocess_batch(records)
+    cleaned = records["Comment"].map(clean_condition_text).to_numpy(dtype=str)
+    texts, inverse = np.unique(cleaned, return_inverse=True)
+    texts = list(texts)
+    print(f"Reference set: {len(records)} rows, {len(texts)} distinct comments\n")
+
+    baseline_pca, baseline_pred, _ = evaluate_backend(
+        clf, base_input, texts, inverse, build_text_encoder("torch")
+    )
+    print(
+        f"{'Backend':<12} {'ms/text':>8} {'max |dPCA|':>11} "
+        f"{'mean |dPCA|':>12} {'class agree':>12}"
+    )
+    for backend in args.backends:
+        try:
+            encoder = build_text_encoder(backend)
+        except (ImportError, OSError) as e:
+            print(f"{backend:<12} skipped: {e}")
+            continue
+        pca, pred, seconds = evaluate_backend(clf, base_input, texts, inverse, encoder)
+        diff = np.abs(pca - baseline_pca)
+        print(
+            f"{backend:<12} {1000 * seconds / len(texts):>8.2f} "
+            f"{diff.max():>11.5f} {diff.mean():>12.5f} "
+            f"{np.mean(pred == baseline_pred):>11.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Export the sklearn artifacts in a layout that loads with ``mmap_mode="r"``.
+
+Each artifact in ``SHARED_ARTIFACT_KEYS`` is re-dumped uncompressed under
+``MODEL_PATHS["mmap_artifacts"]``, where CorrosionClassifier maps its NumPy
+arrays read-only instead of unpickling a private copy per process.
+
+The random forest is exported compiled as a FlatForest: unpickling a
+sklearn tree copies its node arrays into the tree's own buffers, so a
+mapped forest pickle would still end up in private memory. Before it is
+written, the compiled forest is checked for identical predictions on the
+inputs ``tools.compile_forest`` uses: the preprocessed reference records,
+plus copies nudged onto split thresholds and copies with NaN features.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tools.export_mmap_artifacts [--input reference.csv]
+"""
+
+import argparse
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from config.config import MODEL_PATHS
+from utils.artifacts import (
+    SHARED_ARTIFACT_KEYS,
+    dump_mmap_artifact,
+    load_mmap_artifact,
+)
+from tools.compile_forest import equality_check_rows
+from tools.encoder_fidelity import reference_records
+from utils.flat_forest import FlatForest
+from utils.predictor import CorrosionClassifier
+
+
+def export_forest(forest, reference):
+    """Compile ``forest``, check it against sklearn around ``reference``, export it.
+
+    ``reference`` is a preprocessed feature frame.
+    """
+    flat = FlatForest.from_sklearn(forest)
+    X = equality_check_rows(flat, reference)
+    expected = forest.predict(pd.DataFrame(X, columns=reference.columns))
+    mismatches = int(np.sum(flat.predict(X) != expected))
+    print(f"Prediction equality on {len(X)} rows: {mismatches} mismatches")
+    if mismatches:
+        raise SystemExit("Compiled forest disagrees with sklearn; nothing written")
+    return dump_mmap_artifact(flat, "model")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", help="Reference CSV in the batch input schema")
+    args = parser.parse_args()
+
+    reference = CorrosionClassifier().preprocess_batch(reference_records(args.input))
+    for key in SHARED_ARTIFACT_KEYS:
+        if key == "model":
+            path = export_forest(joblib.load(MODEL_PATHS["full_model"]), reference)
+        else:
+            path = dump_mmap_artifact(joblib.load(MODEL_PATHS[key]), key)
+        mapped = load_mmap_artifact(key)
+        n_mapped = sum(isinstance(value, np.memmap) for value in vars(mapped).values())
+        print(
+            f"{key:<12} {os.path.getsize(path) / 1024:>9.1f} KB  "
+            f"{n_mapped} memory-mapped arrays  -> {path}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Export the fp32 SciBERT encoder to an ONNX graph for the "onnx" backend.
+
+The graph is written to ``MODEL_PATHS["scibert_onnx"]`` with dynamic batch
+and sequence axes. Select it with ``SCIBERT_BACKEND=onnx`` (needs the
+optional ``onnxruntime`` package at inference time).
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tools.export_scibert_onnx
+"""
+
+import argparse
+import os
+from config.config import MODEL_PATHS
+from utils.processors import load_scibert
+
+INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+
+def export_scibert_onnx(out_path, opset=17):
+    import torch
+
+    tokenizer, model = load_scibert()
+    sample = tokenizer(
+        ["seawater splash zone", "hot concentrated sulfuric acid"],
+        return_tensors="pt",
+        padding=True,
+    )
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in INPUT_NAMES}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in INPUT_NAMES),
+            out_path,
+            input_names=INPUT_NAMES,
+            output_names=["last_hidden_state", "pooler_output"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default=MODEL_PATHS["scibert_onnx"])
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args()
+    print(f"Wrote ONNX encoder to {export_scibert_onnx(args.out, args.opset)}")
+
+
+if __name__ == "__main__":
+    main()
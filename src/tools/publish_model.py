@@ -0,0 +1,47 @@
+"""Publish a model version to the registry and optionally make it current.
+
+The PCA, encoders, scaler and classifier (by default the ones in
+``MODEL_PATHS``) are written to ``MODEL_REGISTRY_DIR/<version>/`` with a
+checksummed manifest and feature schema. ``--activate`` then repoints
+``CURRENT``; running workers load, warm and swap in the new version within
+``MODEL_RELOAD_INTERVAL_S``. ``--activate-only`` switches to an already
+published version, e.g. to roll back.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tools.publish_model --version v2 --model retrained.pkl --activate
+    PYTHONPATH=src python -m tools.publish_model --version v1 --activate-only
+"""
+
+import argparse
+import joblib
+from config.config import MODEL_PATHS
+from utils.artifacts import SHARED_ARTIFACT_KEYS
+from utils.registry import ModelRegistry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--version", required=True)
+    parser.add_argument("--activate", action="store_true")
+    parser.add_argument("--activate-only", action="store_true")
+    sources = {key: MODEL_PATHS[key] for key in SHARED_ARTIFACT_KEYS}
+    sources["model"] = MODEL_PATHS["full_model"]
+    for key, path in sources.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", default=path)
+    args = parser.parse_args()
+
+    registry = ModelRegistry()
+    if not args.activate_only:
+        paths = {key: getattr(args, key) for key in SHARED_ARTIFACT_KEYS}
+        models = {key: joblib.load(path) for key, path in paths.items()}
+        out_dir = registry.publish(args.version, models, source=paths)
+        print(f"Published {args.version} to {out_dir}")
+    if args.activate or args.activate_only:
+        previous = registry.current_version()
+        registry.activate(args.version)
+        print(f"CURRENT: {previous} -> {args.version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Score a CSV of conditions in streaming chunks, resuming interrupted runs.
+
+The input is read ``--chunk-rows`` rows at a time. Each chunk is scored with
+one batched embedding and prediction call (``utils.batch_scoring``) and
+written as a numbered part file in ``<output>.parts/``. A part only appears
+once it is complete, so the parts double as the checkpoint: re-running the
+same command skips every chunk that already has one. Once all chunks are
+done the parts are merged in order into the output and removed.
+``--workers N`` scores chunks in N processes; ``--embedding-workers N``
+instead keeps one scoring process and spreads only the SciBERT embedding of
+each chunk over N core-pinned processes (``utils.embedding_pool``).
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tools.score_csv in.csv -o out.parquet [--workers 4]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import pandas as pd
+from config.config import BATCH_CHUNK_ROWS, BATCH_OUTPUT_FORMATS
+from utils.batch_scoring import CHUNK_WRITERS, read_csv_chunks, score_chunk
+from utils.embedding_pool import EmbeddingPool
+from utils.processors import set_embedding_pool
+from utils.runtime import available_cores
+
+_clf = None
+
+
+def _init_worker():
+    global _clf
+    from utils.predictor import CorrosionClassifier
+
+    _clf = CorrosionClassifier()
+
+
+def score_part(chunk, path, output_format):
+    """Score one chunk into its part file; returns (rows, rows with errors)."""
+    scored = score_chunk(_clf, chunk)
+    tmp_path = f"{path}.tmp"
+    with CHUNK_WRITERS[output_format](tmp_path) as writer:
+        writer.write(scored)
+    os.replace(tmp_path, path)
+    return len(scored), int((scored["Error"] != "").sum())
+
+
+def read_part(path, output_format):
+    if output_format == "parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def part_path(parts_dir, index, output_format):
+    return os.path.join(parts_dir, f"part-{index:06d}.{output_format}")
+
+
+def open_checkpoint(input_path, parts_dir, chunk_rows, output_format):
+    """Indices of finished chunks, after checking they came from this input."""
+    stat = os.stat(input_path)
+    run = {
+        "input": os.path.abspath(input_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "chunk_rows": chunk_rows,
+        "format": output_format,
+    }
+    checkpoint = os.path.join(parts_dir, "checkpoint.json")
+    if os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            previous = json.load(f)
+        if previous != run:
+            raise SystemExit(
+                f"{parts_dir} holds a run with different settings or input "
+                f"({previous}); pass --restart to discard it"
+            )
+    else:
+        os.makedirs(parts_dir, exist_ok=True)
+        with open(checkpoint, "w") as f:
+            json.dump(run, f, indent=2)
+    suffix = f".{output_format}"
+    return {
+        int(name[len("part-") : -len(suffix)])
+        for name in os.listdir(parts_dir)
+        if name.startswith("part-") and name.endswith(suffix)
+    }
+
+
+def merge_parts(parts_dir, n_parts, output, output_format):
+    """Concatenate the part files in order into ``output``, one at a time."""
+    tmp_output = f"{output}.tmp"
+    with CHUNK_WRITERS[output_format](tmp_output) as writer:
+        for index in range(n_parts):
+            writer.write(
+                read_part(part_path(parts_dir, index, output_format), output_format)
+            )
+    os.replace(tmp_output, output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "input",
+        help="CSV with Environment, Temperature, Concentration, UNS and Comment",
+    )
+    parser.add_argument(
+        "-o", "--output", required=True, help="Output .csv or .parquet file"
+    )
+    parser.add_argument(
+        "--format",
+        choices=BATCH_OUTPUT_FORMATS,
+        help="Defaults to the output extension",
+    )
+    parser.add_argument("--chunk-rows", type=int, default=BATCH_CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--embedding-workers",
+        type=int,
+        default=0,
+        help="Embed comments in this many processes (not with --workers)",
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="Discard an earlier partial run"
+    )
+    args = parser.parse_args()
+
+    output_format = args.format or os.path.splitext(args.output)[1].lstrip(".").lower()
+    if output_format not in BATCH_OUTPUT_FORMATS:
+        parser.error(f"Cannot infer the format of {args.output}; pass --format")
+    if args.workers > 1 and args.embedding_workers:
+        parser.error("Use either --workers or --embedding-workers")
+
+    parts_dir = f"{args.output}.parts"
+    if args.restart:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+    done = open_checkpoint(args.input, parts_dir, args.chunk_rows, output_format)
+    if done:
+        print(f"Resuming: {len(done)} chunks already scored")
+
+    if args.workers > 1:
+        # Split the cores between workers unless the thread count is pinned.
+        os.environ.setdefault(
+            "INFERENCE_NUM_THREADS", str(max(1, available_cores() // args.workers))
+        )
+        executor = ProcessPoolExecutor(
+            args.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+    else:
+        if args.embedding_workers:
+            embedding_pool = EmbeddingPool(args.embedding_workers)
+            embedding_pool.warm_up()
+            set_embedding_pool(embedding_pool)
+        _init_worker()
+        executor = None
+
+    start = time.perf_counter()
+    rows = errors = 0
+    pending = set()
+
+    def record(result):
+        nonlocal rows, errors
+        rows += result[0]
+        errors += result[1]
+        elapsed = time.perf_counter() - start
+        print(f"Scored {rows:,} rows ({rows / elapsed:,.0f} rows/s)", flush=True)
+
+    n_parts = 0
+    try:
+        with read_csv_chunks(args.input, args.chunk_rows) as reader:
+            for index, chunk in enumerate(reader):
+                n_parts = index + 1
+                if index in done:
+                    continue
+                path = part_path(parts_dir, index, output_format)
+                if executor is None:
+                    record(score_part(chunk, path, output_format))
+                    continue
+                pending.add(executor.submit(score_part, chunk, path, output_format))
+                # Keep a bounded number of chunks in flight.
+                if len(pending) >= 2 * args.workers:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        record(future.result())
+        for future in wait(pending)[0]:
+            record(future.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if args.embedding_workers:
+            set_embedding_pool(None)
+            embedding_pool.close()
+
+    if n_parts == 0:
+        raise SystemExit(f"{args.input} has no rows")
+    merge_parts(parts_dir, n_parts, args.output, output_format)
+    shutil.rmtree(parts_dir)
+    print(
+        f"Wrote {args.output}: {rows:,} rows scored this run, {errors:,} with errors "
+        f"in {time.perf_counter() - start:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Report import and cold-start times for each Streamlit page.
+
+Every page runs in a fresh interpreter (Streamlit bare mode) with the
+SciBERT warm-up disabled, so the numbers show what the page itself pays.
+Pages that embed text additionally time their first embedding request, and
+the resident and private (unshared) memory of each page is reported last.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tools.startup_report
+"""
+
+import glob
+import json
+import os
+import subprocess
+import sys
+from config.config import BASE_PATH
+
+MAIN_PAGE = os.path.join(BASE_PATH, "Corrosion_Rate_Prediction_+_Suggesstions.py")
+
+_PROBE = r"""
+import json, runpy, sys, time
+
+start = time.perf_counter()
+runpy.run_path(sys.argv[1], run_name="__main__")
+report = {
+    "page_seconds": time.perf_counter() - start,
+    "torch_imported": "torch" in sys.modules,
+    "first_embedding_seconds": None,
+}
+if "utils.predictor" in sys.modules:
+    from utils.processors import get_scibert_embeddings
+
+    start = time.perf_counter()
+    get_scibert_embeddings(["seawater splash zone"])
+    report["first_embedding_seconds"] = time.perf_counter() - start
+try:
+    with open("/proc/self/smaps_rollup") as smaps:
+        fields = dict(line.split(":", 1) for line in smaps if ":" in line)
+    kib = lambda key: int(fields[key].split()[0])
+    report["rss_mb"] = kib("Rss") / 1024
+    report["private_mb"] = (kib("Private_Clean") + kib("Private_Dirty")) / 1024
+except OSError:
+    report["rss_mb"] = report["private_mb"] = None
+print("STARTUP_REPORT " + json.dumps(report))
+"""
+
+
+def list_pages():
+    return [MAIN_PAGE] + sorted(glob.glob(os.path.join(BASE_PATH, "pages", "*.py")))
+
+
+def probe_page(page):
+    """Run one page in a fresh interpreter and return its timing report."""
+    env = dict(os.environ, SCIBERT_WARMUP="0")
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [BASE_PATH, env.get("PYTHONPATH")])
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, page],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP_REPORT "):
+            return json.loads(line[len("STARTUP_REPORT ") :])
+    return {"error": result.stderr.strip().splitlines()[-1:]}
+
+
+def _megabytes(value):
+    return "-" if value is None else f"{value:.0f}"
+
+
+def main():
+    print(
+        f"{'Page':<45} {'Import+render (s)':>18} {'torch':>6} "
+        f"{'1st embed (s)':>14} {'RSS (MB)':>9} {'private (MB)':>13}"
+    )
+    for page in list_pages():
+        report = probe_page(page)
+        name = os.path.basename(page)
+        if "error" in report:
+            print(f"{name:<45} failed: {report['error']}")
+            continue
+        first = report["first_embedding_seconds"]
+        print(
+            f"{name:<45} {report['page_seconds']:>18.2f} "
+            f"{str(report['torch_imported']):>6} "
+            f"{'-' if first is None else f'{first:.2f}':>14} "
+            f"{_megabytes(report['rss_mb']):>9} {_megabytes(report['private_mb']):>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Local stand-in for the Groq chat completions API, for offline testing.
+
+Serves ``POST /openai/v1/chat/completions`` (plain and streamed) with canned
+five-bullet answers, so the app, the scheduler and the response cache can be
+exercised without network access or API keys. Per-model latency, failing
+models, rejected keys, a per key/model rate limit and random server errors
+can be injected; ``GET /stats`` returns the responses sent per key, model and
+status.
+
+Run from the repository root, then point the app at it:
+
+    PYTHONPATH=src python -m tools.stub_llm_server --port 8765 --rpm 5 \\
+        --fail qwen-qwq-32b=404 --model-latency llama3-70b-8192=3
+    GROQ_API_BASE=http://127.0.0.1:8765 GROQ_API_KEY_1=a GROQ_API_KEY_2=b make run
+"""
+
+import argparse
+import collections
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+ERROR_CODES = {
+    401: ("invalid_request_error", "invalid_api_key", "Invalid API Key"),
+    404: (
+        "invalid_request_error",
+        "model_decommissioned",
+        "The model {model} has been decommissioned",
+    ),
+    429: ("tokens", "rate_limit_exceeded", "Rate limit reached for model {model}"),
+    500: ("internal_server_error", "internal_server_error", "Internal server error"),
+    503: ("service_unavailable", "service_unavailable", "Service unavailable"),
+}
+
+
+def parse_assignments(values, cast):
+    """``["model=value", ...]`` -> ``{model: cast(value)}``."""
+    assignments = {}
+    for value in values:
+        model, _, setting = value.rpartition("=")
+        if not model:
+            raise argparse.ArgumentTypeError(f"Expected MODEL=VALUE, got {value!r}")
+        assignments[model] = cast(setting)
+    return assignments
+
+
+def stub_answer(model):
+    """Canned recommendation; reasoning models open with a think block."""
+    bullets = "\n".join(
+        f"- **Point {i}**: stub recommendation {i} from {model}." for i in range(1, 6)
+    )
+    if "deepseek" in model or "qwq" in model:
+        return f"<think>Stub reasoning of {model}.</think>\n{bullets}"
+    return bullets
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    options = None
+    counts = collections.Counter()
+    recent = collections.defaultdict(collections.deque)  # (key, model) -> times
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass  # one line per request would drown the app's output
+
+    def do_GET(self):
+        if self.path != "/stats":
+            return self._send_json(404, {"error": {"message": "Not found"}})
+        with self.lock:
+            stats = [
+                {"key": key, "model": model, "status": status, "responses": n}
+                for (key, model, status), n in sorted(self.counts.items())
+            ]
+        self._send_json(200, {"responses": stats})
+
+    def do_POST(self):
+        if self.path != COMPLETIONS_PATH:
+            return self._send_json(404, {"error": {"message": "Not found"}})
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        model = request.get("model", "")
+        key = self.headers.get("Authorization", "").removeprefix("Bearer ")
+
+        status, retry_after = self._status(key, model)
+        with self.lock:
+            self.counts[(key, model, status)] += 1
+        if status != 200:
+            return self._send_error(status, model, retry_after)
+
+        options = self.options
+        time.sleep(options.model_latency.get(model, options.latency))
+        if request.get("stream"):
+            self._send_stream(model, stub_answer(model))
+        else:
+            self._send_completion(model, stub_answer(model))
+
+    def _status(self, key, model):
+        """Injected outcome of a request: (status, Retry-After seconds)."""
+        options = self.options
+        if key in options.bad_key:
+            return 401, None
+        if model in options.fail:
+            return options.fail[model], None
+        if options.rpm:
+            now = time.monotonic()
+            with self.lock:
+                recent = self.recent[(key, model)]
+                while recent and recent[0] <= now - 60:
+                    recent.popleft()
+                if len(recent) >= options.rpm:
+                    return 429, recent[0] + 60 - now
+                recent.append(now)
+        if random.random() < options.error_rate:
+            return 503, None
+        return 200, None
+
+    def _send_error(self, status, model, retry_after):
+        kind, code, message = ERROR_CODES.get(status, ERROR_CODES[500])
+        headers = {}
+        if retry_after is not None:
+            headers["retry-after"] = f"{retry_after:.1f}"
+        body = {
+            "error": {
+                "message": message.format(model=model),
+                "type": kind,
+                "code": code,
+            }
+        }
+        self._send_json(status, body, headers)
+
+    def _send_completion(self, model, answer):
+        words = len(answer.split())
+        self._send_json(
+            200,
+            {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": answer},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 0,
+                    "completion_tokens": words,
+                    "total_tokens": words,
+                },
+            },
+        )
+
+    def _send_stream(self, model, answer):
+        """Server-sent events, one word per chunk, then ``[DONE]``."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        pieces = [word + " " for word in answer.split(" ")]
+        pieces[-1] = pieces[-1][:-1]
+        for i, piece in enumerate(pieces + [None]):
+            delta = {} if piece is None else {"content": piece}
+            if i == 0:
+                delta["role"] = "assistant"
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": delta,
+                        "finish_reason": "stop" if piece is None else None,
+                    }
+                ],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(self.options.token_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address):
+        # Clients drop hedged requests that lose the race mid-answer.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency", type=float, default=0.2, help="Seconds before answering"
+    )
+    parser.add_argument(
+        "--model-latency",
+        action="append",
+        default=[],
+        metavar="MODEL=SECONDS",
+        help="Latency of one model (repeatable)",
+    )
+    parser.add_argument(
+        "--token-delay", type=float, default=0.01, help="Seconds between chunks"
+    )
+    parser.add_argument(
+        "--fail",
+        action="append",
+        default=[],
+        metavar="MODEL=STATUS",
+        help="Answer every request for MODEL with STATUS, e.g. 404 (repeatable)",
+    )
+    parser.add_argument(
+        "--bad-key",
+        action="append",
+        default=[],
+        help="Reject this API key with 401 (repeatable)",
+    )
+    parser.add_argument(
+        "--rpm", type=int, default=0, help="Requests per minute per key and model"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of random 503 answers"
+    )
+    args = parser.parse_args()
+    try:
+        args.model_latency = parse_assignments(args.model_latency, float)
+        args.fail = parse_assignments(args.fail, int)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    StubLLMHandler.options = args
+    server = StubLLMServer((args.host, args.port), StubLLMHandler)
+    print(f"Serving stub chat completions on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
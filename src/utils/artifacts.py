@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import struct
+import joblib
+import numpy as np
+from config.config import MODEL_PATHS
+
+# The sklearn artifacts CorrosionClassifier loads, by MODEL_PATHS key.
+SHARED_ARTIFACT_KEYS = ["pca", "model", "uns_encoder", "env_encoder", "temp_scaler"]
+
+SAFETENSORS_DTYPES = {
+    "F64": np.float64,
+    "F32": np.float32,
+    "F16": np.float16,
+    "I64": np.int64,
+    "I32": np.int32,
+    "I16": np.int16,
+    "I8": np.int8,
+    "U8": np.uint8,
+    "BOOL": np.bool_,
+}
+
+
+def map_safetensors(path):
+    """Map a .safetensors file into a state dict of torch tensors without copying.
+
+    The file is mapped copy-on-write, so every process loading the same file
+    shares its physical pages until (and unless) it writes to a tensor.
+    """
+    import torch
+
+    raw = np.memmap(path, dtype=np.uint8, mode="c")
+    (header_size,) = struct.unpack("<Q", raw[:8].tobytes())
+    header = json.loads(raw[8 : 8 + header_size].tobytes())
+    data_start = 8 + header_size
+
+    state_dict = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        if info["dtype"] not in SAFETENSORS_DTYPES:
+            raise ValueError(f"Unsupported safetensors dtype {info['dtype']} in {path}")
+        begin, end = info["data_offsets"]
+        array = raw[data_start + begin : data_start + end].view(
+            SAFETENSORS_DTYPES[info["dtype"]]
+        )
+        state_dict[name] = torch.from_numpy(array.reshape(info["shape"]))
+    return state_dict
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def mmap_artifact_path(key):
+    return os.path.join(MODEL_PATHS["mmap_artifacts"], f"{key}.joblib")
+
+
+def dump_mmap_artifact(obj, key):
+    """Write ``obj`` uncompressed, so its NumPy arrays can be memory-mapped."""
+    os.makedirs(MODEL_PATHS["mmap_artifacts"], exist_ok=True)
+    path = mmap_artifact_path(key)
+    joblib.dump(obj, path)
+    return path
+
+
+def load_mmap_artifact(key):
+    """Load an export with its arrays mapped read-only, or None if absent.
+
+    Read-only mappings of the same file are backed by the same page-cache
+    pages in every process, so N workers hold one copy of the arrays.
+    """
+    path = mmap_artifact_path(key)
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path, mmap_mode="r")
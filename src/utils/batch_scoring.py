@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+from config.config import BATCH_CHUNK_ROWS, BATCH_INPUT_COLUMNS
+
+REQUIRED_COLUMNS = [col for col in BATCH_INPUT_COLUMNS if col != "Comment"]
+RESULT_COLUMNS = ["Predicted Corrosion Rate", "Confidence", "Error"]
+
+
+def read_csv_chunks(source, chunk_rows=BATCH_CHUNK_ROWS, skip_rows=0):
+    """Iterate over a CSV file or buffer ``chunk_rows`` rows at a time.
+
+    Every cell is read as a string (empty cells stay ``""``) so a chunk's
+    columns never change type from one chunk to the next; ``skip_rows`` data
+    rows after the header are skipped.
+    """
+    return pd.read_csv(
+        source,
+        chunksize=chunk_rows,
+        dtype=str,
+        keep_default_na=False,
+        skiprows=range(1, skip_rows + 1) if skip_rows else None,
+    )
+
+
+def score_chunk(clf, chunk):
+    """Append predictions to one chunk of uploaded rows.
+
+    Temperature and Concentration are parsed as numbers. Rows that cannot be
+    scored (non-numeric or infinite values, blank environment or alloy, or
+    categories rejected by the unknown-category policy) keep an empty
+    prediction and explain why in ``Error``, so one bad row never fails the
+    file.
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+    if missing:
+        raise ValueError(f"CSV is missing columns: {missing}")
+    scored = chunk.reset_index(drop=True)
+    if "Comment" not in scored.columns:
+        scored["Comment"] = ""
+
+    errors = pd.Series("", index=scored.index, dtype=object)
+    for col in ("Temperature", "Concentration"):
+        values = pd.to_numeric(scored[col].str.strip(), errors="coerce")
+        scored[col] = values.astype(np.float64)
+        errors[scored[col].isna() & (errors == "")] = f"{col} must be a number"
+        # "inf" parses as a number, but the model rejects it for the whole chunk.
+        infinite = np.isinf(scored[col])
+        errors[infinite & (errors == "")] = f"{col} must be finite"
+    for col in ("Environment", "UNS"):
+        errors[(scored[col].str.strip() == "") & (errors == "")] = f"{col} is required"
+
+    valid = (errors == "").to_numpy()
+    results = pd.DataFrame(
+        {
+            "Predicted Corrosion Rate": "",
+            "Confidence": np.nan,
+            "Error": errors,
+        }
+    )
+    if valid.any():
+        results.loc[valid, RESULT_COLUMNS] = clf.score_batch(
+            scored.loc[valid, BATCH_INPUT_COLUMNS]
+        ).to_numpy()
+    results["Confidence"] = results["Confidence"].astype(np.float64)
+    return pd.concat(
+        [scored.drop(columns=RESULT_COLUMNS, errors="ignore"), results], axis=1
+    )
+
+
+class CsvChunkWriter:
+    """Write scored chunks to a CSV file as they arrive."""
+
+    def __init__(self, path):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.header = True
+
+    def write(self, frame):
+        frame.to_csv(self.file, header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ParquetChunkWriter:
+    """Write scored chunks to a Parquet file, one row group per chunk.
+
+    The schema is fixed by the first chunk; later chunks are cast to it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+
+    def write(self, frame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.writer is None:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = pa.Table.from_pandas(
+                frame, schema=self.writer.schema, preserve_index=False
+            )
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+CHUNK_WRITERS = {"csv": CsvChunkWriter, "parquet": ParquetChunkWriter}
+
+
+def score_csv(clf, source, writer, chunk_rows=BATCH_CHUNK_ROWS):
+    """Score a CSV chunk by chunk into ``writer``, yielding rows done so far.
+
+    Only one chunk is held in memory at a time, whatever the file size.
+    """
+    rows_done = 0
+    with read_csv_chunks(source, chunk_rows) as reader:
+        for chunk in reader:
+            writer.write(score_chunk(clf, chunk))
+            rows_done += len(chunk)
+            yield rows_done
@@ -0,0 +1,210 @@
+import os
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from config.config import MODEL_PATHS, UNKNOWN_CATEGORY_POLICY
+from utils.artifacts import SHARED_ARTIFACT_KEYS, file_sha256
+from utils.pipeline import FEATURE_COLUMNS, FusedPreprocessor
+from utils.predictor import artifact_path
+from utils.processors import clean_condition_text, get_scibert_version
+from utils.vars import targets
+
+# Cell value for grid points the classifier refuses (unseen categories
+# under UNKNOWN_CATEGORY_POLICY="error").
+NO_PREDICTION = 255
+
+
+def normalize_comment(comment):
+    """Comments that tokenize identically share one map entry."""
+    return " ".join(clean_condition_text(comment or "").split())
+
+
+def _file_digest(path):
+    """Short checksum of one artifact file, or a marker when it is absent."""
+    if not os.path.exists(path):
+        return f"missing:{os.path.basename(path)}"
+    return file_sha256(path)[:16]
+
+
+def model_fingerprint(clf):
+    """Identifies the artifacts and text encoder a map was computed with.
+
+    Computed once per loaded ModelVersion and kept on it, so lookups do not
+    re-hash the artifact files. Outside a registry, each artifact is hashed
+    from the file it was actually loaded from (memory-mapped export, variant
+    or MODEL_PATHS pickle).
+    """
+    active = clf.active
+    if active.fingerprint is None:
+        if active.version is not None:
+            model = f"registry:{active.version}"
+        else:
+            model = ",".join(
+                _file_digest(artifact_path(key)) for key in SHARED_ARTIFACT_KEYS
+            )
+        active.fingerprint = f"{model}|{get_scibert_version()}"
+    return active.fingerprint
+
+
+class CorrosionMap:
+    """Precomputed classes for environment x alloy x temperature x concentration.
+
+    ``cells`` holds a uint8 index into ``labels`` per grid point, so any
+    point on the grid is answered with four dict lookups and one array read.
+    """
+
+    def __init__(
+        self,
+        cells,
+        labels,
+        environments,
+        alloys,
+        temperatures,
+        concentrations,
+        comment,
+        fingerprint,
+    ):
+        self.cells = cells
+        self.labels = np.asarray(labels)
+        self.environments = list(environments)
+        self.alloys = list(alloys)
+        self.temperatures = [float(t) for t in temperatures]
+        self.concentrations = [float(c) for c in concentrations]
+        self.comment = str(comment)
+        self.fingerprint = str(fingerprint)
+        self.environment_index = {e: i for i, e in enumerate(self.environments)}
+        self.alloy_index = {u: i for i, u in enumerate(self.alloys)}
+        self.temperature_index = {t: i for i, t in enumerate(self.temperatures)}
+        self.concentration_index = {c: i for i, c in enumerate(self.concentrations)}
+        self.class_names = [targets.get(str(int(p)), "Unknown") for p in self.labels]
+
+    @classmethod
+    def build(cls, clf, environments, alloys, temperatures, concentrations, comment):
+        """Classify the whole grid with ``clf``, one environment at a time."""
+        with clf.snapshot():
+            pipeline = clf.pipeline or FusedPreprocessor(clf.models)
+            # Taken in the snapshot, so it names the version that scores the grid.
+            fingerprint = model_fingerprint(clf)
+            embedding = clf.embed_comments([comment])
+            # One reference row supplies the PCA block shared by every cell.
+            row = pipeline.transform(
+                environments[:1], [0.0], [0.0], alloys[:1], embedding
+            )[0]
+            idx = pipeline.column_index
+            env_values = pipeline.env_table.encode(environments, unknown="prior")
+            uns_values = pipeline.uns_table.encode(alloys, unknown="prior")
+            temps = np.asarray(temperatures, dtype=np.float64)
+            temp_values = (temps - pipeline.temp_mean) / pipeline.temp_scale
+            conc_values = np.asarray(concentrations, dtype=np.float64)
+
+            shape = (len(alloys), len(temperatures), len(concentrations))
+            uns_grid, temp_grid, conc_grid = np.meshgrid(
+                uns_values, temp_values, conc_values, indexing="ij"
+            )
+            X = np.tile(row, (uns_grid.size, 1))
+            X[:, idx["UNS"]] = uns_grid.ravel()
+            X[:, idx["Temperature (deg C)"]] = temp_grid.ravel()
+            X[:, idx["Concentration_clean"]] = conc_grid.ravel()
+
+            model = clf.models["model"]
+            labels = np.asarray(
+                getattr(model, "classes_", getattr(model, "classes", None))
+            )
+            cells = np.empty((len(environments),) + shape, dtype=np.uint8)
+            for i, env_value in enumerate(env_values):
+                X[:, idx["Environment"]] = env_value
+                predictions = clf.classify(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+                cells[i] = np.searchsorted(labels, predictions).reshape(shape)
+
+        if UNKNOWN_CATEGORY_POLICY == "error":
+            unseen_env = [e not in pipeline.env_table.index_of for e in environments]
+            unseen_uns = [u not in pipeline.uns_table.index_of for u in alloys]
+            cells[np.asarray(unseen_env)] = NO_PREDICTION
+            cells[:, np.asarray(unseen_uns)] = NO_PREDICTION
+        return cls(
+            cells,
+            labels,
+            environments,
+            alloys,
+            temperatures,
+            concentrations,
+            normalize_comment(comment),
+            fingerprint,
+        )
+
+    def lookup(self, env, temp, conc, uns_input):
+        """Class name at one grid point, or None when it is off the grid."""
+        try:
+            cell = self.cells[
+                self.environment_index[env],
+                self.alloy_index[uns_input],
+                self.temperature_index[float(temp)],
+                self.concentration_index[float(conc)],
+            ]
+        except KeyError:
+            return None
+        return None if cell == NO_PREDICTION else self.class_names[cell]
+
+    def slice(self, temp, conc):
+        """Class names for every environment x alloy at one temperature/concentration."""
+        cells = self.cells[
+            :,
+            :,
+            self.temperature_index[float(temp)],
+            self.concentration_index[float(conc)],
+        ]
+        names = np.array(self.class_names + ["No prediction"], dtype=object)
+        cells = np.where(cells == NO_PREDICTION, len(self.class_names), cells)
+        return pd.DataFrame(names[cells], index=self.environments, columns=self.alloys)
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            cells=self.cells,
+            labels=self.labels,
+            environments=np.array(self.environments, dtype=str),
+            alloys=np.array(self.alloys, dtype=str),
+            temperatures=np.array(self.temperatures),
+            concentrations=np.array(self.concentrations),
+            comment=np.array(self.comment),
+            fingerprint=np.array(self.fingerprint),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["cells"],
+                data["labels"],
+                data["environments"].tolist(),
+                data["alloys"].tolist(),
+                data["temperatures"],
+                data["concentrations"],
+                data["comment"].item(),
+                data["fingerprint"].item(),
+            )
+
+
+@lru_cache(maxsize=None)
+def get_corrosion_map():
+    """The map at ``MODEL_PATHS["corrosion_map"]``, loaded once, or None."""
+    if not os.path.exists(MODEL_PATHS["corrosion_map"]):
+        return None
+    return CorrosionMap.load(MODEL_PATHS["corrosion_map"])
+
+
+def lookup_corrosion_map(clf, env, temp, conc, uns_input, comment):
+    """Answer a prediction from the map when it covers the query, else None.
+
+    The map is used only for its own comment and grid points, and only while
+    it was built from the artifacts ``clf`` is serving: the version pinned by
+    the caller's ``clf.snapshot()``, if any, so a fallback prediction in the
+    same snapshot uses the version that was checked.
+    """
+    corrosion_map = get_corrosion_map()
+    if corrosion_map is None or normalize_comment(comment) != corrosion_map.comment:
+        return None
+    with clf.snapshot():
+        if corrosion_map.fingerprint != model_fingerprint(clf):
+            return None
+    return corrosion_map.lookup(env, temp, conc, uns_input)
@@ -0,0 +1,122 @@
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config.config import (
+    EMBEDDING_MAX_LENGTH,
+    EMBEDDING_POOL_CHUNK_SIZE,
+    SCIBERT_EMBEDDING_DIM,
+)
+from utils.processors import (
+    _load_scibert_tokenizer,
+    get_scibert_embeddings,
+    get_text_encoder,
+)
+from utils.runtime import pin_to_cores
+
+_ready_barrier = None
+
+
+def _init_worker(core_slices, ready_barrier):
+    """Pin the worker to the next free slice of cores and load the encoder."""
+    global _ready_barrier
+    _ready_barrier = ready_barrier
+    try:
+        pin_to_cores(core_slices.get(timeout=5))
+    except queue.Empty:
+        pass  # a replacement for a dead worker keeps the default threads
+    get_text_encoder()
+
+
+def _wait_ready():
+    _ready_barrier.wait(timeout=600)
+
+
+def _embed_chunk(texts):
+    return get_scibert_embeddings(texts)
+
+
+def split_cores(cores, workers):
+    """Partition ``cores`` into ``workers`` contiguous, near-equal slices.
+
+    With more workers than cores each worker gets one core, shared round-robin.
+    """
+    cores = sorted(cores)
+    if workers > len(cores):
+        return [[cores[i % len(cores)]] for i in range(workers)]
+    return [part.tolist() for part in np.array_split(cores, workers)]
+
+
+class EmbeddingPool:
+    """SciBERT embedding spread over worker processes.
+
+    Each worker is pinned to its own slice of the cores (with as many
+    intra-op threads as cores) and loads the text encoder once at startup.
+    A batch is sorted by token length and cut into chunks of similar-length
+    texts, so every forward pass pads as little as possible. The longest
+    chunks are dispatched first to keep the tail short, and the vectors are
+    scattered back to input order.
+    """
+
+    def __init__(self, workers, chunk_size=EMBEDDING_POOL_CHUNK_SIZE):
+        if hasattr(os, "sched_getaffinity"):
+            cores = os.sched_getaffinity(0)
+        else:
+            cores = range(os.cpu_count() or 1)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.tokenizer = _load_scibert_tokenizer()
+
+        context = multiprocessing.get_context("spawn")
+        core_slices = context.Queue()
+        for cores_slice in split_cores(cores, workers):
+            core_slices.put(cores_slice)
+        # A worker whose encoder fails to load breaks the executor, so callers
+        # get BrokenProcessPool instead of waiting on endless respawns.
+        self._executor = ProcessPoolExecutor(
+            workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(core_slices, context.Barrier(workers)),
+        )
+
+    def warm_up(self):
+        """Block until every worker has started and loaded its encoder."""
+        # Each task waits at the barrier, so all of them finish only once
+        # ``workers`` distinct processes are running.
+        futures = [self._executor.submit(_wait_ready) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def embed(self, texts):
+        """Embeddings of ``texts`` in input order, shape ``(n, SCIBERT_EMBEDDING_DIM)``."""
+        texts = list(texts)
+        embeddings = np.zeros((len(texts), SCIBERT_EMBEDDING_DIM), dtype=np.float32)
+        if not texts:
+            return embeddings
+
+        lengths = self.tokenizer(
+            texts, truncation=True, max_length=EMBEDDING_MAX_LENGTH, return_length=True
+        )["length"]
+        order = np.argsort(lengths, kind="stable")
+        chunks = [
+            order[start : start + self.chunk_size]
+            for start in range(0, len(order), self.chunk_size)
+        ]
+        futures = [
+            self._executor.submit(_embed_chunk, [texts[i] for i in chunk])
+            for chunk in reversed(chunks)
+        ]
+        for chunk, future in zip(reversed(chunks), futures):
+            embeddings[chunk] = future.result()
+        return embeddings
+
+    def close(self):
+        self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,223 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import numpy as np
+from config.config import (
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    SCIBERT_EMBEDDING_DIM,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+
+_INDEX_LINE_BYTES = 72  # 64 hex digest chars, a space, the slot and a newline
+
+
+def _digest_bytes(digest):
+    return np.frombuffer(bytes.fromhex(digest), dtype=np.uint8)
+
+
+class EmbeddingStore:
+    """Persistent, content-addressed store of text embeddings.
+
+    Vectors live in a preallocated ``vectors.npy`` that every process maps
+    read-only, next to ``digests.npy`` holding the key of each slot. Keys
+    are appended to ``index.log`` as ``<digest> <slot>`` lines; a later line
+    for the same slot evicts the earlier key, and re-appending a key marks
+    it as recently used. Writers serialize on ``write.lock``, readers never
+    lock and confirm each hit against ``digests.npy`` after copying it.
+    """
+
+    def __init__(
+        self,
+        model_version,
+        root=EMBEDDING_CACHE_DIR,
+        dim=SCIBERT_EMBEDDING_DIM,
+        capacity=EMBEDDING_CACHE_MAX_ENTRIES,
+    ):
+        self.model_version = model_version
+        self.dim = dim
+        self.capacity = capacity
+        version_tag = hashlib.sha256(model_version.encode()).hexdigest()[:12]
+        self.path = os.path.join(root, version_tag)
+        self._vectors_path = os.path.join(self.path, "vectors.npy")
+        self._digests_path = os.path.join(self.path, "digests.npy")
+        self._index_path = os.path.join(self.path, "index.log")
+        self._lock_path = os.path.join(self.path, "write.lock")
+
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # digest -> slot, least recent first
+        self._slot_owner = {}
+        self._index_offset = 0
+        self._index_inode = None
+        self._vectors = None
+        self._digests = None
+        self._pending_touches = []
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text):
+        """Content address of a cleaned text under this model version."""
+        payload = f"{self.model_version}\n{text}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def get_many(self, texts):
+        """Return stored vectors and the positions of texts that were missing."""
+        embeddings = np.zeros((len(texts), self.dim), dtype=np.float32)
+        missing = []
+        with self._lock:
+            self._sync_index()
+            for i, text in enumerate(texts):
+                digest = self.key(text)
+                slot = self._entries.get(digest)
+                if slot is None or not self._read_slot(slot, digest, embeddings[i]):
+                    missing.append(i)
+                    continue
+                self._entries.move_to_end(digest)
+                self._pending_touches.append(digest)
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+            if len(self._pending_touches) >= 256:
+                self.put_many([], np.empty((0, self.dim), dtype=np.float32))
+        return embeddings, missing
+
+    def put_many(self, texts, embeddings):
+        """Append vectors for texts, evicting the least recently used slots."""
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            with self._write_lock():
+                self._ensure_arrays(writable=True)
+                self._sync_index()
+                lines = []
+                for digest in self._pending_touches:
+                    slot = self._entries.get(digest)
+                    if slot is not None:
+                        lines.append(f"{digest} {slot}\n")
+                self._pending_touches = []
+
+                for text, vector in zip(texts, embeddings):
+                    digest = self.key(text)
+                    if digest in self._entries:
+                        continue
+                    slot = self._allocate_slot()
+                    # Invalidate the slot before overwriting so concurrent
+                    # readers of the evicted key see a miss, not a torn row.
+                    self._digests[slot] = 0
+                    self._vectors[slot] = vector
+                    self._digests[slot] = _digest_bytes(digest)
+                    self._assign(digest, slot)
+                    lines.append(f"{digest} {slot}\n")
+
+                if lines:
+                    self._vectors.flush()
+                    self._digests.flush()
+                    with open(self._index_path, "a", encoding="ascii") as index:
+                        index.writelines(lines)
+                    stat = os.stat(self._index_path)
+                    self._index_inode = stat.st_ino
+                    self._index_offset = stat.st_size
+                    self._maybe_compact()
+
+    def __len__(self):
+        with self._lock:
+            self._sync_index()
+            return len(self._entries)
+
+    # ------------------------ Internals ------------------------
+    @contextmanager
+    def _write_lock(self):
+        with open(self._lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _ensure_arrays(self, writable=False):
+        if self._vectors is not None and (not writable or self._vectors.mode == "r+"):
+            return True
+        if not os.path.exists(self._vectors_path):
+            if not writable:
+                return False
+            np.lib.format.open_memmap(
+                self._digests_path,
+                mode="w+",
+                dtype=np.uint8,
+                shape=(self.capacity, 32),
+            ).flush()
+            np.lib.format.open_memmap(
+                self._vectors_path,
+                mode="w+",
+                dtype=np.float32,
+                shape=(self.capacity, self.dim),
+            ).flush()
+        mode = "r+" if writable else "r"
+        self._digests = np.load(self._digests_path, mmap_mode=mode)
+        self._vectors = np.load(self._vectors_path, mmap_mode=mode)
+        self.capacity = self._vectors.shape[0]
+        return True
+
+    def _read_slot(self, slot, digest, out):
+        if not self._ensure_arrays():
+            return False
+        out[:] = self._vectors[slot]
+        return np.array_equal(self._digests[slot], _digest_bytes(digest))
+
+    def _sync_index(self):
+        """Replay index lines appended by any process since the last sync."""
+        try:
+            stat = os.stat(self._index_path)
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._index_inode:
+            # The log was compacted (or created): replay it from the start.
+            self._entries.clear()
+            self._slot_owner.clear()
+            self._index_offset = 0
+            self._index_inode = stat.st_ino
+        if stat.st_size <= self._index_offset:
+            return
+        with open(self._index_path, "r", encoding="ascii") as index:
+            index.seek(self._index_offset)
+            for line in index:
+                if not line.endswith("\n"):
+                    break  # a writer is mid-append; pick it up next time
+                self._index_offset += len(line)
+                digest, slot = line.split()
+                self._assign(digest, int(slot))
+
+    def _assign(self, digest, slot):
+        previous = self._slot_owner.get(slot)
+        if previous is not None and previous != digest:
+            self._entries.pop(previous, None)
+        self._slot_owner[slot] = digest
+        self._entries[digest] = slot
+        self._entries.move_to_end(digest)
+
+    def _allocate_slot(self):
+        if len(self._slot_owner) < self.capacity:
+            return len(self._slot_owner)
+        evicted, slot = next(iter(self._entries.items()))
+        self._entries.pop(evicted)
+        return slot
+
+    def _maybe_compact(self):
+        """Rewrite the log once touches make it much longer than the store."""
+        live_bytes = _INDEX_LINE_BYTES * max(len(self._entries), 1024)
+        if self._index_offset < 4 * live_bytes:
+            return
+        tmp_path = f"{self._index_path}.tmp"
+        with open(tmp_path, "w", encoding="ascii") as index:
+            index.writelines(f"{d} {s}\n" for d, s in self._entries.items())
+        os.replace(tmp_path, self._index_path)
+        stat = os.stat(self._index_path)
+        self._index_inode = stat.st_ino
+        self._index_offset = stat.st_size
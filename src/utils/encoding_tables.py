@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+from config.config import UNKNOWN_CATEGORY_POLICY
+
+
+class EncodingTable:
+    """A fitted target encoder flattened into an O(1) lookup table.
+
+    ``values`` holds one encoded value per known category followed by the
+    encoder's fallbacks for unseen and missing categories, so a batch is
+    encoded by mapping its distinct labels to integer indices once and
+    gathering ``values[indices]``.
+    """
+
+    def __init__(self, col, categories, values):
+        self.col = col
+        self.categories = list(categories)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.index_of = {category: i for i, category in enumerate(self.categories)}
+        self.unknown_index = len(self.categories)
+        self.missing_index = len(self.categories) + 1
+
+    @classmethod
+    def from_target_encoder(cls, encoder, col):
+        """Build the table for one column of a category_encoders TargetEncoder."""
+        ordinal = next(m for m in encoder.ordinal_encoder.mapping if m["col"] == col)
+        targets = encoder.mapping[col]
+        categories = [c for c in ordinal["mapping"].index if isinstance(c, str)]
+        values = [targets[ordinal["mapping"][c]] for c in categories]
+        return cls(col, categories, values + [targets[-1], targets[-2]])
+
+    def index(self, labels, unknown=UNKNOWN_CATEGORY_POLICY):
+        """Integer table indices for labels.
+
+        Unseen labels map to the encoder's prior (``unknown="prior"``, the
+        encoder's own behaviour) or raise ``ValueError`` (``unknown="error"``).
+        """
+        labels = pd.Series(labels, dtype=object)
+        missing = labels.isna().to_numpy()
+        uniques, inverse = np.unique(
+            labels.where(~missing, "").to_numpy(dtype=str), return_inverse=True
+        )
+        unique_indices = np.array(
+            [self.index_of.get(label, self.unknown_index) for label in uniques],
+            dtype=np.intp,
+        )
+        indices = unique_indices[inverse.reshape(-1)]
+        indices[missing] = self.missing_index
+        if unknown == "error" and (indices == self.unknown_index).any():
+            unseen = sorted(map(str, uniques[unique_indices == self.unknown_index]))
+            raise ValueError(f"Unknown {self.col} categories: {unseen}")
+        return indices
+
+    def gather(self, indices):
+        return self.values[indices]
+
+    def encode(self, labels, unknown=UNKNOWN_CATEGORY_POLICY):
+        return self.gather(self.index(labels, unknown=unknown))
+
+    def verify(self, encoder, extra_categories=()):
+        """Assert the table matches ``encoder`` for every known category.
+
+        Also checks ``extra_categories`` (e.g. the UI option lists), an unseen
+        label and a missing value. Returns the number of labels checked.
+        """
+        labels = list(dict.fromkeys([*self.categories, *extra_categories]))
+        labels += ["<unseen category>", None]
+        expected = encoder.transform(pd.Series(labels, name=self.col))
+        expected = expected[self.col].to_numpy(dtype=np.float64)
+        actual = self.encode(labels, unknown="prior")
+        mismatched = [label for label, a, e in zip(labels, actual, expected) if a != e]
+        if mismatched:
+            raise AssertionError(
+                f"{self.col} table differs from the encoder for: {mismatched[:10]}"
+            )
+        return len(labels)
+
+
+def save_encoding_tables(tables, path):
+    """Save several tables into one ``.npz`` keyed by column name."""
+    arrays = {}
+    for table in tables:
+        arrays[f"{table.col}__categories"] = np.array(table.categories, dtype=str)
+        arrays[f"{table.col}__values"] = table.values
+    np.savez(path, **arrays)
+
+
+def load_encoding_tables(path):
+    """Load tables saved by :func:`save_encoding_tables` as ``{col: table}``."""
+    with np.load(path) as data:
+        cols = [
+            key[: -len("__values")] for key in data.files if key.endswith("__values")
+        ]
+        return {
+            col: EncodingTable(
+                col, data[f"{col}__categories"].tolist(), data[f"{col}__values"]
+            )
+            for col in cols
+        }
@@ -0,0 +1,238 @@
+import numpy as np
+import sklearn
+
+# From sklearn 1.4, classifier trees store per-node class fractions and
+# predict_proba returns them as-is; older versions normalize counts.
+_NORMALIZE_LEAF_VALUES = tuple(map(int, sklearn.__version__.split(".")[:2])) < (1, 4)
+# Rows walked at once by predict_proba; bounds the (rows, trees) temporaries.
+_PREDICT_CHUNK_ROWS = 4096
+
+
+def _node_depths(tree):
+    """Depth of every node; sklearn numbers children after their parent."""
+    depths = np.zeros(tree.node_count, dtype=np.intp)
+    for node in range(tree.node_count):
+        if tree.children_left[node] != -1:
+            depths[tree.children_left[node]] = depths[node] + 1
+            depths[tree.children_right[node]] = depths[node] + 1
+    return depths
+
+
+def _round_down_float32(values):
+    """Largest float32 not above each value.
+
+    For float32 inputs ``x <= t`` equals ``x <= _round_down_float32(t)``, so
+    thresholds can be stored in single precision without changing a split.
+    """
+    rounded = values.astype(np.float32)
+    above = rounded.astype(np.float64) > values
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+class FlatForest:
+    """A fitted RandomForestClassifier compiled into contiguous node arrays.
+
+    All trees share one set of arrays (feature, threshold, left/right child,
+    class distribution as sklearn reports it). Leaves point to themselves, so
+    a batch of rows walks every tree in lock-step with a fixed number of
+    vectorized steps and no per-node branching. Missing values (NaN) follow
+    each split's ``missing_go_to_left`` direction, as in sklearn.
+    Probabilities are summed tree by tree in the same order as sklearn, so
+    predictions match it exactly.
+    """
+
+    def __init__(
+        self,
+        feature,
+        threshold,
+        left,
+        right,
+        value,
+        roots,
+        depth,
+        classes,
+        missing_left=None,
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.depth = int(depth)
+        self.classes = classes
+        # None for artifacts compiled before missing values were routed.
+        self.missing_left = missing_left
+        # children[2 * node + went_left] is the next node.
+        self.children = np.stack([right, left], axis=1).ravel()
+
+    @classmethod
+    def from_sklearn(cls, forest, trees=None, max_depth=None):
+        """Compile ``forest``, optionally keeping only some trees or levels.
+
+        ``trees`` lists estimator indices in the order they are summed.
+        Nodes at ``max_depth`` become leaves predicting their own class
+        distribution, and deeper nodes are dropped.
+        """
+        estimators = forest.estimators_
+        if trees is not None:
+            estimators = [estimators[i] for i in trees]
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        missing_lefts = []
+        offset = 0
+        depth = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            children_left = tree.children_left
+            children_right = tree.children_right
+            keep = np.ones(tree.node_count, dtype=bool)
+            tree_depth = tree.max_depth
+            if max_depth is not None and tree.max_depth > max_depth:
+                depths = _node_depths(tree)
+                keep = depths <= max_depth
+                children_left = np.where(depths < max_depth, children_left, -1)
+                children_right = np.where(depths < max_depth, children_right, -1)
+                tree_depth = max_depth
+
+            new_ids = np.cumsum(keep) - 1 + offset
+            is_leaf = children_left[keep] == -1
+            node_ids = new_ids[keep]
+            left = np.where(is_leaf, node_ids, new_ids[children_left[keep]])
+            right = np.where(is_leaf, node_ids, new_ids[children_right[keep]])
+            value = tree.value[keep, 0, :]
+            if _NORMALIZE_LEAF_VALUES:
+                normalizer = value.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                value = value / normalizer
+
+            features.append(np.where(is_leaf, 0, tree.feature[keep]))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold[keep]))
+            missing_lefts.append(
+                ~is_leaf & (tree.missing_go_to_left[keep] != 0)
+                if hasattr(tree, "missing_go_to_left")
+                else np.zeros(len(node_ids), dtype=bool)
+            )
+            lefts.append(left)
+            rights.append(right)
+            values.append(value)
+            roots.append(offset)
+            depth = max(depth, tree_depth)
+            offset += len(node_ids)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            depth=depth,
+            classes=np.asarray(forest.classes_),
+            missing_left=np.concatenate(missing_lefts),
+        )
+
+    def compact(self):
+        """Copy with the smallest dtypes that hold the arrays.
+
+        Thresholds are rounded down to float32, which keeps every split
+        identical; class distributions drop to float32 and may move
+        probabilities by rounding error.
+        """
+        index_dtype = np.int32 if len(self.feature) < 2**31 else np.int64
+        return FlatForest(
+            feature=self.feature.astype(np.min_scalar_type(self.feature.max())),
+            threshold=_round_down_float32(self.threshold),
+            left=self.left.astype(index_dtype),
+            right=self.right.astype(index_dtype),
+            value=self.value.astype(np.float32),
+            roots=self.roots.astype(index_dtype),
+            depth=self.depth,
+            classes=self.classes,
+            missing_left=self.missing_left,
+        )
+
+    @property
+    def classes_(self):
+        """sklearn-style alias of ``classes``."""
+        return self.classes
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def nbytes(self):
+        arrays = [self.feature, self.threshold, self.children, self.value]
+        if self.missing_left is not None:
+            arrays.append(self.missing_left)
+        return sum(array.nbytes for array in arrays)
+
+    def apply(self, X):
+        """Leaf node index reached in every tree, shape ``(n_rows, n_trees)``."""
+        # sklearn compares float32 inputs against float64 thresholds.
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if np.isinf(X).any():
+            raise ValueError("Input X contains infinity")
+        has_missing = np.isnan(X).any()
+        if has_missing and self.missing_left is None:
+            raise ValueError(
+                "Input X contains NaN, which this compiled forest cannot route; "
+                "recompile it with tools.compile_forest"
+            )
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offsets = (np.arange(n_rows) * n_features)[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (n_rows, self.n_trees))
+        for _ in range(self.depth):
+            values = flat_X[row_offsets + self.feature[nodes]]
+            go_left = values <= self.threshold[nodes]
+            if has_missing:
+                go_left |= np.isnan(values) & self.missing_left[nodes]
+            nodes = self.children[2 * nodes + go_left]
+        return nodes
+
+    def predict_proba(self, X):
+        """Mean class distribution over trees.
+
+        Rows are walked in blocks of ``_PREDICT_CHUNK_ROWS``, so working
+        memory stays bounded whatever the batch; the flat forest may be the
+        only model loaded.
+        """
+        X = np.asarray(X)
+        proba = np.empty((len(X), len(self.classes)), dtype=np.float64)
+        for start in range(0, len(X), _PREDICT_CHUNK_ROWS):
+            stop = start + _PREDICT_CHUNK_ROWS
+            leaves = self.apply(X[start:stop])
+            # Sequential accumulation over trees, as in sklearn's forest.
+            total = np.zeros((len(leaves), len(self.classes)), dtype=np.float64)
+            for tree in range(self.n_trees):
+                total += self.value[leaves[:, tree]]
+            proba[start:stop] = total / self.n_trees
+        return proba
+
+    def predict(self, X):
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def save(self, path):
+        optional = {}
+        if self.missing_left is not None:
+            optional["missing_left"] = self.missing_left
+        np.savez(
+            path,
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            value=self.value,
+            roots=self.roots,
+            depth=self.depth,
+            classes=self.classes,
+            **optional,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(**{key: data[key] for key in data.files})
@@ -0,0 +1,54 @@
+import joblib
+import numpy as np
+from config.config import NOT_COMPOSE_COLUMNS
+from utils.encoding_tables import EncodingTable
+
+PCA_COLUMNS = [f"PCA_{i+1}" for i in range(15)]
+FEATURE_COLUMNS = NOT_COMPOSE_COLUMNS + PCA_COLUMNS
+
+
+class FusedPreprocessor:
+    """Pre-fitted encoding, scaling and PCA working directly on NumPy arrays.
+
+    Built once from the individual sklearn/category_encoders artifacts, it
+    reproduces ``CorrosionClassifier``'s pandas preprocessing bit for bit
+    while skipping the per-call DataFrame construction and validation.
+    """
+
+    def __init__(self, models):
+        self.env_table = EncodingTable.from_target_encoder(
+            models["env_encoder"], "Environment"
+        )
+        self.uns_table = EncodingTable.from_target_encoder(models["uns_encoder"], "UNS")
+        self.temp_mean = float(models["temp_scaler"].mean_[0])
+        self.temp_scale = float(models["temp_scaler"].scale_[0])
+        self.pca_components = np.asarray(models["pca"].components_)
+        self.pca_mean = np.asarray(models["pca"].mean_).reshape(1, -1)
+        self.column_index = {col: i for i, col in enumerate(FEATURE_COLUMNS)}
+
+    def transform(self, envs, temps, concs, uns_inputs, embeddings):
+        """Return the ``(n, 19)`` classifier input in ``FEATURE_COLUMNS`` order."""
+        embeddings = np.asarray(embeddings)
+        features = np.empty((len(embeddings), len(FEATURE_COLUMNS)), dtype=np.float64)
+        idx = self.column_index
+
+        features[:, idx["Environment"]] = self.env_table.encode(envs)
+        features[:, idx["UNS"]] = self.uns_table.encode(uns_inputs)
+        temps = np.asarray(temps, dtype=np.float64)
+        features[:, idx["Temperature (deg C)"]] = (
+            temps - self.temp_mean
+        ) / self.temp_scale
+        features[:, idx["Concentration_clean"]] = np.asarray(concs, dtype=np.float64)
+
+        # Same operation order as sklearn's PCA.transform: project, then centre.
+        pca = embeddings @ self.pca_components.T
+        pca -= self.pca_mean @ self.pca_components.T
+        features[:, idx["PCA_1"] :] = pca
+        return features
+
+    def save(self, path):
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
@@ -1,81 +1,437 @@
+import os
+import threading
 import pandas as pd
 import numpy as np
 import joblib
-from utils.processors import clean_condition_text, get_cached_scibert_embedding
+from utils.processors import (
+    build_batch_frame,
+    clean_condition_text,
+    get_cached_scibert_embeddings,
+)
 from config.config import (
+    ARTIFACT_MMAP,
     BASE_PATH,
+    CLASSIFIER_VARIANT,
     MODEL_PATHS,
     NOT_COMPOSE_COLUMNS,
     CATEGORICAL_COLUMNS,
+    FLAT_FOREST_MAX_ROWS,
+    SWEEP_MAX_POINTS,
+    UNKNOWN_CATEGORY_POLICY,
+)
+from utils.artifacts import (
+    SHARED_ARTIFACT_KEYS,
+    load_mmap_artifact,
+    mmap_artifact_path,
 )
-from utils.vars import targets
-import streamlit as st
+from utils.encoding_tables import load_encoding_tables
+from utils.flat_forest import FlatForest
+from utils.pipeline import FEATURE_COLUMNS, PCA_COLUMNS, FusedPreprocessor
+from utils.registry import ModelVersion, get_registry_watcher
+from utils.vars import targets, uns_nums
+from contextlib import contextmanager
+from functools import lru_cache
+
+
+def load_classifier(path):
+    """Load the sklearn forest, or a compressed ``FlatForest`` variant (.npz)."""
+    if path.endswith(".npz"):
+        return FlatForest.load(path)
+    return joblib.load(path)
+
+
+def artifact_path(key):
+    """File ``load_artifact`` reads ``key`` from.
+
+    A selected ``CLASSIFIER_VARIANT`` always wins over the exported forest.
+    """
+    shared = key != "model" or not CLASSIFIER_VARIANT
+    if ARTIFACT_MMAP and shared and os.path.exists(mmap_artifact_path(key)):
+        return mmap_artifact_path(key)
+    return MODEL_PATHS[key]
+
+
+def load_artifact(key):
+    """Load one of ``SHARED_ARTIFACT_KEYS``, preferring its memory-mapped export."""
+    path = artifact_path(key)
+    if path != MODEL_PATHS[key]:
+        artifact = load_mmap_artifact(key)
+        if artifact is not None:
+            return artifact
+    if key == "model":
+        return load_classifier(MODEL_PATHS["model"])
+    return joblib.load(MODEL_PATHS[key])
+
+
+class _ActiveAttribute:
+    """Classifier attribute read from (and written to) the active ModelVersion."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, clf, owner=None):
+        return self if clf is None else getattr(clf.active, self.name)
+
+    def __set__(self, clf, value):
+        setattr(clf.active, self.name, value)
 
 
 class CorrosionClassifier:
+    models = _ActiveAttribute()
+    pipeline = _ActiveAttribute()
+    encoding_tables = _ActiveAttribute()
+    forest = _ActiveAttribute()
+
     def __init__(self):
-        self.models = self._load_models()
+        self._pinned = threading.local()
+        # With a published model registry the process-wide watcher owns the
+        # artifacts and hot-swaps new versions; otherwise use MODEL_PATHS.
+        self.registry_watcher = get_registry_watcher()
+        if self.registry_watcher is None:
+            models = self._load_models()
+            # A flat model (variant or memory-mapped export) needs no second copy.
+            if isinstance(models["model"], FlatForest):
+                forest = None
+            else:
+                forest = self._load_flat_forest()
+            self._static = ModelVersion(
+                models=models,
+                pipeline=self._load_pipeline(),
+                encoding_tables=self._load_encoding_tables(),
+                forest=forest,
+            )
+
+    @property
+    def active(self):
+        """The ModelVersion pinned by this thread's prediction, else the latest."""
+        pinned = getattr(self._pinned, "version", None)
+        if pinned is not None:
+            return pinned
+        if self.registry_watcher is not None:
+            return self.registry_watcher.active
+        return self._static
+
+    @property
+    def version(self):
+        return self.active.version
+
+    @contextmanager
+    def snapshot(self):
+        """Pin the active version so one prediction never mixes two versions."""
+        if getattr(self._pinned, "version", None) is not None:
+            yield self._pinned.version
+            return
+        self._pinned.version = self.active
+        try:
+            yield self._pinned.version
+        finally:
+            self._pinned.version = None
 
     @staticmethod
-    @st.cache_resource
+    @lru_cache(maxsize=None)
     def _load_models():
-        return {
-            "pca": joblib.load(MODEL_PATHS["pca"]),
-            "model": joblib.load(MODEL_PATHS["model"]),
-            "uns_encoder": joblib.load(MODEL_PATHS["uns_encoder"]),
-            "env_encoder": joblib.load(MODEL_PATHS["env_encoder"]),
-            "temp_scaler": joblib.load(MODEL_PATHS["temp_scaler"]),
-        }
+        return {key: load_artifact(key) for key in SHARED_ARTIFACT_KEYS}
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _load_pipeline():
+        """Fused NumPy preprocessing (see ``tools.build_fused_pipeline``), if built."""
+        if not os.path.exists(MODEL_PATHS["pipeline"]):
+            return None
+        return FusedPreprocessor.load(MODEL_PATHS["pipeline"])
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _load_encoding_tables():
+        """Precompiled category lookup tables (see ``tools.build_encoding_tables``)."""
+        if not os.path.exists(MODEL_PATHS["encoding_tables"]):
+            return None
+        return load_encoding_tables(MODEL_PATHS["encoding_tables"])
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _load_flat_forest():
+        """Compiled flat-array forest (see ``tools.compile_forest``), if built."""
+        if not os.path.exists(MODEL_PATHS["flat_forest"]):
+            return None
+        return FlatForest.load(MODEL_PATHS["flat_forest"])
 
     def preprocess_input(
         self, env: str, temp: float, conc: float, uns_input: str, comment: str
     ):
         """Preprocess inputs into model-ready format."""
-        # Build input DataFrame
-        input_df = pd.DataFrame(
+        if self.pipeline is not None:
+            features = self.pipeline.transform(
+                [env], [temp], [conc], [uns_input], self.embed_comments([comment])
+            )
+            return pd.DataFrame(features, columns=FEATURE_COLUMNS)
+        return self.preprocess_batch(
             [
                 {
                     "Environment": env,
-                    "Temperature (deg C)": temp,
-                    "Concentration_clean": conc,
+                    "Temperature": temp,
+                    "Concentration": conc,
                     "UNS": uns_input,
+                    "Comment": comment,
                 }
             ]
         )
 
-        # Encode categorical variables
-        input_df["Environment"] = self.models["env_encoder"].transform(
-            input_df["Environment"]
+    def preprocess_batch(self, records):
+        """Preprocess a DataFrame or list of records into model-ready format."""
+        batch_df = build_batch_frame(records)
+        if batch_df.empty:
+            return pd.DataFrame(columns=FEATURE_COLUMNS)
+
+        # Process condition text using SciBERT
+        scibert_embeddings = self.embed_comments(batch_df["Comment"])
+
+        if self.pipeline is not None:
+            features = self.pipeline.transform(
+                batch_df["Environment"],
+                batch_df["Temperature"],
+                batch_df["Concentration"],
+                batch_df["UNS"],
+                scibert_embeddings,
+            )
+            return pd.DataFrame(features, columns=FEATURE_COLUMNS)
+
+        # Build input DataFrame
+        input_df = pd.DataFrame(
+            {
+                "Environment": batch_df["Environment"],
+                "Temperature (deg C)": batch_df["Temperature"],
+                "Concentration_clean": batch_df["Concentration"],
+                "UNS": batch_df["UNS"],
+            }
         )
-        input_df["UNS"] = self.models["uns_encoder"].transform(input_df["UNS"])
+
+        # Encode categorical variables
+        if self.encoding_tables is not None:
+            for col in ("Environment", "UNS"):
+                input_df[col] = self.encoding_tables[col].encode(input_df[col])
+        else:
+            input_df["Environment"] = self.models["env_encoder"].transform(
+                input_df["Environment"]
+            )
+            input_df["UNS"] = self.models["uns_encoder"].transform(input_df["UNS"])
 
         # Scale temperature
         input_df["Temperature (deg C)"] = self.models["temp_scaler"].transform(
             input_df[["Temperature (deg C)"]]
         )
 
-        # Process condition text using SciBERT
-        cleaned_comment = clean_condition_text(comment)
-        scibert_embedding = np.squeeze(get_cached_scibert_embedding(cleaned_comment))
         scibert_df = pd.DataFrame(
-            [scibert_embedding],
-            columns=[f"scibert_{i}" for i in range(len(scibert_embedding))],
+            scibert_embeddings,
+            columns=[f"scibert_{i}" for i in range(scibert_embeddings.shape[1])],
         )
 
         # PCA transformation
         pca_emb = self.models["pca"].transform(scibert_df)
-        pca_df = pd.DataFrame(pca_emb, columns=[f"PCA_{i+1}" for i in range(15)])
+        pca_df = pd.DataFrame(pca_emb, columns=PCA_COLUMNS)
 
         # Final input
         full_input = pd.concat([input_df.reset_index(drop=True), pca_df], axis=1)
-        ordered_columns = NOT_COMPOSE_COLUMNS + [f"PCA_{i+1}" for i in range(15)]
-        full_input = full_input[ordered_columns]
+        full_input = full_input[FEATURE_COLUMNS]
 
         return full_input
 
+    def embed_comments(self, comments):
+        """SciBERT embeddings of raw comments, embedding each distinct text once."""
+        cleaned_comments = [clean_condition_text(comment) for comment in comments]
+        unique_comments, inverse = np.unique(
+            np.array(cleaned_comments, dtype=str), return_inverse=True
+        )
+        unique_embeddings = get_cached_scibert_embeddings(list(unique_comments))
+        return unique_embeddings[inverse.reshape(-1)]
+
+    def _classifier_for(self, n_rows):
+        """The compiled forest for small batches, the loaded model otherwise."""
+        if self.forest is not None and n_rows <= FLAT_FOREST_MAX_ROWS:
+            return self.forest
+        return self.models["model"]
+
+    def classify(self, full_input):
+        """Raw class labels for preprocessed rows."""
+        return self._classifier_for(len(full_input)).predict(full_input)
+
+    def classify_proba(self, full_input):
+        """Class probabilities for preprocessed rows, columns in ``classes_`` order."""
+        return self._classifier_for(len(full_input)).predict_proba(full_input)
+
     def predict(self, env: str, temp: float, conc: float, uns_input: str, comment: str):
         """Predict corrosion class and return it with the raw input."""
-        full_input = self.preprocess_input(env, temp, conc, uns_input, comment)
-        prediction = self.models["model"].predict(full_input)
+        with self.snapshot():
+            full_input = self.preprocess_input(env, temp, conc, uns_input, comment)
+            prediction = self.classify(full_input)
         predicted_class = targets.get(str(int(prediction[0])), "Unknown")
         return predicted_class, full_input
+
+    def predict_batch(self, records):
+        """Predict corrosion classes for a batch and return them with the raw input."""
+        with self.snapshot():
+            full_input = self.preprocess_batch(records)
+            if full_input.empty:
+                return [], full_input
+            prediction = self.classify(full_input)
+        predicted_classes = [targets.get(str(int(p)), "Unknown") for p in prediction]
+        return predicted_classes, full_input
+
+    def score_batch(self, records):
+        """Predicted class, confidence and error message for every record.
+
+        Under ``UNKNOWN_CATEGORY_POLICY="error"`` records with an environment
+        or alloy the encoders have never seen get an error message instead of
+        failing the whole batch. Returns one row per record, in order.
+        """
+        batch_df = build_batch_frame(records)
+        n_rows = len(batch_df)
+        labels = np.full(n_rows, "", dtype=object)
+        confidence = np.full(n_rows, np.nan)
+        errors = np.full(n_rows, "", dtype=object)
+        with self.snapshot():
+            if UNKNOWN_CATEGORY_POLICY == "error":
+                pipeline = self.pipeline or FusedPreprocessor(self.models)
+                for col, table in (
+                    ("Environment", pipeline.env_table),
+                    ("UNS", pipeline.uns_table),
+                ):
+                    unknown = ~batch_df[col].isin(table.index_of).to_numpy()
+                    errors[unknown] = f"Unknown {col}"
+            valid = errors == ""
+            if valid.any():
+                full_input = self.preprocess_batch(batch_df[valid])
+                proba = self.classify_proba(full_input)
+                classes = self._classifier_for(len(full_input)).classes_
+                best = proba.argmax(axis=1)
+                labels[valid] = [
+                    targets.get(str(int(p)), "Unknown") for p in classes[best]
+                ]
+                confidence[valid] = proba[np.arange(len(best)), best]
+        return pd.DataFrame(
+            {
+                "Predicted Corrosion Rate": labels,
+                "Confidence": confidence,
+                "Error": errors,
+            }
+        )
+
+    def _score_condition_grid(
+        self, pipeline, env, temp, conc, uns_input, comment, columns
+    ):
+        """Class probabilities for one condition with some features varied per row.
+
+        The condition is preprocessed once (one comment embedding and PCA
+        projection) and its feature row repeated for every grid point;
+        ``columns`` maps feature names to already-encoded per-row values.
+        Call inside ``snapshot()`` with ``pipeline`` from the same version.
+        """
+        row = pipeline.transform(
+            [env], [temp], [conc], [uns_input], self.embed_comments([comment])
+        )
+        n_rows = len(next(iter(columns.values())))
+        features = np.repeat(row, n_rows, axis=0)
+        for col, values in columns.items():
+            features[:, pipeline.column_index[col]] = values
+        full_input = pd.DataFrame(features, columns=FEATURE_COLUMNS)
+        proba = self.classify_proba(full_input)
+        return proba, self._classifier_for(n_rows).classes_
+
+    def screen_alloys(self, env, temp, conc, comment, alloys=uns_nums):
+        """Rank alloys for one condition, best (lowest corrosion class) first.
+
+        The comment is embedded and projected once; that feature row is
+        broadcast to every alloy, so only the UNS column differs between
+        rows. Under ``UNKNOWN_CATEGORY_POLICY="error"`` alloys the encoder
+        has never seen are left out instead of failing the whole screen.
+        """
+        with self.snapshot():
+            pipeline = self.pipeline or FusedPreprocessor(self.models)
+            alloys = list(alloys)
+            if UNKNOWN_CATEGORY_POLICY == "error":
+                alloys = [a for a in alloys if a in pipeline.uns_table.index_of]
+            if not alloys:
+                return pd.DataFrame(
+                    columns=["Alloy UNS", "Predicted Corrosion Rate", "Confidence"]
+                )
+            proba, classes = self._score_condition_grid(
+                pipeline,
+                env,
+                temp,
+                conc,
+                alloys[0],
+                comment,
+                {"UNS": pipeline.uns_table.encode(alloys)},
+            )
+
+        best = proba.argmax(axis=1)
+        results = pd.DataFrame(
+            {
+                "Alloy UNS": alloys,
+                "Predicted Corrosion Rate": [
+                    targets.get(str(int(p)), "Unknown") for p in classes[best]
+                ],
+                "Confidence": proba[np.arange(len(alloys)), best],
+                "_class": best,
+            }
+        )
+        results = results.sort_values(
+            ["_class", "Confidence", "Alloy UNS"],
+            ascending=[True, False, True],
+            kind="stable",
+        )
+        return results.drop(columns="_class").reset_index(drop=True)
+
+    def sweep(self, env, uns_input, comment, temperatures, concentrations):
+        """Classify a temperature x concentration grid for one environment and alloy.
+
+        Pass a single value on one axis for a 1D sweep. Every grid point is
+        scored in one batched call with the comment embedded once. Returns one
+        row per point with the predicted class, its index in ``classes_``
+        order (higher means faster corrosion) and its confidence.
+        """
+        temperatures = np.asarray(temperatures, dtype=np.float64).ravel()
+        concentrations = np.asarray(concentrations, dtype=np.float64).ravel()
+        for name, axis in [
+            ("temperatures", temperatures),
+            ("concentrations", concentrations),
+        ]:
+            if axis.size == 0:
+                raise ValueError(f"Sweep needs at least one value in {name}")
+            if not np.isfinite(axis).all():
+                raise ValueError(f"Sweep {name} must be finite numbers")
+        if temperatures.size * concentrations.size > SWEEP_MAX_POINTS:
+            raise ValueError(
+                f"Sweep of {temperatures.size * concentrations.size:,} points exceeds "
+                f"SWEEP_MAX_POINTS ({SWEEP_MAX_POINTS:,})"
+            )
+        temp_grid, conc_grid = np.meshgrid(temperatures, concentrations, indexing="ij")
+        temp_grid, conc_grid = temp_grid.ravel(), conc_grid.ravel()
+        with self.snapshot():
+            pipeline = self.pipeline or FusedPreprocessor(self.models)
+            proba, classes = self._score_condition_grid(
+                pipeline,
+                env,
+                temp_grid[0],
+                conc_grid[0],
+                uns_input,
+                comment,
+                {
+                    "Temperature (deg C)": (temp_grid - pipeline.temp_mean)
+                    / pipeline.temp_scale,
+                    "Concentration_clean": conc_grid,
+                },
+            )
+
+        best = proba.argmax(axis=1)
+        return pd.DataFrame(
+            {
+                "Temperature (°C)": temp_grid,
+                "Concentration (%)": conc_grid,
+                "Predicted Corrosion Rate": [
+                    targets.get(str(int(p)), "Unknown") for p in classes[best]
+                ],
+                "Class": best,
+                "Confidence": proba[np.arange(len(best)), best],
+            }
+        )
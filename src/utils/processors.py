@@ -1,10 +1,28 @@
 import re
+import os
+import json
 import numpy as np
 import pandas as pd
-from transformers import AutoTokenizer, AutoModel
-import torch
-import hashlib
-import streamlit as st
+import threading
+from config.config import (
+    MODEL_PATHS,
+    BATCH_INPUT_COLUMNS,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_MAX_LENGTH,
+    INFERENCE_INTEROP_THREADS,
+    SCIBERT_BACKEND,
+    SCIBERT_BACKENDS,
+    SCIBERT_EMBEDDING_DIM,
+    SCIBERT_MODEL_NAME,
+)
+from utils.artifacts import map_safetensors
+from utils.embedding_store import EmbeddingStore
+from utils.runtime import (
+    autotune_num_threads,
+    available_cores,
+    configure_torch_runtime,
+    configured_num_threads,
+)
 
 
 def clean_condition_text(text):
@@ -56,24 +74,322 @@ def build_final_input(
     return final_df.loc[:, ~final_df.columns.duplicated()]
 
 
-model_name = "allenai/scibert_scivocab_uncased"
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-model = AutoModel.from_pretrained(model_name)
+def build_batch_frame(records) -> pd.DataFrame:
+    """Normalize a DataFrame or list of records into the batch input schema."""
+    batch_df = pd.DataFrame(records)
+    if batch_df.empty and batch_df.columns.empty:
+        batch_df = pd.DataFrame(columns=BATCH_INPUT_COLUMNS)
+    if "Comment" not in batch_df.columns:
+        batch_df["Comment"] = ""
+    missing = [col for col in BATCH_INPUT_COLUMNS if col not in batch_df.columns]
+    if missing:
+        raise ValueError(f"Batch input is missing columns: {missing}")
+    batch_df = batch_df[BATCH_INPUT_COLUMNS].reset_index(drop=True)
+    batch_df["Comment"] = batch_df["Comment"].fillna("").astype(str)
+    return batch_df
+
+
+# SciBERT (and torch) are imported on the first embedding request so pages
+# that only need the text helpers in this module start instantly.
+_scibert = None
+_scibert_lock = threading.Lock()
+_text_encoder = None
+_text_encoder_lock = threading.Lock()
+_warmup_thread = None
+_embedding_store = None
+_embedding_pool = None
+
+
+def get_scibert():
+    """Load the SciBERT tokenizer and fp32 model once, on first use."""
+    global _scibert
+    if _scibert is None:
+        with _scibert_lock:
+            if _scibert is None:
+                _scibert = load_scibert()
+    return _scibert
+
+
+def load_scibert():
+    """Build a fresh SciBERT tokenizer and fp32 model.
+
+    A local bundle under ``MODEL_PATHS["scibert"]`` (see ``tools.bundle_scibert``)
+    is preferred and loaded without network access; otherwise the model is
+    fetched by hub name.
+    """
+    if _has_scibert_bundle():
+        return _load_scibert_bundle(MODEL_PATHS["scibert"])
+
+    from transformers import AutoTokenizer, AutoModel
+
+    tokenizer = AutoTokenizer.from_pretrained(SCIBERT_MODEL_NAME)
+    model = AutoModel.from_pretrained(SCIBERT_MODEL_NAME)
+    return tokenizer, model
+
+
+def _has_scibert_bundle():
+    return os.path.exists(os.path.join(MODEL_PATHS["scibert"], "model.safetensors"))
+
+
+def _load_scibert_bundle(bundle_dir):
+    """Build SciBERT from a local bundle, memory-mapping its safetensors weights."""
+    from transformers import AutoConfig, AutoModel, AutoTokenizer
+    from transformers.modeling_utils import no_init_weights
+
+    tokenizer = AutoTokenizer.from_pretrained(bundle_dir, local_files_only=True)
+    config = AutoConfig.from_pretrained(bundle_dir, local_files_only=True)
+    with no_init_weights():
+        model = AutoModel.from_config(config)
+    state_dict = map_safetensors(os.path.join(bundle_dir, "model.safetensors"))
+    model.load_state_dict(state_dict, assign=True)
+    model.eval()
+    return tokenizer, model
+
+
+def _load_scibert_tokenizer():
+    from transformers import AutoTokenizer
+
+    if _has_scibert_bundle():
+        return AutoTokenizer.from_pretrained(
+            MODEL_PATHS["scibert"], local_files_only=True
+        )
+    return AutoTokenizer.from_pretrained(SCIBERT_MODEL_NAME)
+
+
+def get_scibert_version(backend=SCIBERT_BACKEND):
+    """Identifier of the SciBERT weights in use, for keying derived artifacts."""
+    manifest_path = os.path.join(MODEL_PATHS["scibert"], "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        version = f"{manifest['source']}@{manifest['revision'] or manifest['version']}"
+    else:
+        version = SCIBERT_MODEL_NAME
+    # Non-default backends produce (slightly) different vectors.
+    return version if backend == "torch" else f"{version}+{backend}"
+
+
+# ------------------------
+# 🧠 Text Encoder Backends
+# ------------------------
+def build_text_encoder(backend):
+    """Return ``(tokenizer, forward, tensor_type)`` for an encoder backend.
+
+    ``forward`` maps tokenized inputs to a NumPy ``last_hidden_state``:
+    ``"torch"`` runs the fp32 model, ``"torch-int8"`` a dynamically
+    quantized copy of it, and ``"onnx"`` the graph exported by
+    ``tools.export_scibert_onnx`` under ONNX Runtime.
+    """
+    if backend in ("torch", "torch-int8"):
+        import torch
+
+        configure_torch_runtime()
+        if backend == "torch":
+            tokenizer, model = get_scibert()
+        else:
+            tokenizer, model = load_scibert()
+            model = torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+            )
+        forward = _torch_forward(model)
+        if configured_num_threads() == "auto":
+            sample = tokenizer(
+                ["seawater splash zone with chloride deposits"] * 8,
+                return_tensors="pt",
+                padding=True,
+            )
+            autotune_num_threads(forward, sample)
+        return tokenizer, forward, "pt"
+    if backend == "onnx":
+        return (
+            _load_scibert_tokenizer(),
+            _onnx_forward(MODEL_PATHS["scibert_onnx"]),
+            "np",
+        )
+    raise ValueError(
+        f"Unknown SciBERT backend {backend!r}; expected one of {SCIBERT_BACKENDS}"
+    )
+
+
+def _torch_forward(model):
+    import torch
+
+    def forward(inputs):
+        with torch.inference_mode():
+            return model(**inputs).last_hidden_state.numpy()
+
+    return forward
+
+
+def _onnx_forward(onnx_path):
+    try:
+        import onnxruntime as ort
+    except ImportError as e:
+        raise ImportError(
+            "The 'onnx' SciBERT backend needs onnxruntime: pip install onnxruntime"
+        ) from e
+
+    if not os.path.exists(onnx_path):
+        raise FileNotFoundError(
+            f"No ONNX encoder at {onnx_path}; run tools.export_scibert_onnx first"
+        )
+    options = ort.SessionOptions()
+    num_threads = configured_num_threads()
+    options.intra_op_num_threads = (
+        available_cores() if num_threads == "auto" else num_threads or 0
+    )
+    options.inter_op_num_threads = int(INFERENCE_INTEROP_THREADS or 0)
+    session = ort.InferenceSession(
+        onnx_path, sess_options=options, providers=["CPUExecutionProvider"]
+    )
+    input_names = [i.name for i in session.get_inputs()]
+
+    def forward(inputs):
+        feed = {name: inputs[name].astype(np.int64) for name in input_names}
+        return session.run(["last_hidden_state"], feed)[0]
+
+    return forward
+
+
+def get_text_encoder():
+    """Process-wide encoder for the backend selected by ``SCIBERT_BACKEND``."""
+    global _text_encoder
+    if _text_encoder is None:
+        with _text_encoder_lock:
+            if _text_encoder is None:
+                _text_encoder = build_text_encoder(SCIBERT_BACKEND)
+    return _text_encoder
+
+
+def warm_up_scibert(background=True):
+    """Load the text encoder ahead of the first request, by default on a thread."""
+    global _warmup_thread
+    if not background:
+        get_text_encoder()
+        return None
+    with _text_encoder_lock:
+        if _text_encoder is None and _warmup_thread is None:
+            _warmup_thread = threading.Thread(
+                target=get_text_encoder, name="scibert-warmup", daemon=True
+            )
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+def get_scibert_embeddings(texts, batch_size=EMBEDDING_BATCH_SIZE, encoder=None):
+    """Embed many texts with length-bucketed, dynamically padded forward passes."""
+    texts = list(texts)
+    embeddings = np.zeros((len(texts), SCIBERT_EMBEDDING_DIM), dtype=np.float32)
+    if not texts:
+        return embeddings
+
+    tokenizer, forward, tensor_type = encoder or get_text_encoder()
+
+    # Sort by token length so each batch holds texts of similar length and
+    # is padded only up to its own longest member.
+    lengths = tokenizer(
+        texts, truncation=True, max_length=EMBEDDING_MAX_LENGTH, return_length=True
+    )["length"]
+    order = np.argsort(lengths, kind="stable")
+
+    for start in range(0, len(order), batch_size):
+        bucket = order[start : start + batch_size]
+        inputs = tokenizer(
+            [texts[i] for i in bucket],
+            return_tensors=tensor_type,
+            padding=True,
+            truncation=True,
+            max_length=EMBEDDING_MAX_LENGTH,
+        )
+        hidden = forward(inputs)
+
+        # Mask-aware mean pooling so padding never changes a vector
+        mask = np.asarray(inputs["attention_mask"], dtype=np.float32)[..., None]
+        summed = (hidden * mask).sum(axis=1)
+        embeddings[bucket] = summed / np.maximum(mask.sum(axis=1), 1.0)
+
+    return embeddings
 
 
 def get_scibert_embedding(text):
-    inputs = tokenizer(text, return_tensors="pt", truncation=True, max_length=128)
-    outputs = model(**inputs)
-    return outputs.last_hidden_state.mean(dim=1).detach().numpy()
+    return get_scibert_embeddings([text])
+
+
+def get_embedding_store():
+    """Process-wide persistent embedding store for the loaded SciBERT model."""
+    global _embedding_store
+    if _embedding_store is None:
+        _embedding_store = EmbeddingStore(model_version=get_scibert_version())
+    return _embedding_store
 
 
-@st.cache_data
 def get_cached_scibert_embedding(text):
-    """Cache SciBERT embedding using text hash as a key."""
-    # Use a hash to ensure compatibility with caching
-    text_hash = hashlib.md5(text.encode()).hexdigest()
-    return get_scibert_embedding(text)
+    """Embedding of a single cleaned text, served from the persistent store."""
+    return get_cached_scibert_embeddings([text])
+
+
+def set_embedding_pool(pool):
+    """Send embeddings missing from the store to an ``EmbeddingPool``.
+
+    Pass ``None`` to compute them in this process again.
+    """
+    global _embedding_pool
+    _embedding_pool = pool
+
+
+def get_cached_scibert_embeddings(texts):
+    """Embed cleaned texts, computing only those missing from the store."""
+    store = get_embedding_store()
+    embeddings, missing = store.get_many(texts)
+    if missing:
+        missing_texts = [texts[i] for i in missing]
+        if _embedding_pool is not None:
+            computed = _embedding_pool.embed(missing_texts)
+        else:
+            computed = get_scibert_embeddings(missing_texts)
+        embeddings[missing] = computed
+        store.put_many(missing_texts, computed)
+    return embeddings
 
 
 def remove_think_tags(text):
     return re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL)
+
+
+def _partial_tag_length(text, tag):
+    """Length of the longest suffix of ``text`` that starts ``tag``."""
+    for length in range(min(len(tag) - 1, len(text)), 0, -1):
+        if tag.startswith(text[-length:]):
+            return length
+    return 0
+
+
+def strip_think_tags(chunks):
+    """Streaming ``remove_think_tags``: yield text with think blocks removed.
+
+    Text is passed on as soon as it cannot be part of a ``<think>`` block, so
+    besides the block itself only a possible partial tag is held back. The
+    joined output equals ``remove_think_tags`` of the joined input, including
+    an unclosed block, which is emitted as-is when the stream ends.
+    """
+    open_tag, close_tag = "<think>", "</think>"
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            if buffer.startswith(open_tag):
+                end = buffer.find(close_tag, len(open_tag))
+                if end == -1:
+                    break  # wait for the rest of the block
+                buffer = buffer[end + len(close_tag) :]
+                continue
+            start = buffer.find(open_tag)
+            if start == -1:
+                start = len(buffer) - _partial_tag_length(buffer, open_tag)
+            if start:
+                yield buffer[:start]
+                buffer = buffer[start:]
+            if not buffer.startswith(open_tag):
+                break
+    if buffer:
+        yield buffer
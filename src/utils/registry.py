@@ -0,0 +1,281 @@
+import datetime
+import json
+import os
+import shutil
+import threading
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from config.config import (
+    ARTIFACT_MMAP,
+    BATCH_INPUT_COLUMNS,
+    MODEL_REGISTRY_DIR,
+    MODEL_RELOAD_INTERVAL_S,
+)
+from utils.artifacts import SHARED_ARTIFACT_KEYS, file_sha256
+from utils.encoding_tables import EncodingTable
+from utils.flat_forest import FlatForest
+from utils.pipeline import FEATURE_COLUMNS, FusedPreprocessor
+
+CURRENT_POINTER = "CURRENT"
+
+
+class ModelVersion:
+    """One consistent set of loaded artifacts, swapped in and out as a whole."""
+
+    def __init__(
+        self, models, pipeline=None, encoding_tables=None, forest=None, version=None
+    ):
+        self.models = models
+        self.pipeline = pipeline
+        self.encoding_tables = encoding_tables
+        self.forest = forest
+        self.version = version
+        # Set on first use by utils.corrosion_map.model_fingerprint.
+        self.fingerprint = None
+
+    def warm_up(self):
+        """Run a synthetic row through every component before serving."""
+        n_dims = self.models["pca"].components_.shape[1]
+        embedding = np.zeros((1, n_dims))
+        X = pd.DataFrame(np.zeros((1, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+        if self.pipeline is not None:
+            X.iloc[:, :] = self.pipeline.transform(
+                self.pipeline.env_table.categories[:1],
+                [25.0],
+                [0.0],
+                self.pipeline.uns_table.categories[:1],
+                embedding,
+            )
+        self.models["pca"].transform(
+            pd.DataFrame(embedding, columns=self.models["pca"].feature_names_in_)
+        )
+        self.models["model"].predict(X)
+        if self.forest is not None:
+            self.forest.predict(X.to_numpy())
+
+
+def feature_schema(models):
+    """The input and feature layout a set of artifacts was built for."""
+    model = models["model"]
+    classes = getattr(model, "classes_", getattr(model, "classes", []))
+    return {
+        "input_columns": BATCH_INPUT_COLUMNS,
+        "feature_columns": FEATURE_COLUMNS,
+        "embedding_dim": int(models["pca"].components_.shape[1]),
+        "classes": np.asarray(classes).tolist(),
+    }
+
+
+class ModelRegistry:
+    """Versioned artifact directories with checksummed manifests.
+
+    Each ``<root>/<version>/`` holds one joblib file per artifact and a
+    ``manifest.json`` with their sha256 checksums and the feature schema.
+    ``<root>/CURRENT`` names the version to serve and is replaced atomically.
+    """
+
+    def __init__(self, root=MODEL_REGISTRY_DIR):
+        self.root = root
+
+    def version_dir(self, version):
+        return os.path.join(self.root, version)
+
+    def versions(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, "manifest.json"))
+        )
+
+    def current_version(self):
+        try:
+            with open(os.path.join(self.root, CURRENT_POINTER), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def manifest(self, version):
+        path = os.path.join(self.version_dir(version), "manifest.json")
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def publish(self, version, models, source=None):
+        """Write ``models`` (keyed as ``SHARED_ARTIFACT_KEYS``) as a new version.
+
+        The fused pipeline, encoding tables and compiled forest are derived
+        here, so they always match the version's encoders and classifier. The
+        version directory appears only once fully written.
+        """
+        out_dir = self.version_dir(version)
+        if os.path.exists(out_dir):
+            raise FileExistsError(f"Model version {version} already exists")
+        feature_names = getattr(models["model"], "feature_names_in_", None)
+        if feature_names is not None and list(feature_names) != FEATURE_COLUMNS:
+            raise ValueError(f"Classifier features {list(feature_names)} do not match")
+
+        artifacts = {key: models[key] for key in SHARED_ARTIFACT_KEYS}
+        artifacts["pipeline"] = FusedPreprocessor(models)
+        artifacts["encoding_tables"] = {
+            col: EncodingTable.from_target_encoder(models[key], col)
+            for key, col in [("env_encoder", "Environment"), ("uns_encoder", "UNS")]
+        }
+        if not isinstance(models["model"], FlatForest):
+            artifacts["flat_forest"] = FlatForest.from_sklearn(models["model"])
+
+        staging = f"{out_dir}.tmp-{os.getpid()}"
+        os.makedirs(staging)
+        try:
+            files = {}
+            for key, artifact in artifacts.items():
+                joblib.dump(artifact, os.path.join(staging, f"{key}.joblib"))
+                files[key] = f"{key}.joblib"
+            manifest = {
+                "version": version,
+                "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "source": source,
+                "feature_schema": feature_schema(models),
+                "artifacts": {
+                    key: {
+                        "file": name,
+                        "sha256": file_sha256(os.path.join(staging, name)),
+                    }
+                    for key, name in files.items()
+                },
+            }
+            with open(
+                os.path.join(staging, "manifest.json"), "w", encoding="utf-8"
+            ) as f:
+                json.dump(manifest, f, indent=2)
+            os.rename(staging, out_dir)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return out_dir
+
+    def activate(self, version):
+        """Point ``CURRENT`` at ``version`` with an atomic rename."""
+        self.verify(version)
+        pointer = os.path.join(self.root, CURRENT_POINTER)
+        staging = f"{pointer}.tmp-{os.getpid()}"
+        with open(staging, "w", encoding="utf-8") as f:
+            f.write(version + "\n")
+        os.replace(staging, pointer)
+
+    def verify(self, version):
+        """Check checksums and feature schema; return the manifest."""
+        manifest = self.manifest(version)
+        schema = manifest["feature_schema"]
+        if schema["feature_columns"] != FEATURE_COLUMNS:
+            raise ValueError(
+                f"Model version {version} expects features {schema['feature_columns']}"
+            )
+        if schema["input_columns"] != BATCH_INPUT_COLUMNS:
+            raise ValueError(
+                f"Model version {version} expects inputs {schema['input_columns']}"
+            )
+        for key, entry in manifest["artifacts"].items():
+            path = os.path.join(self.version_dir(version), entry["file"])
+            if file_sha256(path) != entry["sha256"]:
+                raise ValueError(f"Checksum mismatch for {key} in version {version}")
+        return manifest
+
+    def load(self, version):
+        """Verify and load one version as a :class:`ModelVersion`."""
+        manifest = self.verify(version)
+        mmap_mode = "r" if ARTIFACT_MMAP else None
+        loaded = {
+            key: joblib.load(
+                os.path.join(self.version_dir(version), entry["file"]),
+                mmap_mode=mmap_mode,
+            )
+            for key, entry in manifest["artifacts"].items()
+        }
+        return ModelVersion(
+            models={key: loaded[key] for key in SHARED_ARTIFACT_KEYS},
+            pipeline=loaded.get("pipeline"),
+            encoding_tables=loaded.get("encoding_tables"),
+            forest=loaded.get("flat_forest"),
+            version=version,
+        )
+
+
+class RegistryWatcher:
+    """Serves the registry's current version and hot-swaps in new ones.
+
+    A background thread polls ``CURRENT``; a new version is verified,
+    loaded and warmed on that thread, then published by replacing
+    ``active`` in one assignment. Predictions that pinned the old version
+    finish on it undisturbed.
+    """
+
+    def __init__(self, registry, interval=MODEL_RELOAD_INTERVAL_S):
+        self.registry = registry
+        self.interval = interval
+        self.active = self._load(registry.current_version())
+        self.swaps = 0
+        self.last_error = None
+        self._failed_version = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _load(self, version):
+        model_version = self.registry.load(version)
+        model_version.warm_up()
+        return model_version
+
+    def poll(self):
+        """Swap in the current version if it changed; return True on a swap."""
+        with self._lock:
+            version = self.registry.current_version()
+            if version in (None, self.active.version, self._failed_version):
+                return False
+            try:
+                candidate = self._load(version)
+            except Exception as e:
+                self._failed_version = version
+                self.last_error = f"{version}: {type(e).__name__}: {e}"
+                return False
+            self.active = candidate
+            self.swaps += 1
+            self.last_error = self._failed_version = None
+            return True
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            self.poll()
+
+    def start(self):
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(
+                target=self._watch, name="model-registry-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stats(self):
+        return {
+            "version": self.active.version,
+            "swaps": self.swaps,
+            "last_error": self.last_error,
+        }
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def get_registry_watcher():
+    """Process-wide watcher, or None when the registry has no current version."""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            registry = ModelRegistry()
+            if registry.current_version() is None:
+                return None
+            _watcher = RegistryWatcher(registry).start()
+        return _watcher
@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+from config.config import INFERENCE_INTEROP_THREADS, INFERENCE_NUM_THREADS
+
+_configured = False
+_configure_lock = threading.Lock()
+_pinned_threads = None
+
+
+def available_cores():
+    """CPU cores this process may run on (respects affinity/cgroup pinning)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def configured_num_threads():
+    """Intra-op thread count from ``INFERENCE_NUM_THREADS``.
+
+    Returns ``None`` when unset (library default) and ``"auto"`` when the
+    count should be picked by :func:`autotune_num_threads`. A process pinned
+    with :func:`pin_to_cores` uses one thread per pinned core instead.
+    """
+    if _pinned_threads is not None:
+        return _pinned_threads
+    if INFERENCE_NUM_THREADS in ("", "auto"):
+        return INFERENCE_NUM_THREADS or None
+    return int(INFERENCE_NUM_THREADS)
+
+
+def pin_to_cores(cores):
+    """Restrict this process to ``cores`` and size inference thread pools to match.
+
+    Call before the text encoder is built, e.g. in a pool worker's initializer.
+    """
+    global _pinned_threads
+    cores = sorted(cores)
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    _pinned_threads = len(cores)
+
+
+def configure_torch_runtime():
+    """Pin torch intra/inter-op thread counts once per process."""
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        import torch
+
+        if INFERENCE_INTEROP_THREADS:
+            try:
+                torch.set_num_interop_threads(int(INFERENCE_INTEROP_THREADS))
+            except RuntimeError:
+                pass  # inter-op pool already started; it can only be set once
+        num_threads = configured_num_threads()
+        if isinstance(num_threads, int):
+            torch.set_num_threads(num_threads)
+        _configured = True
+
+
+def thread_candidates(max_threads=None):
+    """Powers of two up to the core count, plus the core count itself."""
+    max_threads = max_threads or available_cores()
+    candidates = {max_threads}
+    n = 1
+    while n < max_threads:
+        candidates.add(n)
+        n *= 2
+    return sorted(candidates)
+
+
+def autotune_num_threads(forward, inputs, candidates=None, repeats=3):
+    """Time ``forward(inputs)`` at each thread count and keep the fastest.
+
+    Returns the chosen count and the mean seconds per call for every candidate.
+    """
+    import torch
+
+    timings = {}
+    for num_threads in candidates or thread_candidates():
+        torch.set_num_threads(num_threads)
+        forward(inputs)  # warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            forward(inputs)
+        timings[num_threads] = (time.perf_counter() - start) / repeats
+    best = min(timings, key=timings.get)
+    torch.set_num_threads(best)
+    return best, timings
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+SWEEP_AXES = ["Temperature (°C)", "Concentration (%)"]
+
+
+def find_crossings(sweep, along="Temperature (°C)"):
+    """Where the predicted class changes along one axis of a sweep.
+
+    For every value of the other axis, each pair of neighbouring grid points
+    with different classes gives one crossing. The boundary lies between the
+    two points, so both are reported along with their midpoint; a denser
+    grid narrows the bracket.
+    """
+    other = next(axis for axis in SWEEP_AXES if axis != along)
+    ordered = sweep.sort_values([other, along], kind="stable").reset_index(drop=True)
+    lines = ordered[other].to_numpy()
+    classes = ordered["Class"].to_numpy()
+    steps = np.flatnonzero((lines[1:] == lines[:-1]) & (classes[1:] != classes[:-1]))
+    before, after = ordered.iloc[steps], ordered.iloc[steps + 1]
+    return pd.DataFrame(
+        {
+            other: before[other].to_numpy(),
+            "From": before["Predicted Corrosion Rate"].to_numpy(),
+            "To": after["Predicted Corrosion Rate"].to_numpy(),
+            "Direction": np.where(
+                after["Class"].to_numpy() > before["Class"].to_numpy(),
+                "worse",
+                "better",
+            ),
+            "Last point before": before[along].to_numpy(),
+            "First point after": after[along].to_numpy(),
+            "Crossing at": (before[along].to_numpy() + after[along].to_numpy()) / 2,
+        }
+    )
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app imports its packages from src/ (utils, chat, config, ...).
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from category_encoders import TargetEncoder
+from utils.encoding_tables import (
+    EncodingTable,
+    load_encoding_tables,
+    save_encoding_tables,
+)
+
+CATEGORIES = {
+    "Environment": ["Seawater", "Brine", "Acetic Acid"],
+    "UNS": ["S31600", "N06625", "C70600", "G10200"],
+}
+
+
+@pytest.fixture(scope="module")
+def encoders():
+    """One fitted encoder per column, as the app's artifacts are."""
+    rng = np.random.default_rng(0)
+    y = pd.Series(rng.random(200))
+    return {
+        col: TargetEncoder(cols=[col]).fit(
+            pd.DataFrame({col: rng.choice(categories, len(y))}), y
+        )
+        for col, categories in CATEGORIES.items()
+    }
+
+
+@pytest.fixture(scope="module")
+def tables(encoders):
+    return {
+        col: EncodingTable.from_target_encoder(encoder, col)
+        for col, encoder in encoders.items()
+    }
+
+
+def test_tables_match_the_encoder(encoders, tables):
+    for col, table in tables.items():
+        # Every category, an unseen label and a missing value.
+        checked = table.verify(encoders[col], extra_categories=["Never seen"])
+        assert checked == len(CATEGORIES[col]) + 3
+
+
+def test_encode_matches_transform_for_a_batch(encoders, tables):
+    labels = ["Brine", "Seawater", "Brine", None, "Vinegar", "Acetic Acid"]
+    expected = (
+        encoders["Environment"]
+        .transform(pd.DataFrame({"Environment": labels}))["Environment"]
+        .to_numpy()
+    )
+    actual = tables["Environment"].encode(labels, unknown="prior")
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_unknown_categories_raise_under_error_policy(tables):
+    table = tables["UNS"]
+    with pytest.raises(ValueError, match=r"Unknown UNS categories: \['X1', 'X2'\]"):
+        table.index(["S31600", "X2", "X1", "X2"], unknown="error")
+    # Missing values are not unknown categories.
+    indices = table.index(["S31600", None], unknown="error")
+    assert indices[1] == table.missing_index
+
+
+def test_save_and_load_round_trip(tables, tmp_path):
+    path = tmp_path / "tables.npz"
+    save_encoding_tables(tables.values(), path)
+    loaded = load_encoding_tables(path)
+    assert sorted(loaded) == ["Environment", "UNS"]
+    for col, table in tables.items():
+        assert loaded[col].categories == table.categories
+        np.testing.assert_array_equal(loaded[col].values, table.values)
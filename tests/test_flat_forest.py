@@ -0,0 +1,129 @@
+import copy
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from utils.flat_forest import FlatForest
+
+
+def threshold_rows(forest, n_features, seed=1):
+    """Rows with one feature set exactly to a split threshold of the forest."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(400, n_features))
+    splits = [
+        (tree.tree_.feature[node], tree.tree_.threshold[node])
+        for tree in forest.estimators_
+        for node in np.flatnonzero(tree.tree_.children_left != -1)
+        # Splits that only separate missing values have an infinite threshold.
+        if np.isfinite(tree.tree_.threshold[node])
+    ]
+    for row, i in zip(X, rng.integers(len(splits), size=len(X))):
+        feature, threshold = splits[i]
+        row[feature] = threshold
+    return X
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 6))
+    y = (X[:, 0] + X[:, 1] * X[:, 2] > 0).astype(int) + (X[:, 3] > 1)
+    X[rng.random(X.shape) < 0.1] = np.nan  # trains missing_go_to_left
+    forest = RandomForestClassifier(n_estimators=25, random_state=0).fit(X, y)
+    X_test = rng.normal(size=(500, 6))
+    with_nan = X_test.copy()
+    with_nan[rng.random(X_test.shape) < 0.3] = np.nan
+    X_test = np.vstack([X_test, with_nan, threshold_rows(forest, 6)])
+    return forest, X_test
+
+
+def test_predict_proba_matches_sklearn(data):
+    forest, X = data
+    flat = FlatForest.from_sklearn(forest)
+    np.testing.assert_array_equal(flat.predict_proba(X), forest.predict_proba(X))
+    np.testing.assert_array_equal(flat.predict(X), forest.predict(X))
+
+
+def test_chunked_predict_proba_matches_sklearn(data, monkeypatch):
+    forest, X = data
+    monkeypatch.setattr("utils.flat_forest._PREDICT_CHUNK_ROWS", 64)
+    flat = FlatForest.from_sklearn(forest)
+    np.testing.assert_array_equal(flat.predict_proba(X), forest.predict_proba(X))
+
+
+def test_compact_keeps_every_split(data):
+    forest, X = data
+    flat = FlatForest.from_sklearn(forest)
+    compact = flat.compact()
+    assert compact.threshold.dtype == np.float32
+    assert compact.nbytes < flat.nbytes
+    np.testing.assert_array_equal(compact.apply(X), flat.apply(X))
+    np.testing.assert_array_equal(compact.predict(X), forest.predict(X))
+    np.testing.assert_allclose(
+        compact.predict_proba(X), forest.predict_proba(X), atol=1e-6
+    )
+
+
+def test_save_and_load_round_trip(data, tmp_path):
+    forest, X = data
+    path = tmp_path / "flat.npz"
+    FlatForest.from_sklearn(forest).compact().save(path)
+    loaded = FlatForest.load(path)
+    np.testing.assert_array_equal(loaded.predict(X), forest.predict(X))
+
+
+def test_tree_subset_matches_sklearn_subset(data):
+    forest, X = data
+    trees = [3, 0, 7, 12]
+    subset = copy.copy(forest)
+    subset.estimators_ = [forest.estimators_[i] for i in trees]
+    subset.n_estimators = len(trees)
+    flat = FlatForest.from_sklearn(forest, trees=trees)
+    np.testing.assert_array_equal(flat.predict_proba(X), subset.predict_proba(X))
+
+
+def test_max_depth_stops_at_the_depth_limit(data):
+    forest, X = data
+    # Trees compare float32 inputs, as sklearn does.
+    X = X[np.isfinite(X).all(axis=1)].astype(np.float32)
+    max_depth = 3
+    flat = FlatForest.from_sklearn(forest, max_depth=max_depth)
+    assert flat.depth == max_depth
+
+    expected = np.zeros((len(X), len(forest.classes_)))
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        node = np.zeros(len(X), dtype=np.intp)
+        for _ in range(max_depth):
+            inner = tree.children_left[node] != -1
+            go_left = X[np.arange(len(X)), tree.feature[node]] <= tree.threshold[node]
+            child = np.where(
+                go_left, tree.children_left[node], tree.children_right[node]
+            )
+            node = np.where(inner, child, node)
+        expected += tree.value[node, 0, :]
+    np.testing.assert_allclose(
+        flat.predict_proba(X), expected / forest.n_estimators, rtol=1e-12
+    )
+
+
+def test_max_depth_above_the_trees_changes_nothing(data):
+    forest, X = data
+    deepest = max(estimator.tree_.max_depth for estimator in forest.estimators_)
+    flat = FlatForest.from_sklearn(forest, max_depth=deepest)
+    np.testing.assert_array_equal(flat.predict_proba(X), forest.predict_proba(X))
+
+
+def test_infinite_input_is_rejected(data):
+    forest, X = data
+    X = X[:5].copy()
+    X[0, 0] = np.inf
+    with pytest.raises(ValueError, match="infinity"):
+        FlatForest.from_sklearn(forest).predict(X)
+
+
+def test_nan_needs_missing_value_directions(data):
+    forest, X = data
+    flat = FlatForest.from_sklearn(forest)
+    flat.missing_left = None  # as loaded from an older artifact
+    with pytest.raises(ValueError, match="recompile"):
+        flat.predict(X[500:510])
@@ -0,0 +1,78 @@
+import logging
+import sqlite3
+import pytest
+from chat import response_cache
+from chat.response_cache import LLMResponseCache, get_response_cache, prompt_key
+
+
+@pytest.fixture
+def fresh_cache_singleton(monkeypatch):
+    monkeypatch.setattr(response_cache, "_response_cache", None)
+    monkeypatch.setattr(response_cache, "_response_cache_failed", False)
+
+
+def test_hits_and_misses_are_counted_at_lookup(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "responses.sqlite3"))
+    assert cache.get("k", ["m1", "m2"]) is None
+    cache.put("m2", "k", "answer")
+    assert cache.get("k", ["m1", "m2"]) == "answer"
+    stats = cache.stats()
+    assert (stats["lookups"], stats["hits"], stats["misses"]) == (2, 1, 1)
+    assert stats["models"] == {"m2": {"entries": 1, "hits": 1}}
+
+
+def test_prompt_key_ignores_case_spacing_and_number_format():
+    template = "Environment {env} at {temp}"
+    assert prompt_key(template, {"env": " Sea  Water", "temp": 25}) == prompt_key(
+        template, {"env": "sea water", "temp": 25.0}
+    )
+    assert prompt_key(template, {"env": "sea water", "temp": 25}) != prompt_key(
+        template + ".", {"env": "sea water", "temp": 25}
+    )
+
+
+def test_unwritable_cache_path_disables_the_cache(
+    monkeypatch, tmp_path, caplog, fresh_cache_singleton
+):
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    path = str(blocker / "llm_cache" / "responses.sqlite3")
+    monkeypatch.setattr(response_cache, "LLM_CACHE_PATH", path)
+    with caplog.at_level(logging.WARNING, logger="chat.response_cache"):
+        assert get_response_cache() is None
+        assert get_response_cache() is None  # not retried on every call
+    assert len(caplog.records) == 1
+    assert "cache disabled" in caplog.records[0].getMessage()
+
+
+def test_corrupt_cache_file_disables_the_cache(
+    monkeypatch, tmp_path, fresh_cache_singleton
+):
+    path = tmp_path / "responses.sqlite3"
+    path.write_bytes(b"this is not a database" * 100)
+    monkeypatch.setattr(response_cache, "LLM_CACHE_PATH", str(path))
+    assert get_response_cache() is None
+
+
+def test_database_errors_after_opening_fail_open(tmp_path, caplog):
+    path = tmp_path / "responses.sqlite3"
+    cache = LLMResponseCache(str(path))
+    cache.put("m", "k", "answer")
+    # The file turns read-only under the cache (chmod does not bind root).
+    cache._local.connection = sqlite3.connect(
+        f"file:{path}?mode=ro", uri=True, isolation_level=None
+    )
+    with caplog.at_level(logging.WARNING, logger="chat.response_cache"):
+        assert cache.get("k", ["m"]) is None
+        cache.put("m", "k2", "answer")
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("lookup failed" in message for message in messages)
+    assert any("write skipped" in message for message in messages)
+
+
+def test_unreadable_stats_fail_open(tmp_path, caplog):
+    cache = LLMResponseCache(str(tmp_path / "responses.sqlite3"))
+    cache._connection().close()
+    with caplog.at_level(logging.WARNING, logger="chat.response_cache"):
+        assert cache.stats() is None
+    assert "stats unavailable" in caplog.records[0].getMessage()
@@ -0,0 +1,105 @@
+import json
+import os
+import sys
+import pandas as pd
+import pytest
+from tools import score_csv
+
+
+class FakeClassifier:
+    """Scores a record from its temperature; can fail at a given call."""
+
+    def __init__(self, fail_at=None):
+        self.calls = 0
+        self.fail_at = fail_at
+
+    def score_batch(self, records):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise KeyboardInterrupt  # the run is interrupted mid-file
+        temps = records["Temperature"].to_numpy()
+        return pd.DataFrame(
+            {
+                "Predicted Corrosion Rate": [
+                    "hot" if t > 50 else "cold" for t in temps
+                ],
+                "Confidence": temps / 100,
+                "Error": "",
+            }
+        )
+
+
+@pytest.fixture
+def input_csv(tmp_path):
+    path = tmp_path / "records.csv"
+    pd.DataFrame(
+        {
+            "ID": range(35),
+            "Environment": "Seawater",
+            "Temperature": [str(t) for t in range(0, 105, 3)],
+            "Concentration": "10",
+            "UNS": "S31600",
+            "Comment": "",
+        }
+    ).to_csv(path, index=False)
+    return path
+
+
+def run(monkeypatch, clf, *args):
+    monkeypatch.setattr(score_csv, "_init_worker", lambda: None)
+    monkeypatch.setattr(score_csv, "_clf", clf)
+    monkeypatch.setattr(sys, "argv", ["score_csv", *map(str, args)])
+    score_csv.main()
+
+
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+def test_interrupted_run_resumes_from_finished_chunks(
+    monkeypatch, tmp_path, input_csv, output_format
+):
+    output = tmp_path / f"scored.{output_format}"
+    args = [input_csv, "-o", output, "--chunk-rows", 10]
+    with pytest.raises(KeyboardInterrupt):
+        run(monkeypatch, FakeClassifier(fail_at=3), *args)
+    parts_dir = f"{output}.parts"
+    assert score_csv.open_checkpoint(input_csv, parts_dir, 10, output_format) == {
+        0,
+        1,
+    }
+    assert not output.exists()
+
+    resumed = FakeClassifier()
+    run(monkeypatch, resumed, *args)
+    assert resumed.calls == 2  # only chunks 2 and 3
+    assert not os.path.exists(parts_dir)
+
+    expected = tmp_path / f"expected.{output_format}"
+    run(monkeypatch, FakeClassifier(), input_csv, "-o", expected)
+    actual = score_csv.read_part(output, output_format)
+    pd.testing.assert_frame_equal(actual, score_csv.read_part(expected, output_format))
+    assert actual["ID"].astype(int).tolist() == list(range(35))
+
+
+def test_checkpoint_of_another_input_is_refused(tmp_path, input_csv):
+    parts_dir = tmp_path / "scored.csv.parts"
+    assert score_csv.open_checkpoint(input_csv, parts_dir, 10, "csv") == set()
+    with open(parts_dir / "checkpoint.json") as f:
+        assert json.load(f)["chunk_rows"] == 10
+    with pytest.raises(SystemExit, match="--restart"):
+        score_csv.open_checkpoint(input_csv, parts_dir, 20, "csv")
+    with open(input_csv, "a") as f:
+        f.write("35,Seawater,1,1,S31600,\n")
+    with pytest.raises(SystemExit, match="different settings or input"):
+        score_csv.open_checkpoint(input_csv, parts_dir, 10, "csv")
+
+
+def test_restart_discards_an_earlier_partial_run(monkeypatch, tmp_path, input_csv):
+    output = tmp_path / "scored.csv"
+    args = [input_csv, "-o", output, "--chunk-rows", 10]
+    with pytest.raises(KeyboardInterrupt):
+        run(monkeypatch, FakeClassifier(fail_at=2), *args)
+    with open(input_csv, "a") as f:
+        f.write("35,Seawater,1,1,S31600,\n")
+    clf = FakeClassifier()
+    run(monkeypatch, clf, *args, "--restart")
+    assert clf.calls == 4
+    assert len(pd.read_csv(output)) == 36
@@ -0,0 +1,46 @@
+import itertools
+import pytest
+from utils.processors import remove_think_tags, strip_think_tags
+
+TEXTS = [
+    "plain answer",
+    "<think>reasoning</think>\n- point 1\n- point 2",
+    "before <think>a</think> middle <think>b</think> after",
+    "a < b and c <th but not a tag",
+    "<think>nested <think> open</think> rest",
+    "<think></think>",
+    "answer <think>never closed",
+    "<thinking> is not the tag </think>",
+    "ends with a partial <thi",
+    "",
+]
+
+
+def joined(chunks):
+    return "".join(strip_think_tags(chunks))
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_every_split_into_three_chunks_matches_remove_think_tags(text):
+    for i, j in itertools.combinations_with_replacement(range(len(text) + 1), 2):
+        chunks = [text[:i], text[i:j], text[j:]]
+        assert joined(chunks) == remove_think_tags(text), chunks
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_character_chunks_match_remove_think_tags(text):
+    assert joined(list(text)) == remove_think_tags(text)
+
+
+def test_text_outside_a_block_is_not_held_back():
+    def chunks():
+        yield "<think>plan</think>First "
+        yield "<th"  # could still start a block
+        received.append(True)
+        yield "ink>x</think>rest"
+
+    received = []
+    stream = strip_think_tags(chunks())
+    assert next(stream) == "First "
+    assert not received
+    assert list(stream) == ["rest"]